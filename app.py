@@ -4,15 +4,19 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pyqtgraph as pg
 from loguru import logger
 from PyQt5 import QtWidgets
 from pyqtgraph import QtCore, QtGui
 
 import util
+from basetypes.overlays import RESIST, SUPPORT, Overlays
 from chart import Chart
 from customtypes import CurrencyPair, TradingMode
 from exchange_api import get_exchange_api
+from utils.frames import LatestValue, make_frame, merge_frames
+from utils.lod import LevelOfDetail
 from utils.strategy_manager import StrategyManager
 from workers.backtest_ticker import BacktestTicker
 from workers.baseworker import WorkerStatus
@@ -20,6 +24,7 @@ from workers.websocket_live_ticker import WebsocketLiveTicker
 
 SUPPORT_PEN = pg.mkPen(color='#00AA0070', style=QtCore.Qt.SolidLine, width=2)
 RESIST_PEN = pg.mkPen(color='#AA000070', style=QtCore.Qt.SolidLine, width=2)
+MARKER_PEN = pg.mkPen('y')
 
 
 class TimeAxisItem(pg.AxisItem):
@@ -31,62 +36,119 @@ class TimeAxisItem(pg.AxisItem):
 
 
 class CandlestickItem(pg.GraphicsObject):
+    # Candles are recorded once into pictures of CHUNK_SIZE candles, only the
+    # finished candles not filling a chunk yet are re-recorded when one is added
+    # and the last (live) candle is drawn on every paint. Chunks outside the view
+    # are skipped. `setData` takes the chart columns, t_open sorted.
     sigPlotChanged = QtCore.Signal(object)
 
-    def __init__(self, data):
-        pg.GraphicsObject.__init__(self)
-        self.data = data  ## data must have fields: time, open, close, min, max
-        self.picture = QtGui.QPicture()
-        self.rect_height = 0
-        self.rect_start = 0
+    CHUNK_SIZE = 256
+
+    # rising: (pen, brush), allocated once
+    STYLES = {
+        False: (pg.mkPen('#F84960'), pg.mkBrush('#F84960')),
+        True: (pg.mkPen('#02C076'), pg.mkBrush('#02C076')),
+    }
 
-        self.generatePicture()
+    def __init__(self, t=(), p_open=(), p_close=(), p_low=(), p_high=()):
+        pg.GraphicsObject.__init__(self)
+        self.clear()
+        self.setData(t, p_open, p_close, p_low, p_high)
+
+    def clear(self):
+        self.chunks = []  # (t first, t last, picture)
+        self.tail = []  # finished candles not in a chunk yet
+        self.tail_picture = None
+        self.live = None
+        self.finished = None  # t_open of the last finished candle
+        self.width = 0.0
+        self.bounds = QtCore.QRectF()
+
+    def setData(self, t, p_open, p_close, p_low, p_high):
+        t = np.asarray(t)
+        self.prepareGeometryChange()
+
+        if not t.size:
+            self.clear()
+        else:
+            self._update(t, np.asarray(p_open), np.asarray(p_close), np.asarray(p_low), np.asarray(p_high))
 
-    def setData(self, data):
-        self.data = data
-        self.generatePicture()
         self.informViewBoundsChanged()
         self.sigPlotChanged.emit(self)
+        self.update()
+
+    def _update(self, t, p_open, p_close, p_low, p_high):
+        if self.finished is not None:
+            i = np.searchsorted(t, self.finished)
+            if i == t.size or t[i] != self.finished:
+                # Not a continuation of the drawn candles (chart reset), start over.
+                self.clear()
+
+        if t.size > 1:
+            self.width = (t[1] - t[0]) / 3.
+
+        # Chunks scrolled out of a capped chart.
+        while self.chunks and self.chunks[0][1] < t[0]:
+            self.chunks.pop(0)
+
+        start = np.searchsorted(t, self.finished, side="right") if self.finished is not None else 0
+        end = t.size - 1
+
+        if start < end:
+            rows = zip(t[start:end].tolist(), p_open[start:end].tolist(), p_close[start:end].tolist(), p_low[start:end].tolist(), p_high[start:end].tolist())
+            self.tail.extend(rows)
+            self.finished = self.tail[-1][0]
+
+            while len(self.tail) >= self.CHUNK_SIZE:
+                chunk, self.tail = self.tail[:self.CHUNK_SIZE], self.tail[self.CHUNK_SIZE:]
+                self.chunks.append((chunk[0][0], chunk[-1][0], self._record(chunk)))
+
+            self.tail_picture = self._record(self.tail) if self.tail else None
+
+        self.live = (t[end].item(), p_open[end].item(), p_close[end].item(), p_low[end].item(), p_high[end].item())
+
+        low, high = float(np.min(p_low)), float(np.max(p_high))
+        self.bounds = QtCore.QRectF(t[0] - self.width, low, t[-1] - t[0] + 2 * self.width, high - low)
+
+    def _draw(self, p, rows):
+        # One pen and brush switch per colour, lines and bodies drawn in batches.
+        w = self.width
+        for rising in (False, True):
+            selected = [row for row in rows if (row[1] <= row[2]) == rising]
+            if not selected:
+                continue
+
+            pen, brush = self.STYLES[rising]
+            p.setPen(pen)
+            p.setBrush(brush)
+            p.drawLines([QtCore.QLineF(t, low, t, high) for t, _, _, low, high in selected])
+            p.drawRects([QtCore.QRectF(t - w, p_open, w * 2, p_close - p_open) for t, p_open, p_close, _, _ in selected])
+
+    def _record(self, rows) -> QtGui.QPicture:
+        picture = QtGui.QPicture()
+        p = QtGui.QPainter(picture)
+        self._draw(p, rows)
+        p.end()
+        return picture
 
-    def generatePicture(self):
-        if not self.data:
-            return
-
-        ## pre-computing a QPicture object allows paint() to run much more quickly,
-        ## rather than re-drawing the shapes every time.
-
-        if self.picture is None:
-            self.picture = QtGui.QPicture()
-
-        p = QtGui.QPainter(self.picture)
-        p.setPen(pg.mkPen('w'))
-        w = (self.data[1][0] - self.data[0][0]) / 3.
-        for (t, open, close, low, high) in self.data:
-
-            self.rect_height = [self.rect_height, high][int(not bool(self.rect_height) or high > self.rect_height)]
-            self.rect_start = [self.rect_start, low][int(not bool(self.rect_start) or low < self.rect_start)]
+    def paint(self, p, *args):
+        view = self.viewRect()
+        x0, x1 = (view.left() - self.width, view.right() + self.width) if view is not None else (-np.inf, np.inf)
 
-            if open > close:
-                p.setBrush(pg.mkBrush('#F84960'))
-                p.setPen(pg.mkPen('#F84960'))
-            else:
-                p.setBrush(pg.mkBrush('#02C076'))
-                p.setPen(pg.mkPen('#02C076'))
+        for t_first, t_last, picture in self.chunks:
+            if t_last >= x0 and t_first <= x1:
+                picture.play(p)
 
-            p.drawLine(QtCore.QPointF(t, low), QtCore.QPointF(t, high))
-            p.drawRect(QtCore.QRectF(t - w, open, w * 2, close - open))
-        p.end()
+        if self.tail_picture is not None:
+            self.tail_picture.play(p)
 
-    def paint(self, p, *args):
-        # p.drawPicture(0, 0, self.picture)
-        self.picture.play(p)
+        if self.live is not None:
+            self._draw(p, [self.live])
 
     def boundingRect(self):
         ## boundingRect _must_ indicate the entire area that will be drawn on
         ## or else we will get artifacts and possibly crashing.
-        ## (in this case, QPicture does all the work of computing the bouning rect for us)
-        rect = QtCore.QRectF(self.picture.boundingRect())
-        return QtCore.QRectF(rect.x(), self.rect_start, rect.width(), self.rect_height)
+        return self.bounds
 
 
 class MainWindow(pg.GraphicsView):
@@ -176,13 +238,14 @@ class MainWindow(pg.GraphicsView):
         self.backtest_tick = float(args.tick_b)
         self.period = util.interval_mapper(args.period)
         self.preload = int(args.preload)
+        self.fps = int(args.fps)
 
         self.mode = util.mode_mapper(args.mode)
 
         self.start_time = int(args.t_start or 0)
         self.start_end = util.end_time(args.t_end or 0)
 
-        self.chart = Chart(self.exchange, self.pair, None)
+        self.chart = Chart(self.exchange, self.pair, None, self.period)
 
         strategy = self.strategies_mgr.get_strategy(args.strategy)
 
@@ -218,9 +281,6 @@ class MainWindow(pg.GraphicsView):
         #                                       movable=False,
         #                                       pen=pg.mkPen(color='#AAAAAA70', style=QtCore.Qt.SolidLine, width=1))
 
-        self.supports = []
-        self.resists = []
-
         self.resistance_1 = self.plot_price.plot(pen=RESIST_PEN)
         self.resistance_2 = self.plot_price.plot(pen=RESIST_PEN)
         self.resistance_3 = self.plot_price.plot(pen=RESIST_PEN)
@@ -263,59 +323,44 @@ class MainWindow(pg.GraphicsView):
         indicators: 'Indicators' = self.strategy.get_indicators()
 
         datetime_list = indicators.datetime_array
-        open_price_list = indicators.open_array
-        close_price_list = indicators.close_array
         high_price_list = indicators.high_array
         low_price_list = indicators.low_array
-        volume_list = indicators.volume_array
-        ema6_list = indicators.ema6_array
-        ema12_list = indicators.ema12_array
-        ema25_list = indicators.ema25_array
-        ema50_list = indicators.ema50_array
-        ema200_list = indicators.ema200_array
-        psar_list = indicators.psar_array
-        rsi_list = indicators.rsi_array
-        adx_list = indicators.adx_array
-        di_plus_list = indicators.di_plus_array
-        di_minus_list = indicators.di_minus_array
-
-        d = list(zip(datetime_list, open_price_list, close_price_list, low_price_list, high_price_list))
-
-        self.candle_bars = CandlestickItem(d)
+
+        # Filled by `draw_series` at the level of detail of the view.
+        self.candle_bars = CandlestickItem()
 
         self.candlesticks = self.plot_price.plot()
         self.plot_price.addItem(self.candle_bars)
 
-        self.plot_price.setYRange(min(low_price_list), max(high_price_list))
-        self.plot_price.setXRange(min(datetime_list), max(datetime_list))
-
-        self.curve_ema6 = self.plot_price.plot(datetime_list, ema6_list)
-        self.curve_ema12 = self.plot_price.plot(datetime_list, ema12_list)
-        self.curve_ema25 = self.plot_price.plot(datetime_list, ema25_list)
-        self.curve_ema50 = self.plot_price.plot(datetime_list, ema50_list)
-        self.curve_ema200 = self.plot_price.plot(datetime_list, ema200_list)
-        self.curve_psar = self.plot_price.plot(datetime_list, psar_list)
-
-        self.curve_rsi = self.plot_rsi.plot(datetime_list, rsi_list)
-        self.curve_adx = self.plot_dmi.plot(datetime_list, adx_list)
-        self.curve_di_p = self.plot_dmi.plot(datetime_list, di_plus_list)
-        self.curve_di_m = self.plot_dmi.plot(datetime_list, di_minus_list)
-
-        self.curve_macd = self.plot_macd.plot()
-        self.curve_macd_sig = self.plot_macd.plot()
-        self.curve_macd_hst = self.plot_macd.plot()
-
-        self.curve_volume = self.plot_volume.plot(datetime_list, volume_list)
-
-        self.scatter_price = pg.ScatterPlotItem()
-        self.plot_price.addItem(self.scatter_price)
-
-        self.curve_downtrend = self.plot_price.plot()
-        self.curve_uptrend = self.plot_price.plot()
-        self.curve_downtrend.setPen(pg.mkPen(color=(255, 0, 0), width=3))
-        self.curve_uptrend.setPen(pg.mkPen(color=(0, 0, 255), width=3))
-
-        self.curve_scalping_line = self.plot_scalp.plot()
+        self.plot_price.setYRange(np.min(low_price_list), np.max(high_price_list))
+        self.plot_price.setXRange(datetime_list[0], datetime_list[-1])
+
+        self.curve_ema6 = self.plot_price.plot()
+        self.curve_ema12 = self.plot_price.plot()
+        self.curve_ema25 = self.plot_price.plot()
+        self.curve_ema50 = self.plot_price.plot()
+        self.curve_ema200 = self.plot_price.plot()
+        self.curve_psar = self.plot_price.plot()
+
+        self.curve_rsi = self.plot_rsi.plot()
+        self.curve_adx = self.plot_dmi.plot()
+        self.curve_di_p = self.plot_dmi.plot()
+        self.curve_di_m = self.plot_dmi.plot()
+
+        self.curve_volume = self.plot_volume.plot()
+
+        # Strategy overlays rebuilt from the frame deltas, name: (overlay, plot items).
+        self.overlays = Overlays()
+        self.overlay_items = {}
+        self.marker_brushes = {}  # name: (styles, symbols, sizes, brushes)
+        self.panes = {
+            "price": self.plot_price,
+            "rsi": self.plot_rsi,
+            "dmi": self.plot_dmi,
+            "scalping": self.plot_scalp,
+            "macd": self.plot_macd,
+            "volume": self.plot_volume,
+        }
 
         self.curve_ema6.setPen(pg.mkPen(color=(255, 0, 255), width=2))
         self.curve_ema12.setPen(pg.mkPen(color=(180, 0, 180), width=2))
@@ -326,165 +371,184 @@ class MainWindow(pg.GraphicsView):
         self.curve_adx.setPen(pg.mkPen(color=(255, 0, 0), width=1))
         self.curve_di_p.setPen(pg.mkPen(color=(0, 0, 255), width=1))
         self.curve_di_m.setPen(pg.mkPen(color=(180, 120, 40), width=1))
-
-        self.curve_macd.setPen(pg.mkPen(color=(0, 0, 255), width=1))
-        self.curve_macd_sig.setPen(pg.mkPen(color=(255, 0, 0), width=1))
-        self.curve_macd_hst.setPen(pg.mkPen(color=(0, 255, 0), width=1))
         self.curve_volume.setPen(pg.mkPen(color=(100, 255, 100), width=1))
 
+        # The plots share the x range, the price plot one decides the level of detail.
+        self.lod = LevelOfDetail(interval)
+        view_box = self.plot_price.getViewBox()
+        view_box.sigXRangeChanged.connect(self.on_view_changed)
+        view_box.sigResized.connect(self.on_view_changed)
+
+        # Latest frame of the ticker thread, drawn at most `fps` times a second.
+        self.frames = LatestValue(merge=merge_frames)
+        self.frame = None
+        self.drawn = None  # (t first, t last) of the drawn series
+        self.deltas = []  # overlay deltas of the ticks not published yet
+        self.pending = True
+        self.published = 0.0
+        self.publish_frame()
+
+        self.render_timer = QtCore.QTimer()
+        self.render_timer.timeout.connect(self.render_frame)
+        self.render_timer.start(int(1000 / self.fps))
+        self.render_frame()
+
         if self.mode in [TradingMode.LIVE, TradingMode.LIVE_TEST]:
             self.strategy_ticker_thread = WebsocketLiveTicker(self, last_candle)
         else:
-            self.strategy_ticker_thread = BacktestTicker(self, candles)
+            self.strategy_ticker_thread = BacktestTicker(self, candles, flush=self.publish_frame)
 
         self.strategy_ticker_thread.start()
 
-    def chart_tick(self, candle):
-        ret_data = self.strategy.on_tick(candle)
-
-        # # TODO: move to separate method
+    def on_view_changed(self, *args):
+        view_box = self.plot_price.getViewBox()
+        (x0, x1), _ = view_box.viewRange()
+        span = self.lod.span
 
-        open_trades_candles = []
-        close_trades_candles = []
+        if self.lod.set_view(x0, x1, view_box.width()):
+            if self.lod.span != span:
+                # Other buckets, the recorded candles don't match any more.
+                self.candle_bars.clear()
 
-        closed_positions = self.strategy.get_closed_positions()
-        open_position = self.strategy.get_open_position()
+            self.draw_series()
 
-        for trade in [*closed_positions, open_position]:
-            if trade and trade.open_candle:
-                open_trades_candles.append({'pos': [trade.open_candle.t_open, trade.open_candle.p_close], 'data': 1})
+    def draw_series(self):
+        # Candles and indicator curves of the last frame, reduced to the level of detail of the view.
+        frame = self.frame
+        if frame is None:
+            return
 
-            if trade and trade.close_candle:
-                close_trades_candles.append({'pos': [trade.close_candle.t_open, trade.close_candle.p_close], 'data': 1})
+        t = frame["datetime"]
+        lod = self.lod
+
+        self.candle_bars.setData(*lod.ohlc(t, frame["open"], frame["close"], frame["low"], frame["high"]))
+
+        series = [
+            (self.curve_ema6, frame["ema6"]),
+            (self.curve_ema12, frame["ema12"]),
+            (self.curve_ema25, frame["ema25"]),
+            (self.curve_ema50, frame["ema50"]),
+            (self.curve_ema200, frame["ema200"]),
+            (self.curve_psar, frame["psar"]),
+            (self.curve_rsi, frame["rsi"]),
+            (self.curve_adx, frame["adx"]),
+            (self.curve_di_p, frame["di_plus"]),
+            (self.curve_di_m, frame["di_minus"]),
+            (self.curve_volume, frame["volume"]),
+        ]
+
+        for curve, values in series:
+            curve.setData(*lod.curve(t, values))
+
+        for overlay in self.overlays:
+            if overlay.KIND == "series":
+                self.draw_overlay(overlay)
+
+        if t.size:
+            self.drawn = (t[0], t[-1])
+
+    def apply_overlay(self, delta: 'Delta'):
+        previous = self.overlay_items.get(delta.name)
+        size = len(previous[0]) if previous is not None else 0
+        overlay = self.overlays.apply(delta)
+
+        if previous is None:
+            if overlay.KIND == "series":
+                items = self.panes.get(overlay.meta["pane"], self.plot_price).plot()
+                if overlay.meta["color"] is not None:
+                    items.setPen(pg.mkPen(color=overlay.meta["color"], width=overlay.meta["width"]))
+            elif overlay.KIND == "markers":
+                items = pg.ScatterPlotItem(pen=MARKER_PEN)
+                self.plot_price.addItem(items)
+            else:
+                items = (self.plot_price.plot(pen=SUPPORT_PEN), self.plot_price.plot(pen=RESIST_PEN))
 
-        indicators: 'Indicators' = self.strategy.get_indicators()
+            self.overlay_items[delta.name] = (overlay, items)
 
-        datetime_list = indicators.datetime_array
-        open_price_list = indicators.open_array
-        close_price_list = indicators.close_array
-        high_price_list = indicators.high_array
-        low_price_list = indicators.low_array
-        volume_list = indicators.volume_array
-        ema6_list = indicators.ema6_array
-        ema12_list = indicators.ema12_array
-        ema25_list = indicators.ema25_array
-        ema50_list = indicators.ema50_array
-        ema200_list = indicators.ema200_array
-        psar_list = indicators.psar_array
-        rsi_list = indicators.rsi_array
-        adx_list = indicators.adx_array
-        di_plus_list = indicators.di_plus_array
-        di_minus_list = indicators.di_minus_array
-
-        d = list(zip(datetime_list, open_price_list, close_price_list, low_price_list, high_price_list))
-        self.candle_bars.setData(d)
-
-        self.curve_ema6.setData(datetime_list, ema6_list)
-        self.curve_ema12.setData(datetime_list, ema12_list)
-        self.curve_ema25.setData(datetime_list, ema25_list)
-        self.curve_ema50.setData(datetime_list, ema50_list)
-        self.curve_ema200.setData(datetime_list, ema200_list)
-        self.curve_psar.setData(datetime_list, psar_list)
-        self.curve_rsi.setData(datetime_list, rsi_list)
-        self.curve_adx.setData(datetime_list, adx_list)
-        self.curve_di_p.setData(datetime_list, di_plus_list)
-        self.curve_di_m.setData(datetime_list, di_minus_list)
-
-        self.curve_volume.setData(datetime_list, volume_list)
-
-        if "scatter" in ret_data:
-            data = []
-            for item in ret_data.get("scatter", []):
-                data.append({
-                    "symbol": item["symbol"],
-                    "size": item["size"],
-                    "pos": item["pos"],
-                    "brush": pg.mkBrush(item.get("color", "#000000")),
-                    "pen": pg.mkPen('y'),
-                })
-
-            self.scatter_price.setData(data)
-
-        if 'macd' in ret_data:
-            macd = ret_data.get('macd')
-            signal = ret_data.get('signal')
-            hist = ret_data.get('hist')
-
-            t_macd = list(datetime_list[-len(macd):])
-            self.curve_macd.setData(t_macd, macd)
-            self.curve_macd_sig.setData(t_macd, signal)
-            self.curve_macd_hst.setData(t_macd, hist)
+        if overlay.KIND == "markers" and not delta.replace and size + len(delta) == len(overlay):
+            # Nothing evicted, only the new markers are added.
+            _, items = self.overlay_items[delta.name]
+            items.addPoints(x=delta.columns["t"], y=delta.columns["price"], **self.marker_styles(overlay, delta.columns["style"]))
         else:
-            if self.plot_macd_visibile and self.plot_macd:
-                self.layout.removeItem(self.plot_macd)
-                self.plot_macd_visibile = False
+            self.draw_overlay(overlay)
 
-        if 'uptrend' in ret_data:
-            uptrend = ret_data.get('uptrend')
-            t_uptrend = list(datetime_list[-len(uptrend):])
-            self.curve_uptrend.setData(t_uptrend, uptrend)
+    def marker_styles(self, overlay: 'Markers', style: np.array) -> dict:
+        # Per marker symbol, size and brush, the brushes are made once per style.
+        styles = overlay.meta["styles"]
+        cached = self.marker_brushes.get(overlay.name)
 
-        if 'downtrend' in ret_data:
-            downtrend = ret_data.get('downtrend')
-            t_downtrend = list(datetime_list[-len(downtrend):])
-            self.curve_downtrend.setData(t_downtrend, downtrend)
+        if cached is None or cached[0] != styles:
+            symbols = np.array([symbol for symbol, _, _ in styles], dtype=object)
+            sizes = np.array([size for _, size, _ in styles])
+            brushes = np.array([pg.mkBrush(color) for _, _, color in styles], dtype=object)
+            cached = self.marker_brushes[overlay.name] = (styles, symbols, sizes, brushes)
 
-        if 'scalping' in ret_data:
-            scalping_line = ret_data.get('scalping')
-            t_scalping_line = list(datetime_list[-len(scalping_line):])
-            self.curve_scalping_line.setData(t_scalping_line, scalping_line)
-        else:
-            if self.plot_scalp_visibile and self.plot_scalp:
-                self.layout.removeItem(self.plot_scalp)
-                self.plot_scalp_visibile = False
-
-        if 'lows' in ret_data:
+        _, symbols, sizes, brushes = cached
+        return {"symbol": symbols[style], "size": sizes[style], "brush": brushes[style]}
 
-            lows = []
-            for pos in ret_data.get("lows"):
-                lows.append({'pos': [pos.get("x"), pos.get("y")], 'data': 1})
+    def draw_overlay(self, overlay: 'Overlay'):
+        _, items = self.overlay_items[overlay.name]
 
-            self.scatter_lows.setData(spots=lows)
+        if overlay.KIND == "series":
+            items.setData(*self.lod.curve(overlay.view("t"), overlay.view("value")))
 
-        if 'highs' in ret_data:
+        elif overlay.KIND == "markers":
+            items.setData(x=overlay.view("t"), y=overlay.view("price"), **self.marker_styles(overlay, overlay.view("style")))
 
-            highs = []
-            for pos in ret_data.get("highs"):
-                highs.append({'pos': [pos.get("x"), pos.get("y")], 'data': 1})
+        else:
+            for item, kind in zip(items, (SUPPORT, RESIST)):
+                selected = overlay.view("kind") == kind
+                x = np.column_stack((overlay.view("t_start")[selected], overlay.view("t_end")[selected])).ravel()
+                item.setData(x, np.repeat(overlay.view("price")[selected], 2), connect="pairs")
 
-            self.scatter_highs.setData(spots=highs)
+    def chart_tick(self, candle):
+        # Ticker thread: runs the strategy, the GUI thread draws the published frames.
+        deltas = self.strategy.on_tick(candle)
+
+        self.deltas.extend(deltas)
+        self.pending = True
+        if time.perf_counter() - self.published >= 1 / self.fps:
+            self.publish_frame()
+
+    def publish_frame(self):
+        # Frame of the last tick, unless already published. Called by the ticker
+        # thread, also before it waits, the frames between are only skipped.
+        if not self.pending:
+            return
 
-        if 'supports' in ret_data:
-            supports = ret_data.get('supports')
+        self.frames.put(make_frame(self.strategy.get_indicators(), self.deltas))
+        self.deltas = []
+        self.pending = False
+        self.published = time.perf_counter()
 
-            for x in range(0, len(supports)):
-                support = supports[x]
+    def render_frame(self):
+        # GUI thread, on every timer tick: draws the newest frame if there is one.
+        frame = self.frames.take()
+        if frame is None:
+            return
 
-                x_axis_data = [support.get("x-start"), support.get("x-end")]
-                y_axis_data = [support.get("y")] * 2
+        self.frame = frame
+        datetime_list = frame["datetime"]
 
-                if x >= len(self.supports) or not len(self.supports):
-                    plot = self.plot_price.plot(x_axis_data, y_axis_data, pen=SUPPORT_PEN)
-                    self.supports.append(plot)
-                else:
-                    support_plot = self.supports[x]
-                    support_plot.setData(x_axis_data, y_axis_data)
+        for delta in frame.deltas:
+            self.apply_overlay(delta)
 
-        if 'resists' in ret_data:
-            resists = ret_data.get('resists')
+        if self.strategy_ticker_thread is not None:
+            # The strategy ticked, panes none of its overlays is drawn on are removed.
+            panes = {overlay.meta.get("pane") for overlay in self.overlays}
 
-            for x in range(0, len(resists)):
-                support = resists[x]
+            if self.plot_macd_visibile and "macd" not in panes:
+                self.layout.removeItem(self.plot_macd)
+                self.plot_macd_visibile = False
 
-                x_axis_data = [support.get("x-start"), support.get("x-end")]
-                y_axis_data = [support.get("y")] * 2
+            if self.plot_scalp_visibile and "scalping" not in panes:
+                self.layout.removeItem(self.plot_scalp)
+                self.plot_scalp_visibile = False
 
-                if x >= len(self.resists) or not len(self.resists):
-                    plot = self.plot_price.plot(x_axis_data, y_axis_data, pen=RESIST_PEN)
-                    self.resists.append(plot)
-                else:
-                    support_plot = self.resists[x]
-                    support_plot.setData(x_axis_data, y_axis_data)
+        # Candles added out of view are drawn with the next view change.
+        drawn = self.drawn
+        if datetime_list.size and (drawn is None or drawn[0] != datetime_list[0] or self.lod.in_view(drawn[1], datetime_list[-1])):
+            self.draw_series()
 
         # self.plot_price.plot([pos.get("x-start"), pos.get("x-end")], [pos.get("y")] * 2)
         # self.horizontal2.setData([pos.get("x-start"), pos.get("x-end")], [pos.get("y-high"), pos.get("y-high")])
@@ -502,6 +566,7 @@ if __name__ == "__main__":
     p.add_argument('--pair', '-c', default='BTC,USDT', help=f"Currency pair. ex. BTC,USDT.")
     p.add_argument('--tick', '-t', default=30, help=f"Candle update timespan.")
     p.add_argument('--tick-b', default=0.5, help=f"Candle update time for backtesting.")
+    p.add_argument('--fps', default=30, help=f"Chart refresh rate limit, frames per second.")
     p.add_argument('--budget', '-b', default=None, help=f"Budget used to by crypto in currency which second param in pair.")
 
     p.add_argument('--period', '-p', default='5m', help=f"Timespan width for candle.")
@@ -0,0 +1,172 @@
+from time import perf_counter
+
+import numpy as np
+from candle import Candle, candles_from_columns
+from chart import Chart
+from customtypes import ExitReason, TradingMode
+from position import Position
+from utils.strategy_manager import StrategyManager
+
+from backtest.positions import PositionSimulator
+from backtest.results import TradeLog
+
+COLUMN_NAMES = ("t_open", "t_close", "open", "high", "low", "close", "volume")
+
+
+class BacktestResult:
+    def __init__(self, strategy, t_open: np.array, equity: np.array, elapsed: float, trade_log: TradeLog):
+        self.strategy = strategy
+        self.trades = strategy.get_closed_positions()
+        self.open_position = strategy.get_open_position()
+        self.trade_log = trade_log
+        self.t_open = t_open
+        self.equity = equity  # cumulative profit in percent, closed trades plus the open one
+        self.elapsed = elapsed
+
+    @property
+    def num_candles(self) -> int:
+        return self.equity.size
+
+    @property
+    def candles_per_second(self) -> float:
+        return self.num_candles / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def profit(self) -> float:
+        return float(np.sum(self.trade_log.view("profit")))
+
+    @property
+    def max_drawdown(self) -> float:
+        if not self.equity.size:
+            return 0.0
+
+        peak = np.maximum.accumulate(np.maximum(self.equity, 0))
+        return float(np.max(peak - self.equity))
+
+    def summary(self) -> dict:
+        return {
+            "candles": self.num_candles,
+            "trades": len(self.trades),
+            "profit": self.profit,
+            "max_drawdown": self.max_drawdown,
+            "elapsed": self.elapsed,
+            "candles_per_second": self.candles_per_second,
+        }
+
+
+class BacktestEngine:
+    # Replays a candle history through a strategy on the calling thread, without
+    # the sleeps and thread hand-off of `BacktestTicker`.
+
+    def __init__(self, strategy: 'StrategyBase', columns: dict, preload: int = 300, precompute: bool = True, vectorized: bool = True):
+        self.strategy = strategy
+        self.columns = {name: np.asarray(columns[name]) for name in COLUMN_NAMES}
+        self.preload = preload
+        self.precompute = precompute
+        self.vectorized = vectorized
+
+    def run(self) -> BacktestResult:
+        if self.vectorized:
+            start = perf_counter()
+            signals = self.strategy.generate_signals(self.columns, self.preload)
+
+            if signals is not None:
+                return self.run_signals(signals, start)
+
+        return self.run_ticks()
+
+    def _candle(self, i) -> Candle:
+        return candles_from_columns(self.strategy.chart.period, self.columns, i, i + 1)[0]
+
+    def run_signals(self, signals: 'Signals', start: float) -> BacktestResult:
+        # Fills the whole history from the signal arrays with the same rules as the
+        # tick replay, see `PositionSimulator`.
+        strategy = self.strategy
+        columns = self.columns
+        size = columns["close"].size
+
+        simulator = PositionSimulator(columns, signals.exits, signals.stop_loss_percent, signals.prop_limits, signals.prop_limit_percent)
+        fills = simulator.run(signals.entries, self.preload)
+        average = simulator.average
+
+        realized = np.zeros(size)
+        unrealized = np.zeros(size)
+
+        trade_log = TradeLog()
+        trade_log.record_fills(fills, columns["t_open"])
+
+        for i, j, reason, limit, limit_price in zip(fills.entry_index.tolist(), fills.exit_index.tolist(), fills.reason.tolist(), fills.prop_limit.tolist(),
+                                                    fills.prop_limit_price.tolist()):
+            position = Position(strategy.pair, strategy.budget, strategy.mode, strategy.exchange, signals.stop_loss_percent)
+            position.open(self._candle(i))
+            position.prop_limit, position.prop_limit_price = limit, limit_price
+
+            end = j if j >= 0 else size
+            unrealized[i:end] = (average[i:end] - position.entry_price) * 100 / average[i:end]
+
+            if j < 0:
+                strategy.position = position
+                break
+
+            position.close(self._candle(j), ExitReason(reason))
+            strategy.trades.append(position)
+            realized[j] = position.profit_percent()
+
+        equity = np.cumsum(realized)[self.preload:] + unrealized[self.preload:]
+        elapsed = perf_counter() - start
+
+        return BacktestResult(strategy, columns["t_open"][self.preload:], equity, elapsed, trade_log)
+
+    def run_ticks(self) -> BacktestResult:
+        strategy = self.strategy
+        period = strategy.chart.period
+        rows = list(zip(*[self.columns[name].tolist() for name in COLUMN_NAMES]))
+
+        strategy.on_preload(candles_from_columns(period, self.columns, 0, self.preload), self.preload)
+
+        if self.precompute:
+            strategy.precompute(self.columns)
+
+        trades = strategy.trades
+        trade_log = TradeLog()
+        equity = np.zeros(max(len(rows) - self.preload, 0))
+        realized = 0.0
+        closed = 0
+
+        start = perf_counter()
+
+        for i, (t_o, t_c, o, h, l, c, v) in enumerate(rows[self.preload:]):
+            candle = Candle(period, t_o, t_c, o, c, h, l, v)
+            strategy.on_tick(candle)
+
+            while closed < len(trades):
+                trade_log.record(trades[closed])
+                realized += trades[closed].profit_percent()
+                closed += 1
+
+            position = strategy.position
+            equity[i] = realized + position.profit(candle) if position else realized
+
+        elapsed = perf_counter() - start
+
+        return BacktestResult(strategy, self.columns["t_open"][self.preload:], equity, elapsed, trade_log)
+
+
+def run_backtest(strategy: str,
+                 strategy_args: dict,
+                 columns: dict,
+                 period: 'CandleTimeInterval',
+                 pair: 'CurrencyPair' = None,
+                 preload: int = 300,
+                 budget: float = 0,
+                 exchange=None,
+                 precompute: bool = True,
+                 vectorized: bool = True) -> BacktestResult:
+    strategy_cls = StrategyManager("strategies/").get_strategy(strategy)
+    if strategy_cls is None:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    chart = Chart(exchange, pair, None, period)
+    instance = strategy_cls(strategy_args, chart, exchange, TradingMode.BACKTEST, budget)
+
+    return BacktestEngine(instance, columns, preload, precompute, vectorized).run()
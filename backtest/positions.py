@@ -0,0 +1,196 @@
+import numpy as np
+from customtypes import ExitReason
+
+# Candles first scanned for the exit of a position, doubled until an exit is found.
+SCAN_WINDOW = 64
+# Upper bound of the candles scanned at once, positions x window.
+SCAN_CELLS = 1 << 16
+
+
+class Fills:
+    # One row per simulated position, `exit_index` is -1 for a position still open
+    # at the end. `prop_limit` and `prop_limit_price` are the ratchet at the exit.
+
+    def __init__(self, entry_index, entry_price, exit_index, exit_price, reason, prop_limit, prop_limit_price):
+        self.entry_index = np.asarray(entry_index, dtype=np.int64)
+        self.entry_price = np.asarray(entry_price, dtype=np.float64)
+        self.exit_index = np.asarray(exit_index, dtype=np.int64)
+        self.exit_price = np.asarray(exit_price, dtype=np.float64)
+        self.reason = np.asarray(reason, dtype=np.int8)
+        self.prop_limit = np.asarray(prop_limit, dtype=np.float64)
+        self.prop_limit_price = np.asarray(prop_limit_price, dtype=np.float64)
+
+    def __len__(self):
+        return self.entry_index.size
+
+    @property
+    def closed(self) -> np.array:
+        return self.exit_index >= 0
+
+    @property
+    def profit_percent(self) -> np.array:
+        # `Position.profit_percent` of the closed positions, NaN for the open one.
+        with np.errstate(invalid="ignore"):
+            return np.where(self.closed, (self.exit_price - self.entry_price) * 100 / self.exit_price, np.nan)
+
+
+def candle_average(columns: dict) -> np.array:
+    # Same operation order as `Candle.average`, so prices compare equal to the tick replay.
+    return (columns["high"] + columns["low"] + columns["close"]) / 3
+
+
+class PositionSimulator:
+    # Finds the exits of positions opened at known candles with the rules of
+    # `Position` and `StrategyBase`, without walking the candles in Python:
+    #
+    #   - positions open and close at the candle average,
+    #   - on every candle an exit signal closes first, then the prop limit
+    #     (`set_prop_limit` ratchet on the `prop_limits` candles) and the stop
+    #     loss are checked, from the opening candle on,
+    #   - only one position is open at a time unless `overlapping` is set.
+    #
+    # Pending positions are scanned together, one row of candles each, for the
+    # first crossing of their stop or running prop limit. Rows grow until they hit,
+    # so the work follows the holding periods, not the history. Entries that fall
+    # inside an already scanned holding period are dropped without being scanned.
+
+    def __init__(self,
+                 columns: dict,
+                 exits: np.array = None,
+                 stop_loss_percent: float = 0.0,
+                 prop_limits: np.array = None,
+                 prop_limit_percent: float = 0.0):
+        self.average = candle_average(columns)
+        self.size = self.average.size
+        self.stop_loss_percent = stop_loss_percent
+
+        self.exits = np.flatnonzero(exits) if exits is not None else np.empty(0, dtype=np.int64)
+
+        if prop_limits is not None and prop_limit_percent:
+            # New prop limit of every ratchet candle, 0 never raises the limit.
+            self.prop_values = np.where(prop_limits, (columns["low"] / 100) * prop_limit_percent, 0.0)
+        else:
+            self.prop_values = None
+
+    def _scan(self, state, rows, window):
+        # Advances the rows of `state` by `window` candles, marks the ones that hit.
+        scanned, bound, stop_price, limit, limit_price, exit_index, reason = state
+
+        offsets = np.arange(window)
+        index = scanned[rows, None] + offsets
+        valid = index < bound[rows, None]
+        index = np.minimum(index, self.size - 1)
+
+        prices = self.average[index]
+        hit = valid & (prices <= stop_price[rows, None])
+
+        if self.prop_values is not None:
+            values = np.where(valid, self.prop_values[index], 0.0)
+            running = np.maximum.accumulate(np.concatenate((limit[rows, None], values), axis=1), axis=1)
+            raised = running[:, 1:] > running[:, :-1]
+            last = np.maximum.accumulate(np.where(raised, offsets, -1), axis=1)
+
+            limits = running[:, 1:]
+            limit_prices = np.where(last >= 0, np.take_along_axis(prices, np.maximum(last, 0), axis=1), limit_price[rows, None])
+            prop_hit = valid & (limits > 0) & ((limit_prices - limits) >= prices)
+            hit |= prop_hit
+
+        first = np.argmax(hit, axis=1)
+        done = hit[np.arange(rows.size), first]
+        column = np.where(done, first, window - 1)
+
+        if self.prop_values is not None:
+            limit[rows] = limits[np.arange(rows.size), column]
+            limit_price[rows] = limit_prices[np.arange(rows.size), column]
+
+        finished = rows[done]
+        exit_index[finished] = scanned[finished] + first[done]
+
+        if self.prop_values is not None:
+            reason[finished] = np.where(prop_hit[done, first[done]], ExitReason.PROP_LIMIT, ExitReason.STOP_LOSS)
+        else:
+            reason[finished] = ExitReason.STOP_LOSS
+
+        scanned[rows] = np.minimum(scanned[rows] + window, bound[rows])
+
+        # Rows scanned up to their exit signal (or the end) without a hit close there.
+        ended = rows[~done & (scanned[rows] >= bound[rows])]
+        exit_index[ended] = np.where(bound[ended] < self.size, bound[ended], -1)
+        reason[ended] = np.where(bound[ended] < self.size, ExitReason.SIGNAL, ExitReason.OPEN)
+
+    def run(self, entries: np.array, start: int = 0, overlapping: bool = False) -> Fills:
+        # `entries` is a flag per candle or a sorted array of candle indices.
+        entries = np.asarray(entries)
+        if entries.dtype == bool:
+            entries = np.flatnonzero(entries)
+
+        entries = entries[entries >= start].astype(np.int64)
+        count = entries.size
+        average = self.average
+
+        # Exit signal closing each position unless the stops hit first, the end of the history without one.
+        bound = np.append(self.exits, self.size)[np.searchsorted(self.exits, entries)]
+
+        entry_price = average[entries]
+        if self.stop_loss_percent:
+            stop_price = entry_price - (entry_price / 100) * self.stop_loss_percent
+        else:
+            stop_price = np.full(count, -np.inf)
+
+        # Unresolved exits are -2, an exit signal on the opening candle closes it at once.
+        exit_index = np.where(bound == entries, entries, -2)
+        reason = np.where(bound == entries, ExitReason.SIGNAL, ExitReason.OPEN).astype(np.int8)
+        scanned = entries.copy()
+        limit = np.zeros(count)
+        limit_price = np.zeros(count)
+        state = (scanned, bound, stop_price, limit, limit_price, exit_index, reason)
+
+        alive = np.ones(count, dtype=bool)
+        following = np.where(exit_index >= 0, np.searchsorted(entries, exit_index, side="right"), count)
+        taken = []
+        head = 0
+
+        while True:
+            if not overlapping:
+                # Takes positions in order as long as their exits are known.
+                while head < count and exit_index[head] != -2:
+                    taken.append(head)
+                    head = following[head]
+
+                if head < count:
+                    # Still open after the scanned candles, the entries up to there are skipped.
+                    alive[head + 1:np.searchsorted(entries, scanned[head], side="right")] = False
+
+                alive[:head] = False
+
+            pending = np.flatnonzero(alive & (exit_index == -2))
+            if not pending.size:
+                break
+
+            first = pending[0]
+            window = max(SCAN_WINDOW, int(scanned[first] - entries[first]))
+            rows = pending[:max(1, SCAN_CELLS // window)]
+            self._scan(state, rows, window)
+
+            # The next entry can't be taken on the closing candle, entries are checked first.
+            resolved = rows[exit_index[rows] != -2]
+            following[resolved] = np.where(exit_index[resolved] >= 0, np.searchsorted(entries, exit_index[resolved], side="right"), count)
+
+        rows = np.arange(count) if overlapping else np.array(taken, dtype=np.int64)
+
+        exits = exit_index[rows]
+        exit_price = np.where(exits >= 0, average[np.maximum(exits, 0)], np.nan)
+
+        return Fills(entries[rows], entry_price[rows], exits, exit_price, reason[rows], limit[rows], limit_price[rows])
+
+
+def simulate_positions(columns: dict,
+                       entries: np.array,
+                       exits: np.array = None,
+                       stop_loss_percent: float = 0.0,
+                       prop_limits: np.array = None,
+                       prop_limit_percent: float = 0.0,
+                       start: int = 0,
+                       overlapping: bool = False) -> Fills:
+    simulator = PositionSimulator(columns, exits, stop_loss_percent, prop_limits, prop_limit_percent)
+    return simulator.run(entries, start, overlapping)
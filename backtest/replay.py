@@ -0,0 +1,319 @@
+import bz2
+import gzip
+import json
+import lzma
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import util
+from basetypes.overlays import KINDS, Delta, Overlays
+from chart import Chart
+from customtypes import TradingMode
+from utils.json_decoding import Kline, decoder, kline_from_dict
+from utils.strategy_manager import StrategyManager
+from workers.websocket_live_ticker import apply_kline
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Candles kept by the replayed strategy's chart, recordings can span months.
+DEFAULT_CHART_LIMIT = 10_000
+
+
+def _open_zstd(path, mode="rb"):
+    if zstandard is None:
+        raise ValueError(f"Reading '{path}' needs the zstandard package.")
+
+    return zstandard.open(path, mode)
+
+
+# Suffix: opener, anything else is read as is.
+OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+    ".zst": _open_zstd,
+}
+
+
+def open_recording(path):
+    # Binary file object of a recording, decompressed on the fly: lines are read
+    # through the decompressor buffer, memory stays the same whatever the size.
+    path = Path(path)
+    return OPENERS.get(path.suffix, open)(path, "rb")
+
+
+def _payload(event: dict) -> dict:
+    # Combined stream frames wrap the event: {"stream": name, "data": event}.
+    return event["data"] if "stream" in event else event
+
+
+def recording_kind(path) -> str:
+    # "kline" for kline update events (`<symbol>@kline_<interval>`), "trade" for
+    # trade or aggregated trade events, one JSON event or combined stream frame per line.
+    with open_recording(path) as f:
+        for line in f:
+            if line.strip():
+                return "kline" if "k" in _payload(decoder.loads(line)) else "trade"
+
+    return None
+
+
+def read_klines(path, stream: str = None):
+    with open_recording(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            if line.startswith(b'{"stream"'):
+                # Frames as received, the typed decoder skips the other fields.
+                event = decoder.decode_kline_frame(line)
+                if stream is None or event.stream == stream:
+                    yield event.kline
+                continue
+
+            event = decoder.loads(line)
+            if "stream" in event:
+                if stream is not None and event["stream"] != stream:
+                    continue
+                event = event["data"]
+
+            yield kline_from_dict(event["k"])
+
+
+def read_trades(path, stream: str = None):
+    # (trade time in milliseconds, price, quantity)
+    with open_recording(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            event = decoder.loads(line)
+            if "stream" in event:
+                if stream is not None and event["stream"] != stream:
+                    continue
+                event = event["data"]
+
+            yield int(event["T"]), float(event["p"]), float(event["q"])
+
+
+class ReplayResult:
+    def __init__(self, strategy, events: int, candles: int, elapsed: float):
+        self.strategy = strategy
+        self.trades = strategy.get_closed_positions()
+        self.open_position = strategy.get_open_position()
+        self.events = events
+        self.candles = candles
+        self.elapsed = elapsed
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def profit(self) -> float:
+        return sum(trade.profit_percent() for trade in self.trades)
+
+    def summary(self) -> dict:
+        return {
+            "events": self.events,
+            "candles": self.candles,
+            "trades": len(self.trades),
+            "profit": self.profit,
+            "elapsed": self.elapsed,
+            "events_per_second": self.events_per_second,
+        }
+
+
+class ReplayEngine:
+    # Streams recorded market data through a strategy on the calling thread, the
+    # way `WebsocketLiveTicker` does live but without waiting: every kline update
+    # goes through `apply_kline`, so `Candle.tick`, `on_rt_tick` and the intra
+    # candle stops of `Position.rt_tick` run, closed candles go to `on_tick`.
+    # Trades are first assembled into the kline updates of the chart period, a
+    # candle is closed by the first trade of the next one.
+
+    def __init__(self, strategy: 'StrategyBase', stream: str = None, recorder: 'OverlayRecorder' = None):
+        self.strategy = strategy
+        self.recorder = recorder
+        self.chart = strategy.chart
+        self.period = self.chart.period
+        self.interval = util.MAP_INTERVAL_TO_SECONDS[self.period] * 1000
+        self.stream = stream
+
+        self.candle = None
+        self.kline = None
+        self.events = 0
+        self.candles = 0
+
+    def chart_tick(self, candle: 'Candle'):
+        deltas = self.strategy.on_tick(candle)
+        self.candles += 1
+
+        if self.recorder is not None:
+            self.recorder.write(candle.t_open, deltas)
+
+    def on_kline(self, kline: Kline):
+        self.candle = apply_kline(self, self.candle, kline)
+        self.events += 1
+
+    def on_trade(self, t: int, price: float, quantity: float):
+        kline = self.kline
+        t_open = t - t % self.interval
+
+        if kline is not None and kline.t_open != t_open:
+            kline.closed = True
+            self.candle = apply_kline(self, self.candle, kline)
+            kline = None
+
+        if kline is None:
+            kline = self.kline = Kline(t_open, t_open + self.interval - 1, price, price, price, price, 0.0, False)
+        else:
+            kline.close = price
+            kline.high = max(kline.high, price)
+            kline.low = min(kline.low, price)
+
+        kline.volume += quantity
+        self.candle = apply_kline(self, self.candle, kline)
+        self.events += 1
+
+    def replay(self, path):
+        kind = recording_kind(path)
+
+        if kind == "kline":
+            on_kline = self.on_kline
+            for kline in read_klines(path, self.stream):
+                on_kline(kline)
+
+        elif kind == "trade":
+            on_trade = self.on_trade
+            for t, price, quantity in read_trades(path, self.stream):
+                on_trade(t, price, quantity)
+
+    def run(self, paths: list) -> ReplayResult:
+        # Files are replayed in the given order, they should follow each other in time.
+        start = perf_counter()
+
+        for path in paths:
+            self.replay(path)
+
+        return ReplayResult(self.strategy, self.events, self.candles, perf_counter() - start)
+
+
+def _json_values(values: np.array) -> list:
+    # NaN isn't JSON, it is written as null and read back as NaN.
+    if values.dtype.kind == "f" and np.isnan(values).any():
+        return np.where(np.isnan(values), None, values).tolist()
+
+    return values.tolist()
+
+
+class OverlayRecorder:
+    # Overlay deltas of a strategy as JSON lines, one per delta with the open
+    # time of the candle it was made at, compressed by the file suffix like the
+    # recordings: {"t", "kind", "name", "replace", "capacity", "meta", "columns"}.
+
+    def __init__(self, path):
+        path = Path(path)
+        self.file = OPENERS.get(path.suffix, open)(path, "wb")
+        self.deltas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, t: int, deltas: list[Delta]):
+        for delta in deltas:
+            record = {
+                "t": t,
+                "kind": delta.kind,
+                "name": delta.name,
+                "replace": delta.replace,
+                "capacity": delta.capacity,
+                "meta": delta.meta,
+                "columns": {column: _json_values(values) for column, values in delta.columns.items()},
+            }
+            self.file.write(json.dumps(record).encode() + b"\n")
+
+        self.deltas += len(deltas)
+
+    def close(self):
+        self.file.close()
+
+
+def _tuples(value):
+    # JSON arrays back to the tuples of the overlay meta (colors, marker styles).
+    return tuple(_tuples(item) for item in value) if isinstance(value, list) else value
+
+
+def read_overlays(path):
+    # (t, Delta) of a file written by `OverlayRecorder`.
+    with open_recording(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            record = decoder.loads(line)
+            kind = record["kind"]
+
+            meta = {key: _tuples(value) for key, value in record["meta"].items()}
+
+            columns = {}
+            for column, values in record["columns"].items():
+                columns[column] = np.array(values, dtype=KINDS[kind].COLUMNS[column])
+                columns[column].flags.writeable = False
+
+            yield record["t"], Delta(kind, record["name"], record["replace"], columns, meta, record["capacity"])
+
+
+def load_overlays(path, t_end: int = None) -> Overlays:
+    # The overlays as drawn after the candle at `t_end`, after the last one by default.
+    overlays = Overlays()
+    for t, delta in read_overlays(path):
+        if t_end is not None and t > t_end:
+            break
+        overlays.apply(delta)
+
+    return overlays
+
+
+def first_event_time(path) -> int:
+    # Open time of the first kline, or time of the first trade, in milliseconds.
+    if recording_kind(path) == "kline":
+        return next(read_klines(path)).t_open
+
+    return next(read_trades(path))[0]
+
+
+def run_replay(strategy: str,
+               strategy_args: dict,
+               paths: list,
+               period: 'CandleTimeInterval',
+               pair: 'CurrencyPair' = None,
+               preload: list['Candle'] = None,
+               budget: float = 0,
+               exchange=None,
+               stream: str = None,
+               limit: int = DEFAULT_CHART_LIMIT,
+               overlays_path=None) -> ReplayResult:
+    strategy_cls = StrategyManager("strategies/").get_strategy(strategy)
+    if strategy_cls is None:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    chart = Chart(exchange, pair, limit, period)
+    instance = strategy_cls(strategy_args, chart, exchange, TradingMode.BACKTEST, budget)
+
+    if preload:
+        instance.on_preload(preload, len(preload))
+
+    if overlays_path is None:
+        return ReplayEngine(instance, stream).run(paths)
+
+    with OverlayRecorder(overlays_path) as recorder:
+        return ReplayEngine(instance, stream, recorder).run(paths)
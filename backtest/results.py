@@ -0,0 +1,229 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from customtypes import ExitReason
+from utils.ring_buffer import RingBuffer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+TRADE_COLUMNS = {
+    "entry_t": np.int64,
+    "exit_t": np.int64,
+    "entry_price": np.float64,
+    "exit_price": np.float64,
+    "reason": np.int8,  # `ExitReason`
+    "profit": np.float64,  # `Position.profit_percent`
+}
+EQUITY_COLUMNS = {"t": np.int64, "equity": np.float64}
+
+FORMATS = ("npz", "parquet", "arrow")
+
+
+class TradeLog:
+    # Closed trades of a run, one row each in NumPy columns. The tick replay
+    # records positions as they close, the signal backtest all its fills at once.
+
+    def __init__(self):
+        self.columns = {column: RingBuffer(None, dtype) for column, dtype in TRADE_COLUMNS.items()}
+
+    def __len__(self):
+        return len(self.columns["entry_t"])
+
+    def view(self, column: str) -> np.array:
+        return self.columns[column].view()
+
+    def arrays(self) -> dict:
+        return {column: buffer.view() for column, buffer in self.columns.items()}
+
+    def append(self, **values):
+        # Rows of every column, scalars are repeated for all of them.
+        columns = np.broadcast_arrays(*(np.atleast_1d(values[column]) for column in self.columns))
+        for buffer, column_values in zip(self.columns.values(), columns):
+            buffer.extend(column_values)
+
+    def record(self, position: 'Position'):
+        self.append(entry_t=position.open_candle.t_open,
+                    exit_t=position.close_candle.t_open,
+                    entry_price=position.entry_price,
+                    exit_price=position.exit_price,
+                    reason=int(position.exit_reason),
+                    profit=position.profit_percent())
+
+    def record_fills(self, fills: 'Fills', t_open: np.array):
+        closed = fills.closed
+        self.append(entry_t=t_open[fills.entry_index[closed]],
+                    exit_t=t_open[fills.exit_index[closed]],
+                    entry_price=fills.entry_price[closed],
+                    exit_price=fills.exit_price[closed],
+                    reason=fills.reason[closed],
+                    profit=fills.profit_percent[closed])
+
+
+def _require_pyarrow(path):
+    if pa is None:
+        raise ValueError(f"Writing or reading '{path}' needs the pyarrow package.")
+
+
+def _table_format(path) -> str:
+    fmt = Path(path).suffix[1:]
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown results format: '{path}', one of {', '.join(FORMATS)}.")
+
+    return fmt
+
+
+def write_table(path, columns: dict):
+    # All the columns at once, the format is the file suffix.
+    fmt = _table_format(path)
+
+    if fmt == "npz":
+        np.savez(path, **columns)
+        return
+
+    _require_pyarrow(path)
+    table = pa.table({name: np.asarray(values) for name, values in columns.items()})
+
+    if fmt == "parquet":
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_table(path, columns: tuple = None) -> dict:
+    # Only `columns` (all when None) are read: arrays of a .npz are loaded one by
+    # one, Parquet column chunks are projected, Arrow files are memory mapped.
+    fmt = _table_format(path)
+
+    if fmt == "npz":
+        with np.load(path) as npz:
+            return {name: npz[name] for name in (columns or npz.files)}
+
+    _require_pyarrow(path)
+
+    if fmt == "parquet":
+        table = pq.read_table(path, columns=list(columns) if columns else None)
+    else:
+        # Left open, the arrays returned are views of the mapping.
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        if columns:
+            table = table.select(list(columns))
+
+    return {name: table.column(name).to_numpy() for name in table.column_names}
+
+
+def _json_default(value):
+    # NumPy scalars of the summaries.
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class ResultsStore:
+    # Directory of backtest runs, three files per run:
+    #
+    #   <run>.json                   strategy, arguments and summary
+    #   <run>.trades.<format>        `TRADE_COLUMNS`, one row per closed trade
+    #   <run>.equity.<format>        `EQUITY_COLUMNS`, one row per candle
+    #
+    # Runs are written whole at the end of a backtest, sweep workers write their
+    # own. Reading goes one run at a time and only the columns asked for, the
+    # summaries need nothing but the small JSON files.
+
+    def __init__(self, root, fmt: str = "npz"):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown results format: '{fmt}', one of {', '.join(FORMATS)}.")
+
+        self.root = Path(root)
+        self.fmt = fmt
+
+    def _path(self, run: str, table: str, fmt: str) -> Path:
+        return self.root / f"{run}.{table}.{fmt}"
+
+    def write(self, run: str, result: 'BacktestResult', **meta) -> dict:
+        if self.fmt != "npz":
+            _require_pyarrow(self.root)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        write_table(self._path(run, "trades", self.fmt), result.trade_log.arrays())
+        write_table(self._path(run, "equity", self.fmt), {"t": result.t_open, "equity": result.equity})
+
+        meta = {"run": run, "format": self.fmt, "strategy": result.strategy.__strategy__, **meta, **result.summary()}
+
+        # The JSON last and renamed into place: runs listed are complete.
+        path = self.root / f"{run}.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta, default=_json_default))
+        os.replace(tmp, path)
+
+        return meta
+
+    def runs(self) -> list[str]:
+        return sorted(path.name[:-len(".json")] for path in self.root.glob("*.json"))
+
+    def meta(self, run: str) -> dict:
+        return json.loads((self.root / f"{run}.json").read_text())
+
+    def summaries(self, sweep: str = None) -> list[dict]:
+        # Of the runs of one sweep when given.
+        summaries = [self.meta(run) for run in self.runs()]
+        return [meta for meta in summaries if meta.get("sweep") == sweep] if sweep else summaries
+
+    def sweeps(self) -> list[str]:
+        # Oldest first, ids start with the time.
+        return sorted({meta["sweep"] for meta in self.summaries() if meta.get("sweep")})
+
+    def _read(self, run: str, table: str, columns: tuple, meta: dict = None) -> dict:
+        fmt = (meta or self.meta(run))["format"]
+        return read_table(self._path(run, table, fmt), columns)
+
+    def trades(self, run: str, columns: tuple = None, meta: dict = None) -> dict:
+        return self._read(run, "trades", columns, meta)
+
+    def equity(self, run: str, columns: tuple = None, meta: dict = None) -> dict:
+        return self._read(run, "equity", columns, meta)
+
+    def iter_trades(self, columns: tuple = None, sweep: str = None):
+        # (meta, trade columns) of every run, the previous run's arrays can be freed.
+        for meta in self.summaries(sweep):
+            yield meta, self.trades(meta["run"], columns, meta)
+
+    def concat_trades(self, columns: tuple = ("profit", ), sweep: str = None) -> dict:
+        # `columns` of all the runs in one table, `run` the index into `summaries(sweep)`.
+        parts = {column: [] for column in ("run", *columns)}
+
+        for i, (_, trades) in enumerate(self.iter_trades(columns, sweep)):
+            for column in columns:
+                parts[column].append(trades[column])
+            parts["run"].append(np.full(trades[columns[0]].size, i, dtype=np.int32))
+
+        return {column: np.concatenate(arrays) if arrays else np.empty(0) for column, arrays in parts.items()}
+
+    def aggregate(self, sweep: str = None) -> list[dict]:
+        # Summary of every run with trade statistics, from the profit and reason
+        # columns only.
+        rows = []
+
+        for meta, trades in self.iter_trades(("profit", "reason"), sweep):
+            profit = trades["profit"]
+            reasons = np.bincount(trades["reason"], minlength=len(ExitReason))
+            wins = profit[profit > 0]
+            losses = profit[profit < 0]
+
+            rows.append({
+                **meta,
+                "win_rate": wins.size * 100 / profit.size if profit.size else 0.0,
+                "average_profit": float(np.mean(profit)) if profit.size else 0.0,
+                "profit_factor": float(np.sum(wins) / -np.sum(losses)) if losses.size else float("inf"),
+                **{f"exits_{reason.name.lower()}": int(reasons[reason]) for reason in ExitReason if reason != ExitReason.OPEN},
+            })
+
+        return rows
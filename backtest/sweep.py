@@ -0,0 +1,180 @@
+import itertools
+import math
+import os
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from multiprocessing import shared_memory
+
+import numpy as np
+from loguru import logger
+
+from backtest.engine import COLUMN_NAMES, run_backtest
+from backtest.results import ResultsStore
+
+COLUMN_DTYPES = {"t_open": np.int64, "t_close": np.int64}
+
+# Worker process state, set once by `_init_worker`.
+_shared = None
+_columns = None
+
+
+def _parse_values(value: str) -> list[str]:
+    # "8,12,16" -> ["8", "12", "16"], "8:20:4" -> ["8", "12", "16"] (end excluded).
+    if ":" in value:
+        start, stop, *step = value.split(":")
+        step = step[0] if step else "1"
+
+        if any("." in v for v in (start, stop, step)):
+            # Decimal steps, float ones can round past the end.
+            start, stop, step = Decimal(start), Decimal(stop), Decimal(step)
+            count = max(math.ceil((stop - start) / step), 0)
+            return [format((start + k * step).normalize(), "f") for k in range(count)]
+
+        return [str(v) for v in range(int(start), int(stop), int(step))]
+
+    return value.split(",")
+
+
+def parse_grid(spec: str) -> dict[str, list[str]]:
+    # Same "a=1;b=2" layout as `util.parse_strategy_args`, every value may be a list or a range.
+    if not spec:
+        return {}
+
+    grid = {key: _parse_values(value) for key, value in map(lambda arg: arg.split("=", 1), spec.split(";"))}
+
+    # Repeated values would run the same arguments more than once.
+    for key, values in grid.items():
+        if len(set(values)) != len(values):
+            raise ValueError(f"Grid values of '{key}' are not unique: {','.join(values)}")
+
+    return grid
+
+
+def expand_grid(grid: dict[str, list[str]]) -> list[dict]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def sample_grid(grid: dict[str, list[str]], num_samples: int, seed: int = None) -> list[dict]:
+    rng = random.Random(seed)
+    total = math.prod(len(values) for values in grid.values())
+
+    if num_samples >= total:
+        combinations = expand_grid(grid)
+        rng.shuffle(combinations)
+        return combinations
+
+    # Indices into the product, decoded without building it: the last key varies fastest.
+    keys = list(grid)
+    combinations = []
+
+    for index in rng.sample(range(total), num_samples):
+        values = {}
+        for key in reversed(keys):
+            index, i = divmod(index, len(grid[key]))
+            values[key] = grid[key][i]
+        combinations.append({key: values[key] for key in keys})
+
+    return combinations
+
+
+class SharedColumns:
+    # Candle columns packed into one shared memory block, workers map them read-only.
+
+    def __init__(self, shm: shared_memory.SharedMemory, size: int, owner: bool):
+        self.shm = shm
+        self.size = size
+        self.owner = owner
+
+    @staticmethod
+    def create(columns: dict) -> 'SharedColumns':
+        size = len(columns["close"])
+        shm = shared_memory.SharedMemory(create=True, size=max(size * 8 * len(COLUMN_NAMES), 1))
+        shared = SharedColumns(shm, size, owner=True)
+
+        for name, view in shared.columns(writeable=True).items():
+            view[:] = columns[name]
+
+        return shared
+
+    @staticmethod
+    def attach(name: str, size: int) -> 'SharedColumns':
+        return SharedColumns(shared_memory.SharedMemory(name=name), size, owner=False)
+
+    def columns(self, writeable=False) -> dict:
+        columns = {}
+
+        for i, name in enumerate(COLUMN_NAMES):
+            view = np.ndarray((self.size, ), dtype=COLUMN_DTYPES.get(name, np.float64), buffer=self.shm.buf, offset=i * self.size * 8)
+            view.flags.writeable = writeable
+            columns[name] = view
+
+        return columns
+
+    def close(self):
+        self.shm.close()
+
+        if self.owner:
+            self.shm.unlink()
+
+
+def _init_worker(shm_name: str, size: int):
+    global _shared, _columns
+
+    # Trade logs from thousands of runs are of no use, only the summaries are.
+    logger.remove()
+
+    _shared = SharedColumns.attach(shm_name, size)
+    _columns = _shared.columns()
+
+
+def _run_one(strategy: str, strategy_args: dict, period: 'CandleTimeInterval', preload: int, vectorized: bool, sweep: str, run: str, store: ResultsStore) -> dict:
+    result = run_backtest(strategy, strategy_args, _columns, period, preload=preload, vectorized=vectorized)
+
+    # Trade log and equity written by the worker, only the summary goes back.
+    if store is not None:
+        store.write(run, result, sweep=sweep, args=strategy_args)
+
+    return {"args": strategy_args, **result.summary()}
+
+
+def new_sweep_id() -> str:
+    # Start time and a random suffix, sweeps sharing a results directory keep their own runs.
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S%f')[:-3]}-{uuid.uuid4().hex[:6]}"
+
+
+def run_sweep(strategy: str,
+              combinations: list[dict],
+              columns: dict,
+              period: 'CandleTimeInterval',
+              preload: int = 300,
+              workers: int = None,
+              sort_by: str = "profit",
+              vectorized: bool = True,
+              store: ResultsStore = None) -> list[dict]:
+    workers = workers or os.cpu_count()
+    shared = SharedColumns.create(columns)
+    sweep = new_sweep_id()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared.shm.name, shared.size)) as executor:
+            futures = [executor.submit(_run_one, strategy, args, period, preload, vectorized, sweep, f"{sweep}-{i:06d}", store) for i, args in enumerate(combinations)]
+            results = [future.result() for future in futures]
+    finally:
+        shared.close()
+
+    # Lower is better only for the drawdown.
+    return sorted(results, key=lambda r: r[sort_by], reverse=sort_by != "max_drawdown")
+
+
+def format_table(results: list[dict], top: int = None) -> str:
+    lines = [f"{'#':>4} {'profit %':>10} {'drawdown %':>11} {'trades':>7} {'candles/s':>10}  args"]
+
+    for rank, r in enumerate(results[:top], start=1):
+        args = ";".join(f"{k}={v}" for k, v in r["args"].items())
+        lines.append(f"{rank:>4} {r['profit']:>10.2f} {r['max_drawdown']:>11.2f} {r['trades']:>7} {r['candles_per_second']:>10.0f}  {args}")
+
+    return "\n".join(lines)
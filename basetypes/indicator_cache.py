@@ -0,0 +1,103 @@
+from collections import OrderedDict
+
+import numpy as np
+import talib as ta
+from talib import abstract
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+class IndicatorCache:
+    # TA-Lib results over the candles of one chart, keyed by the function, its
+    # parameters (defaults filled in) and the chart version they were computed
+    # at. Strategies reading the same chart can share one instance, the first
+    # `get()` after a new candle computes, the others hit. The least recently
+    # used results are evicted past `max_entries` or `max_bytes`.
+
+    def __init__(self, chart: 'Chart', max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.chart = chart
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        # function name: (inputs, default parameters)
+        self.signatures = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def _signature(self, name: str) -> tuple:
+        if name not in self.signatures:
+            try:
+                info = abstract.Function(name)
+            except Exception:
+                raise ValueError(f"Unknown TA-Lib function '{name}'.")
+
+            inputs = []
+            for columns in info.input_names.values():
+                inputs.extend([columns] if isinstance(columns, str) else columns)
+
+            self.signatures[name] = (tuple(inputs), dict(info.parameters))
+
+        return self.signatures[name]
+
+    def key(self, name: str, **params) -> tuple:
+        name = name.upper()
+        _, defaults = self._signature(name)
+
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown {name} parameters: {', '.join(sorted(unknown))}.")
+
+        chart = self.chart
+        return name, tuple({**defaults, **params}.items()), chart.reset_version, chart.version
+
+    def get(self, name: str, **params):
+        # Output of `talib.<name>(**params)` over the chart window, a tuple for
+        # functions with several outputs. The arrays are shared, read only.
+        key = self.key(name, **params)
+
+        values = self.entries.get(key)
+        if values is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+        self.misses += 1
+
+        inputs, _ = self._signature(key[0])
+        columns = [np.asarray(self.chart.column(column), dtype=np.float64) for column in inputs]
+        values = getattr(ta, key[0])(*columns, **dict(key[1]))
+
+        for output in values if isinstance(values, tuple) else (values, ):
+            output.flags.writeable = False
+            self.nbytes += output.nbytes
+
+        self.entries[key] = values
+        self._evict()
+
+        return values
+
+    def _evict(self):
+        version = (self.chart.reset_version, self.chart.version)
+
+        # Results of older chart versions can't be hit any more.
+        for key in [key for key in self.entries if key[2:] != version]:
+            self._drop(key)
+
+        while self.entries and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key):
+        values = self.entries.pop(key)
+        for output in values if isinstance(values, tuple) else (values, ):
+            self.nbytes -= output.nbytes
@@ -1,191 +1,213 @@
 import numpy as np
 import talib as ta
+from basetypes.indicator_cache import IndicatorCache
+from utils.ring_buffer import RingBuffer
+from utils.streaming_indicators import DMI, EMA, RSI, SAR
+
+# name: (stream factory, input columns, outputs)
+STREAMS = {
+    "ema200": (lambda: EMA(200), ("close", ), ("ema200", )),
+    "ema50": (lambda: EMA(50), ("close", ), ("ema50", )),
+    "ema25": (lambda: EMA(25), ("close", ), ("ema25", )),
+    "ema12": (lambda: EMA(12), ("close", ), ("ema12", )),
+    "ema6": (lambda: EMA(6), ("close", ), ("ema6", )),
+    "rsi": (lambda: RSI(14), ("close", ), ("rsi", )),
+    "dmi": (lambda: DMI(14), ("high", "low", "close"), ("adx", "di_plus", "di_minus")),
+    "psar": (lambda: SAR(acceleration=0.02, maximum=0.2), ("high", "low"), ("psar", )),
+}
+
+# name: whole history TA-Lib equivalent of the stream, used by `Indicators.precompute`.
+PRECOMPUTE = {
+    "ema200": lambda h, l, c: (ta.EMA(c, timeperiod=200), ),
+    "ema50": lambda h, l, c: (ta.EMA(c, timeperiod=50), ),
+    "ema25": lambda h, l, c: (ta.EMA(c, timeperiod=25), ),
+    "ema12": lambda h, l, c: (ta.EMA(c, timeperiod=12), ),
+    "ema6": lambda h, l, c: (ta.EMA(c, timeperiod=6), ),
+    "rsi": lambda h, l, c: (ta.RSI(c, timeperiod=14), ),
+    "dmi": lambda h, l, c: (ta.ADX(h, l, c, timeperiod=14), ta.PLUS_DI(h, l, c, timeperiod=14), ta.MINUS_DI(h, l, c, timeperiod=14)),
+    "psar": lambda h, l, c: (ta.SAR(h, l, acceleration=0.02, maximum=0.2), ),
+}
+
+
+def precompute_outputs(columns: dict, names=None) -> dict:
+    # Whole history values of the `names` indicators (all by default), keyed by output.
+    high = np.asarray(columns["high"], dtype=np.float64)
+    low = np.asarray(columns["low"], dtype=np.float64)
+    close = np.asarray(columns["close"], dtype=np.float64)
+
+    outputs = {}
+    for name in names or STREAMS:
+        for output, values in zip(STREAMS[name][2], PRECOMPUTE[name](high, low, close)):
+            outputs[output] = values
+
+    return outputs
 
 
 class Indicators:
-    def __init__(self):
-        self.open = np.array([])
-        self.close = np.array([])
-        self.high = np.array([])
-        self.low = np.array([])
-        self.volume = np.array([])
-        self.datetime = np.array([])
-        self.psar = np.array([])
-        self.ema200 = np.array([])
-        self.ema50 = np.array([])
-        self.ema25 = np.array([])
-        self.ema12 = np.array([])
-        self.ema6 = np.array([])
-        self.rsi = np.array([])
-        self.adx = np.array([])
-        self.di_plus = np.array([])
-        self.di_minus = np.array([])
+    # Reads candle columns straight from the chart ring buffers. Indicator values
+    # are advanced lazily: each stream is fed only the candles appended since it
+    # was last read, so a closed candle costs O(1) per used indicator.
+
+    def __init__(self, chart: 'Chart'):
+        self.chart = chart
+        self.streams = {}
+        self.synced = {}
+        self.outputs = {}
+        self.precomputed = None
+        self.precomputed_version = None
+
+        # Shared by every `Indicators` of the chart.
+        if chart.indicator_cache is None:
+            chart.indicator_cache = IndicatorCache(chart)
+        self.cache = chart.indicator_cache
+
+        for name, (_, _, outputs) in STREAMS.items():
+            self.streams[name] = None
+            self.synced[name] = 0
+            for output in outputs:
+                self.outputs[output] = RingBuffer(chart.limit)
+
+    def precompute(self, columns: dict):
+        # `columns` hold the whole history the chart is going to be fed with,
+        # starting from the candles of its last reset. Indicators are computed
+        # once and every read only slices the chart window out of them.
+        self.precomputed = precompute_outputs(columns)
+        self.precomputed_version = self.chart.reset_version
+
+    def _precomputed(self, output):
+        chart = self.chart
+        end = chart.count
+
+        if self.precomputed_version != chart.reset_version or end > self.precomputed[output].size:
+            # The chart moved past the precomputed history, fall back to streaming.
+            self.precomputed = None
+            return None
+
+        return self.precomputed[output][end - len(chart):end]
+
+    def _sync(self, name):
+        factory, inputs, outputs = STREAMS[name]
+        chart = self.chart
+        series = [self.outputs[output] for output in outputs]
+
+        available = len(chart)
+        missing = chart.version - self.synced[name]
+
+        if self.streams[name] is None or self.synced[name] < chart.reset_version or missing > available:
+            # Chart was reset or the stream fell behind the chart limit, restart it over the kept window.
+            self.streams[name] = factory()
+            for output in series:
+                output.clear()
+            missing = available
+
+        self.synced[name] = chart.version
+
+        if not missing:
+            return
+
+        stream = self.streams[name]
+        columns = [chart.column(column)[-missing:].tolist() for column in inputs]
+
+        if len(outputs) == 1:
+            output = series[0]
+            for values in zip(*columns):
+                output.append(stream.update(*values))
+        else:
+            for values in zip(*columns):
+                for output, value in zip(series, stream.update(*values)):
+                    output.append(value)
+
+    def _output(self, name, output):
+        if not len(self.chart):
+            raise ValueError("Add candles to the chart first!")
+
+        if self.precomputed is not None:
+            values = self._precomputed(output)
+            if values is not None:
+                return values
+
+        self._sync(name)
+        return self.outputs[output].view()
+
+    def get(self, name: str, **params):
+        # Any TA-Lib function over the chart window, e.g. get("MACD", fastperiod=12),
+        # cached per parameters and chart version.
+        if not len(self.chart):
+            raise ValueError("Add candles to the chart first!")
+
+        return self.cache.get(name, **params)
+
+    @property
+    def size(self) -> int:
+        return len(self.chart)
 
     @property
     def datetime_array(self) -> np.array:
-        return self.datetime
-
-    @datetime_array.setter
-    def datetime_array(self, candles: list['Candle']):
-        self.datetime = list(map(lambda x: x.t_open, candles))
+        return self.chart.column("t_open")
 
     @property
     def close_array(self) -> np.array:
-        return self.close
-
-    @close_array.setter
-    def close_array(self, candles: list['Candle']):
-        self.close = np.array(list(map(lambda x: x.p_close, candles)))
+        return self.chart.column("close")
 
     @property
     def open_array(self) -> np.array:
-        return self.open
-
-    @open_array.setter
-    def open_array(self, candles: list['Candle']):
-        self.open = np.array(list(map(lambda x: x.p_open, candles)))
+        return self.chart.column("open")
 
     @property
     def high_array(self) -> np.array:
-        return self.high
-
-    @high_array.setter
-    def high_array(self, candles: list['Candle']):
-        self.high = np.array(list(map(lambda x: x.p_high, candles)))
+        return self.chart.column("high")
 
     @property
     def low_array(self) -> np.array:
-        return self.low
-
-    @low_array.setter
-    def low_array(self, candles: list['Candle']):
-        self.low = np.array(list(map(lambda x: x.p_low, candles)))
+        return self.chart.column("low")
 
     @property
     def volume_array(self) -> np.array:
-        return self.volume
-
-    @volume_array.setter
-    def volume_array(self, candles: list['Candle']):
-        self.volume = np.array(list(map(lambda x: x.volume, candles)))
+        return self.chart.column("volume")
 
     @property
     def ema200_array(self) -> np.array:
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.ema200.size != self.close.size:
-            self.ema200 = ta.EMA(self.close, timeperiod=200)
-
-        return self.ema200
+        return self._output("ema200", "ema200")
 
     @property
     def psar_array(self) -> np.array:
-        if not self.high.size:
-            raise ValueError("Set first high prices array!")
-
-        if not self.low.size:
-            raise ValueError("Set first low prices array!")
-
-        if self.psar.size != self.close.size:
-            self.psar = ta.SAR(self.high, self.low, acceleration=0.02, maximum=0.2)
-
-        return self.psar
+        return self._output("psar", "psar")
 
     @property
     def ema50_array(self) -> np.array:
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.ema50.size != self.close.size:
-            self.ema50 = ta.EMA(self.close, timeperiod=50)
-
-        return self.ema50
+        return self._output("ema50", "ema50")
 
     @property
     def ema25_array(self) -> np.array:
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.ema25.size != self.close.size:
-            self.ema25 = ta.EMA(self.close, timeperiod=25)
-
-        return self.ema25
+        return self._output("ema25", "ema25")
 
     @property
     def ema12_array(self) -> np.array:
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.ema12.size != self.close.size:
-            self.ema12 = ta.EMA(self.close, timeperiod=12)
-
-        return self.ema12
+        return self._output("ema12", "ema12")
 
     @property
     def ema6_array(self) -> np.array:
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.ema6.size != self.close.size:
-            self.ema6 = ta.EMA(self.close, timeperiod=6)
-
-        return self.ema6
+        return self._output("ema6", "ema6")
 
     @property
     def rsi_array(self) -> np.array:
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.rsi.size != self.close.size:
-            self.rsi = ta.RSI(self.close, timeperiod=14)
-
-        return self.rsi
+        return self._output("rsi", "rsi")
 
     @property
     def adx_array(self) -> np.array:
-        if not self.high.size:
-            raise ValueError("Set first high prices array!")
-
-        if not self.low.size:
-            raise ValueError("Set first low prices array!")
-
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.adx.size != self.close.size:
-            self.adx = ta.ADX(self.high, self.low, self.close, timeperiod=14)
-
-        return self.adx
+        return self._output("dmi", "adx")
 
     @property
     def di_plus_array(self) -> np.array:
-        if not self.high.size:
-            raise ValueError("Set first high prices array!")
-
-        if not self.low.size:
-            raise ValueError("Set first low prices array!")
-
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.di_plus.size != self.close.size:
-            self.di_plus = ta.PLUS_DI(self.high, self.low, self.close, timeperiod=14)
-
-        return self.di_plus
+        return self._output("dmi", "di_plus")
 
     @property
     def di_minus_array(self) -> np.array:
-        if not self.high.size:
-            raise ValueError("Set first high prices array!")
-
-        if not self.low.size:
-            raise ValueError("Set first low prices array!")
-
-        if not self.close.size:
-            raise ValueError("Set first close prices array!")
-
-        if self.di_minus.size != self.close.size:
-            self.di_minus = ta.MINUS_DI(self.high, self.low, self.close, timeperiod=14)
-
-        return self.di_minus
+        return self._output("dmi", "di_minus")
+
+    # Strategies read these without the `_array` suffix.
+    ema200 = ema200_array
+    ema50 = ema50_array
+    ema25 = ema25_array
+    ema12 = ema12_array
+    ema6 = ema6_array
@@ -0,0 +1,202 @@
+import numpy as np
+from utils.ring_buffer import RingBuffer
+
+# `Levels` kinds
+SUPPORT = 1
+RESIST = -1
+
+
+def _frozen(values, dtype) -> np.array:
+    values = np.array(values, dtype=dtype)
+    values.flags.writeable = False
+    return values
+
+
+class Delta:
+    # Change of one overlay since the previous flush: the appended rows, or the
+    # whole content when `replace` is set. Columns are read only copies, deltas
+    # can be handed to another thread or written to disk as they are.
+
+    def __init__(self, kind: str, name: str, replace: bool, columns: dict, meta: dict = None, capacity: int = None):
+        self.kind = kind
+        self.name = name
+        self.replace = replace
+        self.columns = columns
+        self.meta = meta or {}
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+
+class Overlay:
+    # Something a strategy draws over the chart, kept in NumPy columns. The rows
+    # appended since the last `flush()` make its delta, a `replace()` sends the
+    # whole content again. `meta` holds how to draw it, the keyword arguments of
+    # the constructor.
+    KIND = None
+    COLUMNS = {}
+
+    def __init__(self, name: str, capacity: int = None, **meta):
+        self.name = name
+        self.capacity = capacity
+        self.meta = meta
+        self.columns = {column: RingBuffer(capacity, dtype) for column, dtype in self.COLUMNS.items()}
+
+        self.appended = 0
+        self.replaced = False
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def view(self, column: str) -> np.array:
+        return self.columns[column].view()
+
+    def append(self, **values):
+        # Rows of every column, scalars are repeated for all of them.
+        columns = np.broadcast_arrays(*(np.atleast_1d(values[column]) for column in self.columns))
+        for buffer, column_values in zip(self.columns.values(), columns):
+            buffer.extend(column_values)
+
+        self.appended += columns[0].size
+
+    def replace(self, **values):
+        for buffer in self.columns.values():
+            buffer.clear()
+
+        self.append(**values)
+        self.replaced = True
+
+    def clear(self):
+        self.replace(**{column: () for column in self.COLUMNS})
+
+    def flush(self) -> Delta:
+        # None when nothing changed since the last flush.
+        if not self.replaced and not self.appended:
+            return None
+
+        size = len(self)
+        rows = size if self.replaced else min(self.appended, size)
+        columns = {column: _frozen(buffer.view()[size - rows:], buffer.dtype) for column, buffer in self.columns.items()}
+        delta = Delta(self.KIND, self.name, self.replaced, columns, dict(self.meta), self.capacity)
+
+        self.appended = 0
+        self.replaced = False
+        return delta
+
+    def apply(self, delta: Delta):
+        self.meta = dict(delta.meta)
+
+        if delta.replace:
+            self.replace(**delta.columns)
+        else:
+            self.append(**delta.columns)
+
+
+class Series(Overlay):
+    # Line over candle times drawn on `pane` ("price", "macd" or "scalping").
+    KIND = "series"
+    COLUMNS = {"t": np.int64, "value": np.float64}
+
+    def __init__(self, name: str, capacity: int = None, pane: str = "price", color=None, width: int = 1):
+        super().__init__(name, capacity, pane=pane, color=color, width=width)
+
+    def follow(self, t: np.array, values: np.array):
+        # For values that don't change once computed, like an indicator over the
+        # chart: only the rows after the last one kept are appended. Anything
+        # else, e.g. after a chart reset, replaces the content.
+        t = np.asarray(t)
+        size = len(self)
+
+        if size and t.size:
+            last = self.view("t")[-1]
+            i = np.searchsorted(t, last)
+            if i < t.size and t[i] == last:
+                if i + 1 < t.size:
+                    self.append(t=t[i + 1:], value=np.asarray(values)[i + 1:])
+                return
+
+        self.replace(t=t, value=values)
+
+
+class Markers(Overlay):
+    # Scatter symbols at (t, price), `style` is an index into the `styles`
+    # (symbol, size, color) registered with `style()`.
+    KIND = "markers"
+    COLUMNS = {"t": np.int64, "price": np.float64, "style": np.int16}
+
+    def __init__(self, name: str, capacity: int = None, styles: tuple = ()):
+        super().__init__(name, capacity, styles=tuple(styles))
+
+    def style(self, symbol: str, size: int = 10, color: str = "#000000") -> int:
+        style = (symbol, size, color)
+        styles = self.meta["styles"]
+
+        if style not in styles:
+            self.meta["styles"] = styles = styles + (style, )
+
+        return styles.index(style)
+
+
+class Levels(Overlay):
+    # Horizontal segments at `price` from `t_start` to `t_end`, `kind` SUPPORT or RESIST.
+    KIND = "levels"
+    COLUMNS = {"t_start": np.int64, "t_end": np.int64, "price": np.float64, "kind": np.int8}
+
+
+KINDS = {overlay.KIND: overlay for overlay in (Series, Markers, Levels)}
+
+
+class Overlays:
+    # The overlays of one strategy by name. The strategy creates and updates them
+    # while ticking, `flush()` collects the deltas after every tick. The drawing
+    # side keeps its own `Overlays` and `apply()`s them.
+
+    def __init__(self):
+        self.items = {}
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __getitem__(self, name) -> Overlay:
+        return self.items[name]
+
+    def _get(self, cls, name: str, **kwargs) -> Overlay:
+        overlay = self.items.get(name)
+
+        if overlay is None:
+            overlay = self.items[name] = cls(name, **kwargs)
+        elif not isinstance(overlay, cls):
+            raise ValueError(f"Overlay '{name}' is {overlay.KIND}, not {cls.KIND}.")
+
+        return overlay
+
+    def series(self, name: str, **kwargs) -> Series:
+        return self._get(Series, name, **kwargs)
+
+    def markers(self, name: str, **kwargs) -> Markers:
+        return self._get(Markers, name, **kwargs)
+
+    def levels(self, name: str, **kwargs) -> Levels:
+        return self._get(Levels, name, **kwargs)
+
+    def flush(self) -> list[Delta]:
+        deltas = []
+        for overlay in self.items.values():
+            delta = overlay.flush()
+            if delta is not None:
+                deltas.append(delta)
+
+        return deltas
+
+    def apply(self, delta: Delta) -> Overlay:
+        overlay = self.items.get(delta.name)
+
+        if overlay is None:
+            overlay = self.items[delta.name] = KINDS[delta.kind](delta.name, delta.capacity, **delta.meta)
+
+        overlay.apply(delta)
+        return overlay
@@ -0,0 +1,40 @@
+# Candles per second of the headless backtest engine for every strategy in
+# `strategies/`. Run from the repository root:
+#   python -m benchmarks.backtest [num_candles]
+
+import sys
+
+from backtest.engine import run_backtest
+from customtypes import CandleTimeInterval
+from loguru import logger
+from strategies.strategybase import StrategyBase
+from utils.strategy_manager import StrategyManager
+
+from benchmarks.common import random_walk_columns
+
+PRELOAD = 300
+
+STRATEGY_ARGS = {
+    "default": {"min-down": "3", "min-up": "3", "strict-down": "1", "strict-up": "1"},
+}
+
+
+def main(num_candles):
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    columns = random_walk_columns(num_candles + PRELOAD)
+    strategies = StrategyManager("strategies/").get_strategies(StrategyBase)
+
+    print(f"{'strategy':>14} {'path':>8} {'candles':>8} {'trades':>7} {'elapsed s':>10} {'candles/s':>11}")
+
+    for name in sorted(strategies):
+        result = run_backtest(name, STRATEGY_ARGS.get(name, {}), columns, CandleTimeInterval.I_1M, preload=PRELOAD)
+        summary = result.summary()
+        path = "ticks" if strategies[name].generate_signals is StrategyBase.generate_signals else "signals"
+
+        print(f"{name:>14} {path:>8} {summary['candles']:>8} {summary['trades']:>7} {summary['elapsed']:>10.3f} {summary['candles_per_second']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
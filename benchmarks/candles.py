@@ -0,0 +1,85 @@
+# Memory and construction time of 1M candles: the previous `__dict__` layout
+# against the `__slots__` Candle, one by one and through the bulk constructor.
+# Run from the repository root:
+#   python -m benchmarks.candles [num_candles]
+
+import sys
+import time
+import tracemalloc
+
+import util
+from candle import Candle, candles_from_columns, candles_to_columns
+from customtypes import CandleTimeInterval
+
+from benchmarks.common import random_walk_columns
+
+COLUMN_NAMES = ("t_open", "t_close", "open", "high", "low", "close", "volume")
+
+
+class DictCandle(object):
+    # Layout of `Candle` before `__slots__`, kept for comparison.
+    def __init__(self, period, t_open, t_close, p_open=None, p_close=None, p_high=None, p_low=None, volume=None):
+        self.current = None
+        self.p_open = p_open
+        self.p_close = p_close
+        self.p_high = p_high
+        self.p_low = p_low
+        self.volume = volume
+        self.period = util.interval_mapper_to_seconds(period)
+        self.average = float(0)
+        self.t_open = t_open
+        self.t_close = t_close
+
+        if not self.average:
+            prices = [self.p_high, self.p_low, self.p_close]
+
+            if None not in prices:
+                self.average = sum(prices) / 3
+
+
+def one_by_one(cls, period, columns):
+    rows = zip(*(columns[name].tolist() for name in COLUMN_NAMES))
+    return [cls(period, t_o, t_c, p_open=o, p_close=c, p_high=h, p_low=l, volume=v) for t_o, t_c, o, h, l, c, v in rows]
+
+
+def measure(build):
+    # Timed and traced in separate runs, tracing slows allocations down.
+    t = time.perf_counter()
+    candles = build()
+    elapsed = time.perf_counter() - t
+    del candles
+
+    tracemalloc.start()
+    candles = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return candles, elapsed, size
+
+
+def main(num_candles):
+    period = CandleTimeInterval.I_1M
+    columns = random_walk_columns(num_candles)
+
+    print(f"{'layout':>24} {'build s':>8} {'candles/s':>11} {'bytes/candle':>13}")
+
+    reference = None
+    for name, build in (("dict, one by one", lambda: one_by_one(DictCandle, period, columns)),
+                        ("slots, one by one", lambda: one_by_one(Candle, period, columns)),
+                        ("slots, from columns", lambda: candles_from_columns(period, columns))):
+        candles, elapsed, size = measure(build)
+        print(f"{name:>24} {elapsed:>8.3f} {num_candles / elapsed:>11.0f} {size / num_candles:>13.1f}")
+
+        if isinstance(candles[0], Candle):
+            round_trip = candles_to_columns(candles)
+            assert all((round_trip[name] == columns[name]).all() for name in COLUMN_NAMES)
+
+        if reference is not None:
+            assert all(a.average == b.average and a.period == b.period for a, b in zip(candles[::997], reference[::997]))
+        reference = candles
+
+        del candles
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,23 @@
+import numpy as np
+from candle import candles_from_columns
+from customtypes import CandleTimeInterval
+
+
+def random_walk_columns(n, seed=42, start=1_600_000_000, period=60):
+    rng = np.random.default_rng(seed)
+
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    close = np.abs(close) + 1
+    p_open = np.r_[close[0], close[:-1]]
+    high = np.maximum(p_open, close) + rng.random(n)
+    low = np.minimum(p_open, close) - rng.random(n)
+    volume = rng.random(n) * 100
+
+    t_open = start + np.arange(n, dtype=np.int64) * period
+    t_close = t_open + period - 1
+
+    return {"t_open": t_open, "t_close": t_close, "open": p_open, "high": high, "low": low, "close": close, "volume": volume}
+
+
+def random_walk_candles(n, seed=42, period=CandleTimeInterval.I_1M):
+    return candles_from_columns(period, random_walk_columns(n, seed))
@@ -0,0 +1,52 @@
+# Several strategies on one pair and period reading the same TA-Lib indicators
+# on every new candle, each calling TA-Lib against sharing the chart's
+# `IndicatorCache`. Run from the repository root:
+#   python -m benchmarks.indicator_cache [num_strategies] [chart_size]
+
+import sys
+from time import perf_counter
+
+import numpy as np
+import talib as ta
+from basetypes.indicators import Indicators
+from chart import Chart
+
+from benchmarks.common import random_walk_candles
+
+TICKS = 500
+
+
+def direct(indicators):
+    close = indicators.close_array
+    return ta.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9) + (ta.SMA(close, 15), ta.SMA(close, 5))
+
+
+def cached(indicators):
+    return indicators.get("MACD", fastperiod=12, slowperiod=26, signalperiod=9) + (indicators.get("SMA", timeperiod=15), indicators.get("SMA", timeperiod=5))
+
+
+def main(num_strategies, size):
+    candles = random_walk_candles(size + TICKS)
+
+    print(f"{'method':>8} {'strategies':>11} {'candles':>8} {'us/tick':>10}")
+
+    results = {}
+    for name, read in (("direct", direct), ("cached", cached)):
+        chart = Chart(None, None, None)
+        chart.reset(candles[:size])
+        strategies = [Indicators(chart) for _ in range(num_strategies)]
+
+        start = perf_counter()
+        for candle in candles[size:]:
+            chart.add(candle)
+            results[name] = [read(indicators) for indicators in strategies]
+        elapsed = (perf_counter() - start) / TICKS
+
+        print(f"{name:>8} {num_strategies:>11} {size:>8} {elapsed * 1e6:>10.1f}")
+
+    for a, b in zip(results["direct"], results["cached"]):
+        assert all(np.array_equal(x, y, equal_nan=True) for x, y in zip(a, b)), "cached values differ from TA-Lib"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4, int(sys.argv[2]) if len(sys.argv) > 2 else 10_000)
@@ -0,0 +1,70 @@
+# Per-tick cost of the streaming Indicators engine against a full TA-Lib
+# recomputation, for growing chart sizes. Run from the repository root:
+#   python -m benchmarks.indicators
+
+from time import perf_counter
+
+import numpy as np
+import talib as ta
+from basetypes.indicators import Indicators
+from chart import Chart
+from utils.streaming_indicators import TALIB_TOLERANCE
+
+from benchmarks.common import random_walk_candles
+
+SIZES = (1_000, 10_000, 100_000)
+TICKS = 200
+
+
+def read_all(indicators):
+    return (indicators.ema6_array, indicators.ema12_array, indicators.ema25_array, indicators.ema50_array, indicators.ema200_array,
+            indicators.rsi_array, indicators.adx_array, indicators.di_plus_array, indicators.di_minus_array, indicators.psar_array)
+
+
+def talib_all(candles):
+    h = np.array(list(map(lambda x: x.p_high, candles)))
+    l = np.array(list(map(lambda x: x.p_low, candles)))
+    c = np.array(list(map(lambda x: x.p_close, candles)))
+
+    return (ta.EMA(c, timeperiod=6), ta.EMA(c, timeperiod=12), ta.EMA(c, timeperiod=25), ta.EMA(c, timeperiod=50), ta.EMA(c, timeperiod=200),
+            ta.RSI(c, timeperiod=14), ta.ADX(h, l, c, timeperiod=14), ta.PLUS_DI(h, l, c, timeperiod=14), ta.MINUS_DI(h, l, c, timeperiod=14),
+            ta.SAR(h, l, acceleration=0.02, maximum=0.2))
+
+
+def check(indicators, candles):
+    for streamed, reference in zip(read_all(indicators), talib_all(candles)):
+        assert np.array_equal(np.isnan(streamed), np.isnan(reference))
+        mask = ~np.isnan(reference)
+        assert np.max(np.abs(streamed[mask] - reference[mask])) <= TALIB_TOLERANCE
+
+
+def main():
+    print(f"{'candles':>10} {'streaming us/tick':>18} {'ta-lib us/tick':>16}")
+
+    for size in SIZES:
+        candles = random_walk_candles(size + TICKS)
+        history, ticks = candles[:size], candles[size:]
+
+        chart = Chart(None, None, None)
+        chart.reset(history)
+        indicators = Indicators(chart)
+        read_all(indicators)
+
+        start = perf_counter()
+        for candle in ticks:
+            chart.add(candle)
+            read_all(indicators)
+        streaming = (perf_counter() - start) / TICKS
+
+        check(indicators, candles)
+
+        start = perf_counter()
+        for i in range(TICKS):
+            talib_all(candles[:size + i + 1])
+        full = (perf_counter() - start) / TICKS
+
+        print(f"{size:>10} {streaming * 1e6:>18.1f} {full * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Decoding speed of REST kline pages and websocket kline frames, the previous
+# per field conversion against every installed backend of `utils.json_decoding`.
+# Run from the repository root:
+#   python -m benchmarks.json_decoding [num_rows]
+
+import json
+import sys
+import timeit
+
+import util
+from candle import Candle
+from utils.json_decoding import BACKENDS, get_decoder
+
+MINUTE_MS = 60_000
+START = 1_600_000_000_000
+
+
+def rest_page(num_rows):
+    rows = []
+    for i in range(num_rows):
+        t = START + i * MINUTE_MS
+        rows.append([t, "100.12000000", "101.00000000", "99.50000000", "100.50000000", "12.34500000", t + MINUTE_MS - 1, "1234.5", 10, "1.0", "100.0", "0"])
+
+    return json.dumps(rows).encode()
+
+
+def ws_frame():
+    kline = {"t": START, "T": START + MINUTE_MS - 1, "s": "BTCUSDT", "i": "1m", "f": 100, "L": 200, "o": "100.12000000", "c": "100.50000000", "h": "101.00000000", "l": "99.50000000", "v": "12.34500000", "n": 100, "x": False, "q": "1234.5", "V": "1.0", "Q": "100.0", "B": "0"}
+    return json.dumps({"stream": "btcusdt@kline_1m", "data": {"e": "kline", "E": START + 1, "s": "BTCUSDT", "k": kline}}).encode()
+
+
+def rows_to_candles(payload):
+    # Previous `Binance.returnKlines` path.
+    period = util.interval_mapper("1m")
+    candles = []
+    for kline in json.loads(payload):
+        (o_t, o_p, h_p, l_p, c_p, v, c_t, *x) = kline
+        candles.append(Candle(period, int(o_t / 1000), int(c_t / 1000), p_open=float(o_p), p_close=float(c_p), p_high=float(h_p), p_low=float(l_p), volume=float(v)))
+
+    return candles
+
+
+def frame_to_fields(frame):
+    # Previous `WebsocketLiveTicker.on_message` path.
+    kline = json.loads(frame).get("data").get("k")
+    return (int(int(kline.get("t")) / 1000), int(int(kline.get("T")) / 1000), float(kline.get("o")), float(kline.get("c")), float(kline.get("h")), float(kline.get("l")),
+            float(kline.get("v")), float(kline.get("x")))
+
+
+def bench(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main(num_rows):
+    page = rest_page(num_rows)
+    frame = ws_frame()
+
+    print(f"{'path':>22} {'page (%d rows) ms' % num_rows:>20} {'rows/s':>12} {'frame us':>10} {'frames/s':>10}")
+
+    page_s = bench(lambda: rows_to_candles(page), 20)
+    frame_s = bench(lambda: frame_to_fields(frame), 20_000)
+    print(f"{'json + per field':>22} {page_s * 1e3:>20.3f} {num_rows / page_s:>12.0f} {frame_s * 1e6:>10.2f} {1 / frame_s:>10.0f}")
+
+    for name in BACKENDS:
+        decoder = get_decoder(name)
+        page_s = bench(lambda: decoder.decode_klines(page), 20)
+        frame_s = bench(lambda: decoder.decode_kline_frame(frame), 20_000)
+        print(f"{name:>22} {page_s * 1e3:>20.3f} {num_rows / page_s:>12.0f} {frame_s * 1e6:>10.2f} {1 / frame_s:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,84 @@
+# Paged kline download against a local stand-in for the Binance klines API,
+# sequential vs concurrent. Run from the repository root:
+#   python -m benchmarks.kline_download [num_candles] [latency_ms]
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from exchange_api.kline_downloader import KLINES_WEIGHT, KlineDownloader
+from exchange_api.transport import Transport
+
+MINUTE_MS = 60_000
+START = 1_600_000_000_000 // MINUTE_MS * MINUTE_MS
+
+
+class KlinesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    num_candles = 0
+    used_weight = 0
+
+    def do_GET(self):
+        query = {k: int(v[0]) if v[0].isdigit() else v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        time.sleep(self.latency)
+
+        first = max(-(-(query["startTime"] - START) // MINUTE_MS), 0)
+        last = min((query["endTime"] - START) // MINUTE_MS, self.num_candles - 1)
+        last = min(last, first + query["limit"] - 1)
+
+        klines = []
+        for i in range(first, last + 1):
+            t = START + i * MINUTE_MS
+            price = f"{100 + i % 50:.2f}"
+            klines.append([t, price, price, price, price, "1.0", t + MINUTE_MS - 1, "0", 1, "0", "0", "0"])
+
+        KlinesHandler.used_weight += KLINES_WEIGHT
+        body = json.dumps(klines).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-MBX-USED-WEIGHT-1M", str(KlinesHandler.used_weight))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(num_candles, latency_ms):
+    KlinesHandler.latency = latency_ms / 1000
+    KlinesHandler.num_candles = num_candles
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KlinesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}"
+
+    end = START + num_candles * MINUTE_MS
+    print(f"{'workers':>8} {'candles':>8} {'elapsed s':>10} {'candles/s':>11}")
+
+    reference = None
+    for workers in (1, 4, 8, 16):
+        KlinesHandler.used_weight = 0
+        downloader = KlineDownloader(Transport([endpoint]), workers=workers)
+
+        t = time.perf_counter()
+        klines = downloader.download("BTCUSDT", "1m", START, end)
+        elapsed = time.perf_counter() - t
+
+        opens = klines["t_open"].tolist()
+        assert opens == sorted(set(opens)) and len(opens) == num_candles
+        assert reference is None or all((klines[name] == reference[name]).all() for name in klines)
+        reference = klines
+
+        print(f"{workers:>8} {len(opens):>8} {elapsed:>10.3f} {len(opens) / elapsed:>11.0f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000, float(sys.argv[2]) if len(sys.argv) > 2 else 50)
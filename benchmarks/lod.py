@@ -0,0 +1,109 @@
+# A zoomed out chart drawn the way `MainWindow` does, the candles and 16
+# indicator curves handed over at full length against their reduction by
+# `utils.lod.LevelOfDetail` for the plot width. The reduction is timed alone,
+# then both are rendered into an offscreen widget when PyQt5 and pyqtgraph are
+# installed (QT_QPA_PLATFORM defaults to "offscreen"). Run from the repository root:
+#   python -m benchmarks.lod [num_candles] [width]
+
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+import talib as ta
+from utils.lod import LevelOfDetail
+
+from benchmarks.common import random_walk_columns
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
+
+PERIODS = range(6, 6 + 16 * 12, 12)
+REPEATS = 20
+RENDERS = 5
+
+
+def full(columns, curves):
+    t = columns["t_open"]
+    return (t, columns["open"], columns["close"], columns["low"], columns["high"]), [(t, y) for y in curves]
+
+
+def reduced(lod, columns, curves):
+    t = columns["t_open"]
+    return lod.ohlc(t, columns["open"], columns["close"], columns["low"], columns["high"]), [lod.curve(t, y) for y in curves]
+
+
+def render(columns, curves, width, lod=None):
+    from app import CandlestickItem
+
+    app = pg.mkQApp()
+    widget = pg.PlotWidget()
+    widget.resize(width, 600)
+    plot = widget.getPlotItem()
+
+    candles = CandlestickItem()
+    plot.addItem(candles)
+    items = [plot.plot() for _ in curves]
+
+    t = columns["t_open"]
+    plot.setXRange(t[0], t[-1], padding=0)
+    plot.setYRange(np.min(columns["low"]), np.max(columns["high"]), padding=0)
+    widget.show()
+    app.processEvents()
+
+    if lod is not None:
+        lod.set_view(t[0], t[-1], plot.getViewBox().width())
+
+    # Every round is a tick: the series handed over, then the widget drawn.
+    start = perf_counter()
+    for _ in range(RENDERS):
+        ohlc, lines = full(columns, curves) if lod is None else reduced(lod, columns, curves)
+
+        candles.setData(*ohlc)
+        for item, (x, y) in zip(items, lines):
+            item.setData(x, y)
+
+        widget.grab()
+    elapsed = (perf_counter() - start) / RENDERS
+
+    widget.close()
+    return elapsed
+
+
+def main(num_candles, width):
+    columns = random_walk_columns(num_candles)
+    curves = [ta.EMA(columns["close"], timeperiod=period) for period in PERIODS]
+    t = columns["t_open"]
+
+    lod = LevelOfDetail(60)
+    lod.set_view(t[0], t[-1], width)
+
+    start = perf_counter()
+    for _ in range(REPEATS):
+        ohlc, lines = reduced(lod, columns, curves)
+    elapsed = (perf_counter() - start) / REPEATS
+
+    points = ohlc[0].size + sum(x.size for x, _ in lines)
+    print(f"{num_candles} candles, {len(curves)} curves, {width}px: {lod.span // 60} candles per bucket, "
+          f"{num_candles * (len(curves) + 1)} -> {points} points, reduced in {elapsed * 1e3:.2f} ms")
+
+    # Nothing drawn is lost: the extremes of every series are kept.
+    assert np.min(ohlc[3]) == np.min(columns["low"]) and np.max(ohlc[4]) == np.max(columns["high"])
+    for (_, y), values in zip(lines, curves):
+        assert np.nanmin(y) == np.nanmin(values) and np.nanmax(y) == np.nanmax(values), "decimated curve lost its extremes"
+
+    if pg is None:
+        print("pyqtgraph is not installed, rendering skipped.")
+        return
+
+    print(f"{'series':>8} {'ms/tick':>10}")
+    for name, level in (("full", None), ("lod", LevelOfDetail(60))):
+        print(f"{name:>8} {render(columns, curves, width, level) * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000, int(sys.argv[2]) if len(sys.argv) > 2 else 1600)
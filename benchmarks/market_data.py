@@ -0,0 +1,106 @@
+# Market data client against a local websocket server replaying kline frames
+# as fast as it can, with a consumer slower than the feed. Closed klines must
+# all arrive in order while intra-candle updates get conflated. The server drops
+# the connection once to exercise reconnects. Run from the repository root:
+#   python -m benchmarks.market_data [num_candles] [updates_per_candle] [handler_ms]
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import websockets
+from loguru import logger
+
+from workers.market_data import MarketDataClient
+
+MINUTE_MS = 60_000
+STREAMS = ("btcusdt@kline_1m", "ethusdt@kline_1m")
+
+
+def kline_frames(num_candles, updates_per_candle):
+    frames = []
+
+    for i in range(num_candles):
+        t = 1_600_000_000_000 + i * MINUTE_MS
+        for u in range(updates_per_candle):
+            closed = u == updates_per_candle - 1
+            for stream in STREAMS:
+                event = {"e": "kline", "E": t + u, "s": stream, "k": {"t": t, "T": t + MINUTE_MS - 1, "o": "100.0", "c": f"{100 + u}.0", "h": f"{100 + u}.0", "l": "99.0", "v": "1.0", "x": closed}}
+                frames.append(json.dumps({"stream": stream, "data": event}))
+
+    return frames
+
+
+class Recorder(MarketDataClient):
+    def __init__(self, url, handler_ms):
+        MarketDataClient.__init__(self, STREAMS, name="market-data-bench", url=url, backoff=(0.05, 1.0))
+        self.handler_ms = handler_ms
+        self.events = 0
+        self.closed = {stream: [] for stream in STREAMS}
+
+    def on_event(self, stream, event, received):
+        self.events += 1
+        if event.kline.closed:
+            self.closed[stream].append(event.kline.t_open)
+
+        time.sleep(self.handler_ms / 1000)
+
+
+def main(num_candles, updates_per_candle, handler_ms):
+    logger.remove()
+    frames = kline_frames(num_candles, updates_per_candle)
+    drop_at = len(frames) // 2
+    sent = 0
+
+    async def replay(ws, *args):
+        nonlocal sent
+        for frame in frames[sent:]:
+            await ws.send(frame)
+            sent += 1
+
+            if sent == drop_at:
+                # Simulated network drop, the client resumes on a new connection.
+                await ws.close()
+                return
+
+        await ws.wait_closed()
+
+    ready = threading.Event()
+    server = {}
+
+    def serve():
+        async def run():
+            async with websockets.serve(replay, "127.0.0.1", 0) as s:
+                server["port"] = s.sockets[0].getsockname()[1]
+                server["stop"] = asyncio.get_running_loop().create_future()
+                ready.set()
+                await server["stop"]
+
+        asyncio.run(run())
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+
+    client = Recorder(f"ws://127.0.0.1:{server['port']}/stream?streams=", handler_ms)
+    t = time.perf_counter()
+    client.start()
+
+    while any(len(closed) < num_candles for closed in client.closed.values()):
+        time.sleep(0.01)
+
+    elapsed = time.perf_counter() - t
+    client.stop()
+    client.join()
+
+    expected = [1_600_000_000_000 + i * MINUTE_MS for i in range(num_candles)]
+    assert all(closed == expected for closed in client.closed.values())
+
+    print(f"frames: {len(frames)}, read: {client.frames}, handled: {client.events}, conflated: {client.queue.conflated}, reconnects: {client.reconnects}")
+    print(f"elapsed: {elapsed:.3f}s, frames/s: {client.frames / elapsed:.0f}, closed klines complete and in order")
+
+
+if __name__ == "__main__":
+    args = [float(v) for v in sys.argv[1:]]
+    main(int(args[0]) if args else 500, int(args[1]) if len(args) > 1 else 20, args[2] if len(args) > 2 else 1.0)
@@ -0,0 +1,75 @@
+# Candlestick pattern detection on every new candle, the CDL functions over the
+# whole history against `utils.pattern_scanner.PatternScanner` reading only the
+# tail each pattern needs. Run from the repository root:
+#   python -m benchmarks.patterns [num_candles]
+
+import sys
+import time
+
+import numpy as np
+import talib as ta
+from candle import candles_from_columns
+from chart import Chart
+from customtypes import CandleTimeInterval
+from strategies.pt import PATTERNS
+from utils.pattern_scanner import PatternScanner
+
+from benchmarks.common import random_walk_columns
+
+PRELOAD = 300
+
+
+def whole_history(chart, candles):
+    functions = [getattr(ta, name) for name in PATTERNS]
+    events = []
+
+    for candle in candles:
+        chart.add(candle)
+        o, h, l, c = (chart.column(name) for name in ("open", "high", "low", "close"))
+
+        for pattern, function in enumerate(functions):
+            if (value := function(o, h, l, c)[-1]) != 0:
+                events.append((candle.t_open, pattern, int(value)))
+
+    return events
+
+
+def scanner(chart, candles):
+    patterns = PatternScanner({name: price for name, (price, _) in PATTERNS.items()}, capacity=len(candles) * len(PATTERNS))
+    patterns.sync(chart)
+    patterns.events.clear()
+
+    for candle in candles:
+        chart.add(candle)
+        patterns.sync(chart)
+
+    events = patterns.events.query()
+    return list(zip(events["t_open"].tolist(), events["pattern"].tolist(), events["value"].tolist()))
+
+
+def main(num_candles):
+    columns = random_walk_columns(num_candles + PRELOAD)
+    # Flat candles make dojis and gaps show up.
+    for name in ("open", "high", "low", "close"):
+        columns[name] = np.round(columns[name], 1)
+
+    candles = candles_from_columns(CandleTimeInterval.I_1M, columns)
+
+    print(f"{'method':>14} {'candles':>8} {'events':>7} {'elapsed s':>10} {'candles/s':>10}")
+
+    results = {}
+    for name, method in (("whole history", whole_history), ("scanner", scanner)):
+        chart = Chart(None, None, None, CandleTimeInterval.I_1M)
+        chart.reset(candles[:PRELOAD])
+
+        t = time.perf_counter()
+        results[name] = method(chart, candles[PRELOAD:])
+        elapsed = time.perf_counter() - t
+
+        print(f"{name:>14} {num_candles:>8} {len(results[name]):>7} {elapsed:>10.3f} {num_candles / elapsed:>10.0f}")
+
+    assert results["whole history"] == results["scanner"], "scanner events differ from the whole history"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
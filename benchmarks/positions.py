@@ -0,0 +1,81 @@
+# Exits of positions opened on random entry candles, the candle by candle
+# `Position` loop of `StrategyBase` against `backtest.positions.PositionSimulator`.
+# Run from the repository root:
+#   python -m benchmarks.positions [num_candles]
+
+import sys
+import time
+
+import numpy as np
+from candle import candles_from_columns
+from customtypes import CandleTimeInterval, TradingMode
+from loguru import logger
+from position import Position
+
+from backtest.positions import simulate_positions
+from benchmarks.common import random_walk_columns
+
+SCENARIOS = {
+    # name: (entry rate, exit signal rate, ratchet rate, stop loss %, prop limit %)
+    "stop loss": (0.01, 0.0, 0.0, 1.0, 0.0),
+    "signals + stop loss": (0.01, 0.001, 0.0, 1.0, 0.0),
+    "prop limit ratchet": (0.01, 0.0, 0.5, 5.0, 1.0),
+}
+
+
+def per_candle(candles, entries, exits, prop_limits, stop_loss_percent, prop_limit_percent):
+    position = None
+    closed = []
+
+    for i, candle in enumerate(candles):
+        if position is None and entries[i]:
+            position = Position(None, 0, TradingMode.BACKTEST, None, stop_loss_percent)
+            position.open(candle)
+            position.index = i
+
+        if position is not None and exits[i]:
+            position.close(candle)
+
+        if position is not None and not position.close_candle:
+            if prop_limits[i]:
+                position.set_prop_limit(candle, prop_limit_percent)
+
+            position.tick(candle)
+
+        if position is not None and position.close_candle:
+            closed.append((position.index, i))
+            position = None
+
+    return closed
+
+
+def main(num_candles):
+    logger.remove()
+
+    rng = np.random.default_rng(7)
+    columns = random_walk_columns(num_candles)
+    candles = candles_from_columns(CandleTimeInterval.I_1M, columns)
+
+    print(f"{'scenario':>20} {'positions':>10} {'per candle s':>13} {'simulator s':>12} {'speedup':>8}")
+
+    for name, (entry_rate, exit_rate, ratchet_rate, stop_loss_percent, prop_limit_percent) in SCENARIOS.items():
+        entries = rng.random(num_candles) < entry_rate
+        exits = rng.random(num_candles) < exit_rate
+        prop_limits = rng.random(num_candles) < ratchet_rate
+
+        t = time.perf_counter()
+        closed = per_candle(candles, entries, exits, prop_limits, stop_loss_percent, prop_limit_percent)
+        loop_elapsed = time.perf_counter() - t
+
+        t = time.perf_counter()
+        fills = simulate_positions(columns, entries, exits, stop_loss_percent, prop_limits, prop_limit_percent)
+        elapsed = time.perf_counter() - t
+
+        simulated = list(zip(fills.entry_index[fills.closed].tolist(), fills.exit_index[fills.closed].tolist()))
+        assert simulated == closed, f"{name}: simulated exits differ from the per candle loop"
+
+        print(f"{name:>20} {len(fills):>10} {loop_elapsed:>13.3f} {elapsed:>12.3f} {loop_elapsed / elapsed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,76 @@
+# Events per second of `backtest.replay.ReplayEngine` over gzip compressed
+# recordings of trade events and of kline update frames, written to a temporary
+# directory first. Run from the repository root:
+#   python -m benchmarks.replay [num_candles] [events_per_candle]
+
+import gzip
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from backtest.replay import run_replay
+from candle import candles_from_columns
+from customtypes import CandleTimeInterval
+from loguru import logger
+
+from benchmarks.common import random_walk_columns
+
+PRELOAD = 300
+STRATEGY_ARGS = {"min-down": "3", "min-up": "3", "strict-down": "1", "strict-up": "1"}
+
+
+def write_recordings(directory: Path, columns: dict, per_candle: int) -> tuple[Path, Path]:
+    rng = np.random.default_rng(7)
+    trades_path = directory / "trades.jsonl.gz"
+    klines_path = directory / "klines.jsonl.gz"
+
+    with gzip.open(trades_path, "wt") as trades, gzip.open(klines_path, "wt") as klines:
+        for t_open, o, h, l, c in zip(*(columns[name].tolist() for name in ("t_open", "open", "high", "low", "close"))):
+            t_ms = t_open * 1000
+            prices = np.r_[o, rng.uniform(l, h, per_candle - 2), c]
+            prices[1:-1][:2] = (h, l)
+            times = t_ms + np.sort(rng.integers(0, 60_000, per_candle))
+            quantities = rng.random(per_candle)
+
+            high = low = prices[0]
+            volume = 0.0
+            for i, (t, price, quantity) in enumerate(zip(times.tolist(), prices.tolist(), quantities.tolist())):
+                trades.write(json.dumps({"e": "trade", "E": t, "s": "BTCUSDT", "p": f"{price:.8f}", "q": f"{quantity:.8f}", "T": t}) + "\n")
+
+                high, low = max(high, price), min(low, price)
+                volume += quantity
+                kline = {"t": t_ms, "T": t_ms + 59_999, "o": f"{prices[0]:.8f}", "c": f"{price:.8f}", "h": f"{high:.8f}", "l": f"{low:.8f}", "v": f"{volume:.8f}", "x": i == per_candle - 1}
+                klines.write(json.dumps({"stream": "btcusdt@kline_1m", "data": {"e": "kline", "E": t, "k": kline}}) + "\n")
+
+    return trades_path, klines_path
+
+
+def main(num_candles, per_candle):
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    print(f"{'recording':>10} {'MB':>6} {'events':>9} {'candles':>8} {'trades':>7} {'elapsed s':>10} {'events/s':>10} {'peak MB':>8}")
+
+    # Trades are bucketed by minute, the candles have to start on one.
+    columns = random_walk_columns(num_candles + PRELOAD, start=1_600_000_020)
+    preload = candles_from_columns(CandleTimeInterval.I_1M, columns, 0, PRELOAD)
+    recorded = {name: values[PRELOAD:] for name, values in columns.items()}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for path in write_recordings(Path(directory), recorded, per_candle):
+            tracemalloc.start()
+            result = run_replay("default", STRATEGY_ARGS, [path], CandleTimeInterval.I_1M, preload=preload)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            summary = result.summary()
+            name = path.name.split(".")[0]
+            print(f"{name:>10} {path.stat().st_size / 1e6:>6.1f} {summary['events']:>9} {summary['candles']:>8} {summary['trades']:>7} "
+                  f"{summary['elapsed']:>10.2f} {summary['events_per_second']:>10.0f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,46 @@
+# Higher timeframes built from a 1m history, `utils.resampler.resample_columns`
+# over the columns against `Resampler` fed one candle at a time (the live path,
+# through `Chart.add_timeframe`). Run from the repository root:
+#   python -m benchmarks.resample [num_candles]
+
+import sys
+import time
+
+import numpy as np
+from candle import candles_from_columns
+from chart import Chart
+from customtypes import CandleTimeInterval
+from utils.resampler import resample_columns
+
+from benchmarks.common import random_walk_columns
+
+PERIODS = (CandleTimeInterval.I_5M, CandleTimeInterval.I_1H, CandleTimeInterval.I_1D)
+
+
+def main(num_candles):
+    columns = random_walk_columns(num_candles)
+    candles = candles_from_columns(CandleTimeInterval.I_1M, columns)
+
+    print(f"{'period':>8} {'candles':>8} {'out':>7} {'vectorized s':>13} {'per candle us':>14}")
+
+    for period in PERIODS:
+        t = time.perf_counter()
+        resampled = resample_columns(columns, period)
+        vectorized = time.perf_counter() - t
+
+        chart = Chart(None, None, None, CandleTimeInterval.I_1M)
+        timeframe = chart.add_timeframe(period)
+
+        t = time.perf_counter()
+        for candle in candles:
+            chart.add(candle)
+        live = time.perf_counter() - t
+
+        for name, values in resampled.items():
+            assert np.array_equal(values, timeframe.column(name)), f"{period} {name} differs from the live path"
+
+        print(f"{period.name:>8} {num_candles:>8} {len(timeframe):>7} {vectorized:>13.4f} {live / num_candles * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,56 @@
+# Writing and aggregating backtest results with `backtest.results.ResultsStore`:
+# one backtest written as many runs in every format (Parquet and Arrow when
+# pyarrow is installed), then the per run statistics of `aggregate()` read back
+# from the profit and reason columns only. Run from the repository root:
+#   python -m benchmarks.results [num_candles] [num_runs]
+
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from backtest.engine import run_backtest
+from backtest.results import FORMATS, ResultsStore, pa
+from customtypes import CandleTimeInterval
+from loguru import logger
+
+from benchmarks.backtest import PRELOAD, STRATEGY_ARGS
+from benchmarks.common import random_walk_columns
+
+STRATEGY = "default"
+
+
+def main(num_candles, num_runs):
+    logger.remove()
+
+    columns = random_walk_columns(num_candles + PRELOAD)
+    result = run_backtest(STRATEGY, STRATEGY_ARGS[STRATEGY], columns, CandleTimeInterval.I_1M, preload=PRELOAD)
+
+    print(f"{num_runs} runs of {result.num_candles} candles, {len(result.trade_log)} trades")
+    print(f"{'format':>8} {'write ms/run':>13} {'aggregate ms/run':>17} {'kB/run':>8}")
+
+    for fmt in FORMATS:
+        if fmt != "npz" and pa is None:
+            print(f"{fmt:>8} pyarrow is not installed, skipped.")
+            continue
+
+        with tempfile.TemporaryDirectory() as root:
+            store = ResultsStore(root, fmt)
+
+            start = perf_counter()
+            for run in range(num_runs):
+                store.write(f"{run:06d}", result, args=STRATEGY_ARGS[STRATEGY])
+            write = (perf_counter() - start) / num_runs
+
+            start = perf_counter()
+            rows = store.aggregate()
+            aggregate = (perf_counter() - start) / num_runs
+
+            assert len(rows) == num_runs and rows[0]["trades"] == len(result.trade_log)
+            size = sum(path.stat().st_size for path in Path(root).iterdir()) / num_runs
+
+        print(f"{fmt:>8} {write * 1e3:>13.2f} {aggregate * 1e3:>17.2f} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000, int(sys.argv[2]) if len(sys.argv) > 2 else 200)
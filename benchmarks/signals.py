@@ -0,0 +1,58 @@
+# Whole history signals (`StrategyBase.generate_signals`) against the candle by
+# candle replay of the same strategy: for every strategy of `strategies/`
+# implementing them, over random walks of several seeds, both paths have to close
+# the same trades at the same prices for the same reasons and end with the same
+# equity curve. Run from the repository root:
+#   python -m benchmarks.signals [num_candles] [num_seeds]
+
+import sys
+
+import numpy as np
+from backtest.engine import run_backtest
+from customtypes import CandleTimeInterval
+from loguru import logger
+from strategies.strategybase import StrategyBase
+from utils.strategy_manager import StrategyManager
+
+from benchmarks.backtest import PRELOAD, STRATEGY_ARGS
+from benchmarks.common import random_walk_columns
+
+
+def trades(result) -> list[tuple]:
+    return [(p.open_candle.t_open, p.close_candle.t_open, p.entry_price, p.exit_price, p.exit_reason) for p in result.trades]
+
+
+def compare(name: str, columns: dict) -> tuple:
+    signals, ticks = (run_backtest(name, STRATEGY_ARGS.get(name, {}), columns, CandleTimeInterval.I_1M, preload=PRELOAD, vectorized=vectorized)
+                      for vectorized in (True, False))
+
+    assert trades(signals) == trades(ticks), f"{name}: trades differ from the tick replay"
+    for column, values in signals.trade_log.arrays().items():
+        assert np.array_equal(values, ticks.trade_log.view(column)), f"{name}: trade log {column} differs from the tick replay"
+
+    assert np.array_equal(signals.t_open, ticks.t_open) and np.array_equal(signals.equity, ticks.equity), f"{name}: equity differs from the tick replay"
+
+    return signals, ticks
+
+
+def main(num_candles, num_seeds):
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    strategies = StrategyManager("strategies/").get_strategies(StrategyBase)
+    ported = sorted(name for name, cls in strategies.items() if cls.generate_signals is not StrategyBase.generate_signals)
+
+    print(f"{'strategy':>14} {'seed':>5} {'trades':>7} {'signals s':>10} {'ticks s':>8}")
+
+    for seed in range(num_seeds):
+        columns = random_walk_columns(num_candles + PRELOAD, seed=seed)
+
+        for name in ported:
+            signals, ticks = compare(name, columns)
+            print(f"{name:>14} {seed:>5} {len(signals.trades):>7} {signals.elapsed:>10.3f} {ticks.elapsed:>8.3f}")
+
+    print(f"{len(ported)} strategies, {num_seeds} seeds: signal and tick backtests match.")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
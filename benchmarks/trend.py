@@ -0,0 +1,60 @@
+# Trend line of the last `window` lows on every new candle, `np.polyfit` over the
+# slice against `utils.trand_indicators.RollingRegression` sliding its running sums,
+# and `rolling_fit` for the whole history at once. Run from the repository root:
+#   python -m benchmarks.trend [num_candles] [window]
+
+import sys
+import time
+
+import numpy as np
+from utils.trand_indicators import RollingRegression, rolling_fit
+
+from benchmarks.common import random_walk_columns
+
+
+def polyfit(values, window):
+    x = list(range(1, window + 1))
+    slopes = np.full(values.size, np.nan)
+
+    for i in range(window, values.size + 1):
+        slopes[i - 1] = np.polyfit(x, list(values[i - window:i]), 1)[0]
+
+    return slopes
+
+
+def rolling(values, window):
+    slopes = np.full(values.size, np.nan)
+    line = RollingRegression(values[:window])
+    slopes[window - 1] = line.fit()[0]
+
+    items = values.tolist()
+    for i in range(window, values.size):
+        line.slide(items[i], items[i - window])
+        slopes[i] = line.fit()[0]
+
+    return slopes
+
+
+def vectorized(values, window):
+    return rolling_fit(values, window)[0]
+
+
+def main(num_candles, window):
+    values = random_walk_columns(num_candles)["low"]
+
+    print(f"{'method':>10} {'candles':>8} {'window':>7} {'elapsed s':>10} {'candles/s':>11}")
+
+    results = {}
+    for name, method in (("polyfit", polyfit), ("rolling", rolling), ("vectorized", vectorized)):
+        t = time.perf_counter()
+        results[name] = method(values, window)
+        elapsed = time.perf_counter() - t
+
+        print(f"{name:>10} {num_candles:>8} {window:>7} {elapsed:>10.3f} {num_candles / elapsed:>11.0f}")
+
+    for name in ("rolling", "vectorized"):
+        assert np.allclose(results[name], results["polyfit"], equal_nan=True, atol=1e-9), f"{name} slopes differ from polyfit"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
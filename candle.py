@@ -1,7 +1,11 @@
+import numpy as np
 import util
 
 
 class Candle(object):
+    # Millions of candles are kept around in backtests, `__slots__` keeps them small.
+    __slots__ = ("current", "p_open", "p_close", "p_high", "p_low", "volume", "period", "average", "t_open", "t_close")
+
     def __init__(self, period, t_open, t_close, p_open=None, p_close=None, p_high=None, p_low=None, volume=None):
         self.current = None
         self.p_open = p_open
@@ -9,16 +13,14 @@ class Candle(object):
         self.p_high = p_high
         self.p_low = p_low
         self.volume = volume
-        self.period = util.interval_mapper_to_seconds(period)
-        self.average = float(0)
+        self.period = util.MAP_INTERVAL_TO_SECONDS.get(period)
         self.t_open = t_open
         self.t_close = t_close
 
-        if not self.average:
-            prices = [self.p_high, self.p_low, self.p_close]
-
-            if None not in prices:
-                self.average = sum(prices) / 3
+        if p_high is not None and p_low is not None and p_close is not None:
+            self.average = (p_high + p_low + p_close) / 3
+        else:
+            self.average = float(0)
 
     def tick(self, p_open, p_close, p_high, p_low, volume, is_closed):
         self.current = float(p_close)
@@ -42,3 +44,23 @@ class Candle(object):
 
     def __repr__(self) -> str:
         return f"<Candle [{self.t_open}] Current: {self.current}, High: {self.p_high}, Low: {self.p_low}, Open: {self.p_open}, Close: {self.p_close}>"
+
+
+def candles_from_columns(period, columns: dict, start: int = 0, end: int = None) -> list[Candle]:
+    # Closed candles from the `Chart` column layout, times in seconds.
+    rows = zip(*(columns[name][start:end].tolist() for name in ("t_open", "t_close", "open", "high", "low", "close", "volume")))
+    return [Candle(period, t_o, t_c, o, c, h, l, v) for t_o, t_c, o, h, l, c, v in rows]
+
+
+def candles_to_columns(candles: list[Candle]) -> dict:
+    count = len(candles)
+
+    return {
+        "t_open": np.fromiter((c.t_open for c in candles), dtype=np.int64, count=count),
+        "t_close": np.fromiter((c.t_close or 0 for c in candles), dtype=np.int64, count=count),
+        "open": np.fromiter((c.p_open for c in candles), dtype=np.float64, count=count),
+        "high": np.fromiter((c.p_high for c in candles), dtype=np.float64, count=count),
+        "low": np.fromiter((c.p_low for c in candles), dtype=np.float64, count=count),
+        "close": np.fromiter((c.p_close for c in candles), dtype=np.float64, count=count),
+        "volume": np.fromiter((c.volume or 0 for c in candles), dtype=np.float64, count=count),
+    }
@@ -7,6 +7,8 @@ from pathlib import Path
 from loguru import logger
 
 import util
+from backtest.engine import BacktestEngine
+from candle import candles_to_columns
 from chart import Chart
 from customtypes import CurrencyPair, TradingMode
 from exchange_api import get_exchange_api
@@ -51,11 +53,13 @@ class Application:
         self.preload = int(args.preload)
 
         self.mode = util.mode_mapper(args.mode)
+        self.headless = args.headless
+        self.vectorized = args.vectorized
 
         self.start_time = int(args.t_start or 0)
         self.start_end = util.end_time(args.t_end or 0)
 
-        self.chart = Chart(self.exchange, self.pair, None)
+        self.chart = Chart(self.exchange, self.pair, None, self.period)
 
         strategy = self.strategies_mgr.get_strategy(args.strategy)
 
@@ -79,6 +83,11 @@ class Application:
             end = self.start_end
 
         candles, last_candle = self.exchange.returnChartData(self.pair, self.period, start, end)
+
+        if self.headless and self.mode in [TradingMode.BACKTEST]:
+            self.run_headless(candles)
+            return
+
         self.strategy.on_preload(candles, self.preload)
 
         candles = candles[self.preload:]
@@ -118,6 +127,18 @@ class Application:
 
         logger.opt(colors=True).info("<red>>></red> Exit")
 
+    def run_headless(self, candles):
+        engine = BacktestEngine(self.strategy, candles_to_columns(candles), self.preload, vectorized=self.vectorized)
+        result = engine.run()
+
+        self.strategy.show_positions()
+
+        summary = result.summary()
+        logger.opt(colors=True).info(f"Candles: <yellow>{summary['candles']}</yellow>, "
+                                     f"elapsed: <yellow>{summary['elapsed']:.3f}s</yellow>, "
+                                     f"candles/s: <yellow>{summary['candles_per_second']:.0f}</yellow>, "
+                                     f"max drawdown: <yellow>{summary['max_drawdown']:3.2f}%</yellow>")
+
     def chart_tick(self, candle):
         _ = self.strategy.on_tick(candle)
 
@@ -133,6 +154,16 @@ if __name__ == "__main__":
     p.add_argument('--pair', '-c', default='BTC,USDT', help=f"Currency pair. ex. BTC,USDT.")
     p.add_argument('--tick', '-t', default=30, help=f"Candle update timespan.")
     p.add_argument('--tick-b', default=0.5, help=f"Candle update time for backtesting.")
+    p.add_argument('--headless',
+                   dest='headless',
+                   default=False,
+                   action=argparse.BooleanOptionalAction,
+                   help=f"Run backtest at full speed without ticker thread and input loop.")
+    p.add_argument('--vectorized',
+                   dest='vectorized',
+                   default=True,
+                   action=argparse.BooleanOptionalAction,
+                   help=f"Headless backtest from whole history signals when the strategy supports it.")
     p.add_argument('--budget', '-b', default=None, help=f"Budget used to by crypto in currency which second param in pair.")
 
     p.add_argument('--period', '-p', default='5m', help=f"Timespan width for candle.")
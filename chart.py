@@ -1,33 +1,158 @@
-from candle import Candle
+import numpy as np
+from candle import Candle, candles_to_columns
+from utils.resampler import Resampler
+from utils.ring_buffer import RingBuffer
+
+COLUMNS = {
+    "t_open": np.int64,
+    "t_close": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+}
+
+
+class ChartCandles:
+    # Lazy list-like view over the chart columns, `Candle` objects are only built
+    # for the items that are actually accessed and memoized by the chart.
+
+    def __init__(self, chart: 'Chart'):
+        self.chart = chart
+        self.columns = {name: chart.column(name) for name in COLUMNS}
+        self.first = chart.count - len(chart)
+
+    def __len__(self):
+        return len(self.columns["close"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._candle(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("chart candle index out of range")
+
+        return self._candle(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._candle(i)
+
+    def _candle(self, i):
+        cache = self.chart.candles
+        candle = cache.get(self.first + i)
+
+        if candle is None:
+            c = self.columns
+            candle = Candle(self.chart.period, int(c["t_open"][i]), int(c["t_close"][i]), float(c["open"][i]), float(c["close"][i]), float(c["high"][i]),
+                            float(c["low"][i]), float(c["volume"][i]))
+            cache[self.first + i] = candle
+
+        return candle
 
 
 class Chart(object):
-    def __init__(self, exchange, pair, limit=300):
+    def __init__(self, exchange, pair, limit=300, period=None):
         self.pair = pair
         self.exchange = exchange
-        self.data = []
         self.limit = limit
+        self.period = period
+        self.columns = {name: RingBuffer(limit, dtype) for name, dtype in COLUMNS.items()}
+        self.last_candle = None
+
+        # Candles built by `get_candles()`, keyed by their index since the last reset.
+        self.candles = {}
+
+        # Incremented on every appended candle, `reset_version` marks the last reset.
+        self.version = 0
+        self.reset_version = 0
 
-    def apply_limit(self):
-        if not self.limit:
-            return
+        # `IndicatorCache` shared by the strategies reading this chart.
+        self.indicator_cache = None
 
-        while len(self.data) > self.limit:
-            self.data.pop(0)
+        # period: (chart, resampler) of the timeframes built from these candles.
+        self.timeframes = {}
+
+    def __len__(self):
+        return len(self.columns["close"])
+
+    @property
+    def count(self) -> int:
+        # Number of candles added since the last reset, including evicted ones.
+        return self.version - self.reset_version
 
     def add(self, candle: Candle):
-        self.data.append(candle)
-        self.apply_limit()
+        self._append(candle)
+
+        for chart, resampler in self.timeframes.values():
+            for closed in resampler.update(candle):
+                chart.add(closed)
+
+    def _append(self, candle: Candle):
+        columns = self.columns
+        columns["t_open"].append(candle.t_open)
+        columns["t_close"].append(candle.t_close or 0)
+        columns["open"].append(candle.p_open)
+        columns["high"].append(candle.p_high)
+        columns["low"].append(candle.p_low)
+        columns["close"].append(candle.p_close)
+        columns["volume"].append(candle.volume or 0)
+
+        self.last_candle = candle
+        self.version += 1
+
+        if self.limit and self.candles:
+            self.candles.pop(self.count - self.limit - 1, None)
 
     def reset(self, data: list[Candle]):
-        self.data = data
-        self.apply_limit()
+        for column in self.columns.values():
+            column.clear()
+
+        self.version += 1
+        self.reset_version = self.version
+        self.last_candle = None
+        self.candles = {}
+
+        for candle in data:
+            self._append(candle)
+
+        if self.timeframes:
+            columns = candles_to_columns(data)
+            for chart, resampler in self.timeframes.values():
+                chart.reset(resampler.reset(columns))
+
+    def add_timeframe(self, period, limit=None) -> 'Chart':
+        # Chart of the `period` candles built from the candles of this one, without
+        # any extra data from the exchange. It holds the closed candles only and
+        # follows every `add()` and `reset()`. It keeps as many candles as this
+        # one unless `limit` is given.
+        if period not in self.timeframes:
+            resampler = Resampler(period, self.period)
+            chart = Chart(self.exchange, self.pair, limit or self.limit, period)
+            chart.reset(resampler.reset({name: self.column(name) for name in COLUMNS}))
+            self.timeframes[period] = (chart, resampler)
+
+        return self.timeframes[period][0]
+
+    def timeframe(self, period) -> 'Chart':
+        return self.timeframes[period][0]
+
+    def partial_candle(self, period) -> Candle:
+        # Candle of `period` still being built from the candles added so far.
+        return self.timeframes[period][1].partial()
+
+    def column(self, name) -> np.array:
+        return self.columns[name].view()
 
     def get_candles(self):
-        return self.data
+        return ChartCandles(self)
 
     def get_last_candle(self):
-        return self.data[-1]
+        return self.last_candle
 
     def getCurrentPrice(self):
         return self.exchange.returnTicker(self.pair)
@@ -1,4 +1,4 @@
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
 
 class CurrencyPair:
@@ -16,6 +16,13 @@ class TradeStatus(Enum):
     CLOSED = auto()
 
 
+class ExitReason(IntEnum):
+    OPEN = 0  # still open at the end of the history
+    SIGNAL = 1
+    PROP_LIMIT = 2
+    STOP_LOSS = 3
+
+
 class TradingMode(Enum):
     BACKTEST = auto()
     LIVE_TEST = auto()
@@ -1,13 +1,27 @@
 import userconfig
 
+from exchange_api.binance import BINANCE_API_ENDPOINTS
 from exchange_api.binance_adapter import BinanceAdapter
+from exchange_api.kline_cache import DEFAULT_KLINE_CACHE_DIR, KlineCache
+from exchange_api.poloniex import POLONIEX_API_ENDPOINT
 from exchange_api.poloniex_adapter import PoloniexAdapter
+from exchange_api.transport import DEFAULT_RETRIES, DEFAULT_TIMEOUT, Transport
+
+
+def _transport(endpoints: list[str]) -> Transport:
+    return Transport(endpoints,
+                     timeout=getattr(userconfig, "HTTP_TIMEOUT", DEFAULT_TIMEOUT),
+                     retries=getattr(userconfig, "HTTP_RETRIES", DEFAULT_RETRIES),
+                     sticky=getattr(userconfig, "HTTP_STICKY_ENDPOINT", True))
 
 
 def get_exchange_api(exchange: str):
     if exchange in ["poloniex"]:
-        return PoloniexAdapter(userconfig.POLONIEX_API_KEY, userconfig.POLONIEX_SECRET)
+        return PoloniexAdapter(userconfig.POLONIEX_API_KEY, userconfig.POLONIEX_SECRET, _transport([POLONIEX_API_ENDPOINT]))
     elif exchange in ["binance"]:
-        return BinanceAdapter(userconfig.BINANCE_API_KEY, userconfig.BINANCE_SECRET)
+        # Set `KLINE_CACHE_DIR = None` in userconfig to always download klines.
+        cache_dir = getattr(userconfig, "KLINE_CACHE_DIR", DEFAULT_KLINE_CACHE_DIR)
+        kline_cache = KlineCache(cache_dir) if cache_dir else None
+        return BinanceAdapter(userconfig.BINANCE_API_KEY, userconfig.BINANCE_SECRET, kline_cache, _transport(BINANCE_API_ENDPOINTS))
 
     return None
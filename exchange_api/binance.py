@@ -1,46 +1,54 @@
 import hashlib
 import hmac
-import random
+import json
+import os
 import time
-from urllib.parse import urlencode, urljoin
+from pathlib import Path
+from urllib.parse import urlencode
 
-import requests
+import numpy as np
 import util
-from candle import Candle
+from candle import Candle, candles_from_columns
 
 from exchange_api.customtypes import BinanceFilterError, BinanceQueryError
+from exchange_api.kline_cache import KLINE_COLUMNS, KlineCache
+from exchange_api.kline_downloader import KlineDownloader
+from exchange_api.transport import Transport
 from exchange_api.utils import binance_filters
 from exchange_api.utils.order_convert import convert_binance_to_internal
 
-BINANCE_API_ENDPOINTS = ["https://api.binance.com", "https://api1.binance.com", "https://api2.binance.com", "https://api3.binance.com"]
-
+EXCHANGE_INFO_CACHE = Path(__file__).absolute().parent.parent / "cache" / "binance_exchange_info.json"
+EXCHANGE_INFO_TTL = 60 * 60
 
-def get_api_endpoint():
-    return random.choice(BINANCE_API_ENDPOINTS)
+BINANCE_API_ENDPOINTS = ["https://api.binance.com", "https://api1.binance.com", "https://api2.binance.com", "https://api3.binance.com"]
 
 
 class Binance:
-    def __init__(self, api_key: str, secret: str) -> None:
+    def __init__(self, api_key: str, secret: str, kline_cache: KlineCache = None, transport: Transport = None) -> None:
         self.api_key = str(api_key)
         self.secret = str(secret)
+        self.kline_cache = kline_cache
+        self.transport = transport or Transport(BINANCE_API_ENDPOINTS)
+        if self.transport.sticky:
+            self.transport.measure("/api/v3/ping")
+        self.kline_downloader = KlineDownloader(self.transport)
         print(self.api_key)
         print(self.secret)
-        self.exchange_info = self.exchangeInfo()
+        self.refreshExchangeInfo(EXCHANGE_INFO_TTL)
 
-    def _api_query(self, endpoint: str, api: str, data: dict = {}) -> dict:
-        ret = requests.get(f"{endpoint}{api}", params=data)
+    def _api_query(self, api: str, data: dict = {}) -> dict:
+        ret = self.transport.get(api, params=data)
         return ret.json()
 
-    def _api_query_private(self, operation: callable, command: str, data: dict = {}) -> dict:
+    def _api_query_private(self, method: str, command: str, data: dict = {}) -> dict:
         headers = {'X-MBX-APIKEY': self.api_key}
 
         data['timestamp'] = int(time.time() * 1000)
         data['recvWindow'] = 5000
         query_string = urlencode(data)
         data['signature'] = hmac.new(self.secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
-        url = urljoin(get_api_endpoint(), command)
 
-        resp = operation(url, headers=headers, params=data)
+        resp = self.transport.request(method, command, headers=headers, params=data)
 
         if resp.status_code != 200:
             raise BinanceQueryError(status_code=resp.status_code, data=resp.json())
@@ -49,93 +57,139 @@ class Binance:
 
     def returnTicker(self, symbol: str) -> dict:
         params = {"symbol": symbol}
-        return self._api_query(get_api_endpoint(), "/api/v3/ticker/price", params).get("price", None)
+        return self._api_query("/api/v3/ticker/price", params).get("price", None)
 
-    def returnKlines(self, symbol: str, interval: str, startTime: int = None, endTime: int = None, limit: int = 1000) -> list['Candle']:
+    def _fetch_klines(self, symbol: str, interval: str, startTime: int, endTime: int, limit: int = 1000) -> dict:
+        return self.kline_downloader.download(symbol, interval, startTime, endTime, limit)
+
+    def _cached_klines(self, symbol: str, interval: str, startTime: int, endTime: int, limit: int) -> dict:
+        # Closed klines go to the cache, only the ranges it does not cover yet are requested.
+        series = self.kline_cache.series("binance", symbol, interval)
+        now = int(time.time() * 1000)
+        unclosed = []
 
-        received_klines = []
-        start_from = startTime
+        for start, end in series.missing(startTime, endTime):
+            columns = self._fetch_klines(symbol, interval, start, end, limit)
+            num_closed = np.count_nonzero(columns["t_close"] < now)
+            closed = {name: column[:num_closed] for name, column in columns.items()}
+            unclosed.append({name: column[num_closed:] for name, column in columns.items()})
 
-        while start_from < endTime:
-            params = {"symbol": symbol, "interval": interval, "startTime": start_from, "endTime": endTime, "limit": limit}
+            if num_closed == columns["t_close"].size:
+                series.store(closed, start, end)
+            elif num_closed:
+                series.store(closed, start, int(closed["t_close"][-1]))
 
-            params = {k: v for k, v in params.items() if v is not None}
-            klines = self._api_query(get_api_endpoint(), "/api/v3/klines", params)
+        cached = series.load(startTime, endTime)
+        return {name: np.concatenate([cached[name], *(columns[name] for columns in unclosed)]) for name in KLINE_COLUMNS}
 
-            received_klines = [*received_klines, *klines]
-            close_time = int(received_klines[len(received_klines) - 1][6])  # 6 - close time
-            start_from = close_time
+    def returnKlines(self, symbol: str, interval: str, startTime: int = None, endTime: int = None, limit: int = 1000) -> list['Candle']:
+        if self.kline_cache is None:
+            columns = self._fetch_klines(symbol, interval, startTime, endTime, limit)
+        else:
+            columns = self._cached_klines(symbol, interval, startTime, endTime, limit)
 
         period = util.interval_mapper(interval)
-        candles = []
-        for kline in received_klines[:-1]:
-            (o_t, o_p, h_p, l_p, c_p, v, c_t, *x) = kline
-
-            candles.append(
-                Candle(period,
-                       int(o_t / 1000),
-                       int(c_t / 1000),
-                       p_open=float(o_p),
-                       p_close=float(c_p),
-                       p_high=float(h_p),
-                       p_low=float(l_p),
-                       volume=float(v)))
-
-        (o_t, o_p, h_p, l_p, c_p, v, c_t, *x) = received_klines[-1]
-        return candles, Candle(period, int(o_t / 1000), None, p_open=float(o_p), p_high=float(h_p), p_low=float(l_p))
+        columns["t_open"] = columns["t_open"] // 1000
+        columns["t_close"] = columns["t_close"] // 1000
+
+        candles = candles_from_columns(period, columns, 0, -1)
+
+        last = {name: column[-1].item() for name, column in columns.items()}
+        return candles, Candle(period, last["t_open"], None, p_open=last["open"], p_high=last["high"], p_low=last["low"])
 
     def createBuyOrder(self, symbol: str, price: int, quantity: float, timeInForce: str) -> 'Order':
-        passed_price_filter, price = binance_filters.get_price_filter(symbol, self.exchange_info, price)
+        passed_price_filter, price = binance_filters.get_price_filter(symbol, self.filters, price)
         if not passed_price_filter:
             raise BinanceFilterError(symbol, price, "Price")
 
-        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.exchange_info, quantity)
+        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.filters, quantity)
         if not passed_quantity_filter:
             raise BinanceFilterError(symbol, quantity, "Quantity")
 
+        if not binance_filters.get_notional_filter(symbol, self.filters, price, quantity):
+            raise BinanceFilterError(symbol, price * quantity, "Notional")
+
         params = {'symbol': symbol, 'side': 'BUY', 'type': 'LIMIT', 'timeInForce': timeInForce, 'quantity': quantity, 'price': price}
 
-        order = self._api_query_private(requests.post, '/api/v3/order', params)
+        order = self._api_query_private('POST', '/api/v3/order', params)
         return convert_binance_to_internal(order)
 
+    def _check_market_notional(self, symbol: str, quantity: float):
+        if not binance_filters.market_notional_applies(symbol, self.filters):
+            return
+
+        # Market orders fill at the market price, the last price stands for it.
+        price = float(self.returnTicker(symbol))
+        if not binance_filters.get_notional_filter(symbol, self.filters, price, quantity, market=True):
+            raise BinanceFilterError(symbol, price * quantity, "Notional")
+
     def createBuyMarketOrder(self, symbol: str, quantity: float) -> 'Order':
-        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.exchange_info, quantity)
+        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.filters, quantity, market=True)
         if not passed_quantity_filter:
             raise BinanceFilterError(symbol, quantity, "Quantity")
 
+        self._check_market_notional(symbol, quantity)
+
         params = {'symbol': symbol, 'side': 'BUY', 'type': 'MARKET', 'quantity': quantity}
 
-        order = self._api_query_private(requests.post, '/api/v3/order', params)
+        order = self._api_query_private('POST', '/api/v3/order', params)
         return convert_binance_to_internal(order)
 
     def createSellOrder(self, symbol: str, price: int, quantity: float, timeInForce: str) -> 'Order':
-        passed_price_filter, price = binance_filters.get_price_filter(symbol, self.exchange_info, price)
+        passed_price_filter, price = binance_filters.get_price_filter(symbol, self.filters, price)
         if not passed_price_filter:
             raise BinanceFilterError(symbol, price, "Price")
 
-        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.exchange_info, quantity)
+        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.filters, quantity)
         if not passed_quantity_filter:
             raise BinanceFilterError(symbol, quantity, "Quantity")
 
+        if not binance_filters.get_notional_filter(symbol, self.filters, price, quantity):
+            raise BinanceFilterError(symbol, price * quantity, "Notional")
+
         params = {'symbol': symbol, 'side': 'SELL', 'type': 'LIMIT', 'timeInForce': timeInForce, 'quantity': quantity, 'price': price}
 
-        order = self._api_query_private(requests.post, '/api/v3/order', params)
+        order = self._api_query_private('POST', '/api/v3/order', params)
         return convert_binance_to_internal(order)
 
     def createSellMarketOrder(self, symbol: str, quantity: float) -> 'Order':
-        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.exchange_info, quantity)
+        passed_quantity_filter, quantity = binance_filters.get_quantity_filter(symbol, self.filters, quantity, market=True)
         if not passed_quantity_filter:
             raise BinanceFilterError(symbol, quantity, "Quantity")
 
+        self._check_market_notional(symbol, quantity)
+
         params = {'symbol': symbol, 'side': 'SELL', 'type': 'MARKET', 'quantity': quantity}
 
-        order = self._api_query_private(requests.post, '/api/v3/order', params)
+        order = self._api_query_private('POST', '/api/v3/order', params)
         return convert_binance_to_internal(order)
 
     def cancel(self, symbol: str, orderId: int) -> dict:
         params = {'symbol': symbol, 'orderId': orderId}
 
-        return self._api_query_private(requests.delete, '/api/v3/order', params)
+        return self._api_query_private('DELETE', '/api/v3/order', params)
 
     def exchangeInfo(self) -> dict:
-        return self._api_query(get_api_endpoint(), "/api/v3/exchangeInfo")
+        return self._api_query("/api/v3/exchangeInfo")
+
+    def refreshExchangeInfo(self, ttl: float = 0):
+        # The exchange info is a few megabytes, a copy younger than `ttl` seconds is read from disk.
+        exchange_info = None
+
+        if ttl and EXCHANGE_INFO_CACHE.exists() and time.time() - EXCHANGE_INFO_CACHE.stat().st_mtime < ttl:
+            try:
+                exchange_info = json.loads(EXCHANGE_INFO_CACHE.read_text())
+            except ValueError:
+                pass
+
+        if exchange_info is None:
+            exchange_info = self.exchangeInfo()
+
+            if "symbols" in exchange_info:
+                EXCHANGE_INFO_CACHE.parent.mkdir(parents=True, exist_ok=True)
+                tmp = EXCHANGE_INFO_CACHE.with_suffix(".tmp")
+                tmp.write_text(json.dumps(exchange_info))
+                os.replace(tmp, EXCHANGE_INFO_CACHE)
+
+        self.exchange_info = exchange_info
+        self.filters = binance_filters.compile_filters(exchange_info)
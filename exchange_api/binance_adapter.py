@@ -27,8 +27,8 @@ def _time_in_force_adapter(time_in_force: TimeInForceStatus) -> str:
 
 
 class BinanceAdapter(ExchangeApiAdapterBase):
-    def __init__(self, api_key: str, secret: str) -> None:
-        exchange_api = Binance(api_key, secret)
+    def __init__(self, api_key: str, secret: str, kline_cache: 'KlineCache' = None, transport: 'Transport' = None) -> None:
+        exchange_api = Binance(api_key, secret, kline_cache, transport)
         super().__init__(exchange_api)
 
     def returnTicker(self, pair: 'CurrencyPair') -> str:
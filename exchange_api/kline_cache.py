@@ -0,0 +1,163 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from utils.json_decoding import KLINE_COLUMNS
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows, stores are not locked
+
+DEFAULT_KLINE_CACHE_DIR = Path(__file__).absolute().parent.parent / "cache" / "klines"
+
+
+class KlineSeries:
+    # Closed klines of one exchange/symbol/interval. Each column is a raw binary
+    # file of fixed size values sorted by open time, `meta.json` holds the time
+    # range that was requested from the exchange so far and the number of rows.
+    # The range is kept contiguous: gaps between it and a new request are
+    # fetched as well.
+    #
+    # `meta.json` is replaced last and only rows it counts are read, a crash or
+    # another process mid write never shows. Appends go past the counted rows of
+    # the column files, a prepend writes the next `generation` of them. Writers
+    # take a file lock.
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.meta_path = directory / "meta.json"
+        self.lock_path = directory / "lock"
+
+    def _meta(self) -> dict:
+        # None when there is no series yet or `meta.json` is not one this class
+        # wrote, the series is then fetched and stored again from scratch.
+        if not self.meta_path.exists():
+            return None
+
+        try:
+            meta = json.loads(self.meta_path.read_text())
+        except ValueError:
+            return None
+
+        if not all(key in meta for key in ("start", "end", "rows", "generation")):
+            return None
+
+        return meta
+
+    def _path(self, name: str, generation: int) -> Path:
+        return self.directory / f"{name}.{generation}.bin"
+
+    def coverage(self) -> tuple[int, int]:
+        meta = self._meta()
+        if meta is None:
+            return None
+
+        return meta["start"], meta["end"]
+
+    def missing(self, start: int, end: int) -> list[tuple[int, int]]:
+        coverage = self.coverage()
+        if coverage is None:
+            return [(start, end)]
+
+        covered_start, covered_end = coverage
+        ranges = []
+
+        if start < covered_start:
+            ranges.append((start, covered_start - 1))
+
+        if end > covered_end:
+            ranges.append((covered_end + 1, end))
+
+        return ranges
+
+    def __len__(self):
+        meta = self._meta()
+        return meta["rows"] if meta else 0
+
+    def _column(self, name: str, meta: dict) -> np.array:
+        rows = meta["rows"] if meta else 0
+        if not rows:
+            return np.empty(0, dtype=KLINE_COLUMNS[name])
+
+        return np.memmap(self._path(name, meta["generation"]), dtype=KLINE_COLUMNS[name], mode="r", shape=(rows, ))
+
+    def load(self, start: int = None, end: int = None) -> dict:
+        meta = self._meta()
+        t_open = self._column("t_open", meta)
+
+        lo = np.searchsorted(t_open, start, side="left") if start is not None else 0
+        hi = np.searchsorted(t_open, end, side="right") if end is not None else t_open.size
+
+        return {name: self._column(name, meta)[lo:hi] for name in KLINE_COLUMNS}
+
+    def store(self, columns: dict, start: int, end: int):
+        # `columns` hold closed klines sorted by open time, fetched for [start, end].
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with open(self.lock_path, "wb") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            self._store(columns, start, end)
+
+    def _store(self, columns: dict, start: int, end: int):
+        meta = self._meta()
+        rows = meta["rows"] if meta else 0
+        generation = meta["generation"] if meta else 0
+
+        if meta is None:
+            # Column files of a broken series are of no use.
+            for path in self.directory.glob("*.bin"):
+                path.unlink()
+
+        t_open = self._column("t_open", meta)
+        new = columns["t_open"]
+
+        if t_open.size and new.size and new[0] < t_open[0]:
+            # Prepending requires a rewrite, it only happens when going further back in history.
+            existing = self.load()
+            keep = new < t_open[0]
+            merged = {name: np.concatenate([columns[name][keep], existing[name]]) for name in KLINE_COLUMNS}
+
+            old, generation = generation, generation + 1
+            rows = self._write(merged, generation)
+        else:
+            keep = new > t_open[-1] if t_open.size else np.ones(new.size, dtype=bool)
+            rows = self._append({name: columns[name][keep] for name in KLINE_COLUMNS}, generation, rows)
+            old = None
+
+        if meta is not None:
+            start, end = min(start, meta["start"]), max(end, meta["end"])
+
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"start": int(start), "end": int(end), "rows": rows, "generation": generation}))
+        os.replace(tmp, self.meta_path)
+
+        if old is not None:
+            for name in KLINE_COLUMNS:
+                self._path(name, old).unlink(missing_ok=True)
+
+    def _write(self, columns: dict, generation: int) -> int:
+        for name, dtype in KLINE_COLUMNS.items():
+            np.asarray(columns[name], dtype=dtype).tofile(self._path(name, generation))
+
+        return columns["t_open"].size
+
+    def _append(self, columns: dict, generation: int, rows: int) -> int:
+        for name, dtype in KLINE_COLUMNS.items():
+            with open(self._path(name, generation), "ab") as f:
+                # Rows past the count are left over from an interrupted write.
+                f.truncate(rows * np.dtype(dtype).itemsize)
+                np.asarray(columns[name], dtype=dtype).tofile(f)
+
+        return rows + columns["t_open"].size
+
+
+class KlineCache:
+    def __init__(self, directory=DEFAULT_KLINE_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def series(self, exchange: str, symbol: str, interval: str) -> KlineSeries:
+        return KlineSeries(self.directory / exchange / symbol / interval)
@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import util
+from utils.json_decoding import KLINE_COLUMNS, decoder, empty_columns
+
+from exchange_api.customtypes import BinanceQueryError
+
+KLINES_API = "/api/v3/klines"
+
+# Request weight of a klines page of up to 1000 items and the per minute limit of an IP.
+KLINES_WEIGHT = 2
+WEIGHT_LIMIT_1M = 1200
+
+
+class WeightLimiter:
+    # Keeps the request weight used in the current minute below the Binance limit.
+    # The count is corrected from `X-MBX-USED-WEIGHT-1M`, which also includes the
+    # weight used by other clients sharing the IP.
+
+    def __init__(self, limit: int = WEIGHT_LIMIT_1M, margin: float = 0.9):
+        self.limit = int(limit * margin)
+        self.lock = threading.Lock()
+        self.minute = None
+        self.used = 0
+        self.blocked_until = 0
+
+    def acquire(self, weight: int):
+        while True:
+            with self.lock:
+                now = time.time()
+                minute = int(now // 60)
+
+                if minute != self.minute:
+                    self.minute = minute
+                    self.used = 0
+
+                if now >= self.blocked_until and self.used + weight <= self.limit:
+                    self.used += weight
+                    return
+
+                wait = max(self.blocked_until - now, 0) or (minute + 1) * 60 - now
+
+            time.sleep(wait)
+
+    def update(self, headers: dict):
+        used = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used is None:
+            return
+
+        with self.lock:
+            self.used = max(self.used, int(used))
+
+    def block(self, seconds: float):
+        # 429/418 responses, nobody may send anything before `Retry-After` passes.
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+
+class KlineDownloader:
+    # Splits a time range into page sized windows and downloads them concurrently
+    # over the pooled transport. Pages are merged in time order without duplicates.
+
+    def __init__(self, transport: 'Transport', workers: int = 8, limiter: WeightLimiter = None, retries: int = 5):
+        self.transport = transport
+        self.workers = workers
+        self.limiter = limiter or WeightLimiter()
+        self.retries = retries
+
+    def _get(self, params: dict) -> dict:
+        for _ in range(self.retries):
+            self.limiter.acquire(KLINES_WEIGHT)
+            resp = self.transport.get(KLINES_API, params=params)
+            self.limiter.update(resp.headers)
+
+            if resp.status_code in (418, 429):
+                self.limiter.block(int(resp.headers.get("Retry-After", 60)))
+                continue
+
+            if resp.status_code != 200:
+                raise BinanceQueryError(status_code=resp.status_code, data=resp.json())
+
+            return decoder.decode_klines(resp.content)
+
+        raise BinanceQueryError(status_code=resp.status_code, data=resp.json())
+
+    def _fetch_window(self, symbol: str, interval: str, start: int, end: int, limit: int) -> list[dict]:
+        # A window normally fits one page, keep paging in case the interval length was a guess.
+        pages = []
+        start_from = start
+
+        while start_from < end:
+            params = {"symbol": symbol, "interval": interval, "startTime": start_from, "endTime": end, "limit": limit}
+            page = self._get(params)
+            if not page["t_open"].size:
+                break
+
+            pages.append(page)
+            start_from = int(page["t_close"][-1])
+
+        return pages
+
+    @staticmethod
+    def windows(interval: str, start: int, end: int, limit: int) -> list[tuple[int, int]]:
+        seconds = util.interval_mapper_to_seconds(util.interval_mapper(interval))
+        if seconds is None:
+            return [(start, end)]
+
+        step = seconds * 1000 * limit
+        return [(t, min(t + step - 1, end)) for t in range(start, end, step)]
+
+    def download(self, symbol: str, interval: str, start: int, end: int, limit: int = 1000) -> dict:
+        windows = self.windows(interval, start, end, limit)
+
+        if len(windows) == 1 or self.workers == 1:
+            pages = [self._fetch_window(symbol, interval, a, b, limit) for a, b in windows]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(windows))) as executor:
+                pages = list(executor.map(lambda w: self._fetch_window(symbol, interval, *w, limit), windows))
+
+        pages = [page for window in pages for page in window]
+        if not pages:
+            return empty_columns()
+
+        columns = {name: np.concatenate([page[name] for page in pages]) for name in KLINE_COLUMNS}
+
+        # Pages are in time order, only drop klines that don't move past the ones before them.
+        t_open = columns["t_open"]
+        keep = np.ones(t_open.size, dtype=bool)
+        keep[1:] = t_open[1:] > np.maximum.accumulate(t_open)[:-1]
+
+        if keep.all():
+            return columns
+
+        return {name: column[keep] for name, column in columns.items()}
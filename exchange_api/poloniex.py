@@ -7,22 +7,25 @@ import requests
 from candle import Candle
 
 from exchange_api.customtypes import PoloniexQueryError
+from exchange_api.transport import Transport
 
-POLONIEX_PUBLIC_API = "https://poloniex.com/public"
-POLONIEX_PRIVATE_API = "https://poloniex.com/tradingApi"
+POLONIEX_API_ENDPOINT = "https://poloniex.com"
+POLONIEX_PUBLIC_API = "/public"
+POLONIEX_PRIVATE_API = "/tradingApi"
 
 
 class Poloniex:
-    def __init__(self, api_key: str, secret: str) -> None:
+    def __init__(self, api_key: str, secret: str, transport: Transport = None) -> None:
         self.api_key = str(api_key)
         self.secret = str(secret)
+        self.transport = transport or Transport([POLONIEX_API_ENDPOINT])
 
     def _api_query(self, api: str, command: str, data: dict = {}) -> dict:
         resp: requests.Response = None
 
         if api == POLONIEX_PUBLIC_API:
             params = {"command": command, **data}
-            resp = requests.get(f"{api}", params=params)
+            resp = self.transport.get(api, params=params)
 
         elif api == POLONIEX_PRIVATE_API:
             post_data = {"command": command, "nonce": int(time.time() * 1000), **data}
@@ -33,7 +36,7 @@ class Poloniex:
 
             headers = {"Sign": sign, "Key": self.api_key}
 
-            resp = requests.post(f"{api}", data=post_data, headers=headers)
+            resp = self.transport.post(api, data=post_data, headers=headers)
         else:
             assert (True, "Wat?")
 
@@ -29,8 +29,8 @@ def _time_in_force_adapter(time_in_force: TimeInForceStatus) -> dict[str, bool]:
 
 
 class PoloniexAdapter(ExchangeApiAdapterBase):
-    def __init__(self, api_key: str, secret: str) -> None:
-        exchange_api = Poloniex(api_key, secret)
+    def __init__(self, api_key: str, secret: str, transport: 'Transport' = None) -> None:
+        exchange_api = Poloniex(api_key, secret, transport)
         super().__init__(exchange_api)
 
     def returnTicker(self, pair: 'CurrencyPair') -> str:
@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds.
+DEFAULT_TIMEOUT = (3.05, 10)
+DEFAULT_RETRIES = 3
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "DELETE"})
+
+# Weight of the newest sample in the per endpoint latency average.
+LATENCY_SMOOTHING = 0.2
+
+
+class Transport:
+    # HTTP layer shared by the exchange clients: one keep-alive session pool per
+    # host, timeouts, retries and endpoint selection. With `sticky` all requests
+    # go to the endpoint with the lowest measured latency, so the pooled
+    # connections are actually reused; a host that refuses connections is
+    # demoted and the request moves on to the next one.
+
+    def __init__(self,
+                 endpoints: list[str],
+                 timeout=DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff: float = 0.2,
+                 pool_maxsize: int = 16,
+                 sticky: bool = True,
+                 on_request: callable = None) -> None:
+        self.endpoints = list(endpoints)
+        self.timeout = timeout
+        self.sticky = sticky
+        self.on_request = on_request
+        self.latencies = {endpoint: None for endpoint in self.endpoints}
+        self.lock = threading.Lock()
+
+        # Connection failures are always retried, the request never reached the host. Reads and
+        # bad statuses only for idempotent methods: a resent order could be executed twice.
+        retry = Retry(total=retries,
+                      connect=retries,
+                      read=retries,
+                      status=retries,
+                      backoff_factor=backoff,
+                      status_forcelist=(502, 503, 504),
+                      allowed_methods=IDEMPOTENT_METHODS,
+                      raise_on_status=False)
+
+        self.sessions = {}
+        for endpoint in self.endpoints:
+            session = requests.Session()
+            session.mount(endpoint, HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry))
+            self.sessions[endpoint] = session
+
+    def endpoint(self) -> str:
+        if not self.sticky:
+            return random.choice(self.endpoints)
+
+        with self.lock:
+            measured = [(latency, endpoint) for endpoint, latency in self.latencies.items() if latency is not None]
+
+        # Unmeasured endpoints are tried in order before any of them is picked by latency.
+        unmeasured = [endpoint for endpoint, latency in self.latencies.items() if latency is None]
+        if unmeasured:
+            return unmeasured[0]
+
+        return min(measured)[1]
+
+    def _record(self, endpoint: str, latency: float):
+        with self.lock:
+            previous = self.latencies[endpoint]
+            if previous is None or previous == float("inf"):
+                self.latencies[endpoint] = latency
+            else:
+                self.latencies[endpoint] = previous + LATENCY_SMOOTHING * (latency - previous)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        tried = set()
+
+        while True:
+            endpoint = self.endpoint()
+            if endpoint in tried:
+                endpoint = next(e for e in self.endpoints if e not in tried)
+            tried.add(endpoint)
+
+            start = time.perf_counter()
+            try:
+                resp = self.sessions[endpoint].request(method, f"{endpoint}{path}", **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                with self.lock:
+                    self.latencies[endpoint] = float("inf")
+
+                # A dropped connection may have delivered an order already, only a failed connect is safe to resend.
+                resend = method in IDEMPOTENT_METHODS or isinstance(e, requests.exceptions.ConnectTimeout)
+                if not resend or len(tried) == len(self.endpoints):
+                    raise
+                continue
+
+            resp.latency = time.perf_counter() - start
+            self._record(endpoint, resp.latency)
+
+            if self.on_request is not None:
+                self.on_request(method, path, resp.status_code, resp.latency)
+
+            return resp
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def measure(self, path: str):
+        # Probe every endpoint once, `sticky` selection starts from the fastest.
+        for endpoint in self.endpoints:
+            start = time.perf_counter()
+            try:
+                self.sessions[endpoint].get(f"{endpoint}{path}", timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                with self.lock:
+                    self.latencies[endpoint] = float("inf")
+                continue
+
+            with self.lock:
+                self.latencies[endpoint] = time.perf_counter() - start
@@ -1,65 +1,121 @@
 import math
 
 
-def get_symbol_info(pair: str, exchange_info: dict) -> str:
-    for symbol in exchange_info["symbols"]:
-        if symbol["symbol"] == pair:
-            return symbol
+class PriceFilter:
+    # PRICE_FILTER, bounds and tick are rounded to the symbol precision once.
+    def __init__(self, fltr: dict, precision: int):
+        self.precision = precision
+        self.min_price = round(float(fltr["minPrice"]), precision)
+        self.max_price = round(float(fltr["maxPrice"]), precision)
+        self.tick_size = round(float(fltr["tickSize"]), precision)
 
+    def apply(self, price: float, should_round_price: bool = True) -> tuple[bool, float]:
+        tick_size = self.tick_size
 
-def get_base_assert_precision(pair: str, exchange_info: dict) -> dict:
-    info = get_symbol_info(pair, exchange_info)
-    base_asset_precision = info.get('baseAssetPrecision')
-    return base_asset_precision
+        if should_round_price and (tick_size != 0):
+            price = round(price - price % tick_size, self.precision)
 
+        min_price_filter = (price >= self.min_price) if (self.min_price != 0) else True
+        max_price_filter = (price <= self.max_price) if (self.max_price != 0) else True
+        tick_size_filter = math.isclose((price - self.min_price) % tick_size, 0, abs_tol=tick_size) if (tick_size != 0) else True
 
-def get_filter(pair: str, exchange_info: dict, filter_type: str) -> dict:
-    info = get_symbol_info(pair, exchange_info)
-    for fltr in info.get('filters', []):
-        if fltr['filterType'] == filter_type:
-            return fltr
-    return None
+        return min_price_filter and max_price_filter and tick_size_filter, price
 
 
-def get_price_filter(pair: str,
-                     exchange_info: dict,
-                     price: float,
-                     should_round_price: bool = True) -> tuple[bool, float]:
-    fltr = get_filter(pair, exchange_info, 'PRICE_FILTER')
-    base_asset_precision = get_base_assert_precision(pair, exchange_info)
+class LotSizeFilter:
+    # LOT_SIZE and MARKET_LOT_SIZE, a 0 bound or step is not checked (MARKET_LOT_SIZE
+    # often has no step).
+    def __init__(self, fltr: dict, precision: int):
+        self.precision = precision
+        self.min_qty = round(float(fltr["minQty"]), precision)
+        self.max_qty = round(float(fltr["maxQty"]), precision)
+        self.step_size = round(float(fltr["stepSize"]), precision)
 
-    min_price = round(float(fltr["minPrice"]), base_asset_precision)
-    max_price = round(float(fltr["maxPrice"]), base_asset_precision)
-    tick_size = round(float(fltr["tickSize"]), base_asset_precision)
+    def apply(self, quantity: float, should_round_quantity: bool = True) -> tuple[bool, float]:
+        step_size = self.step_size
 
-    if should_round_price and (tick_size != 0):
-        price = round(price - price % tick_size, base_asset_precision)
+        if should_round_quantity and (step_size != 0):
+            quantity = round(quantity - quantity % step_size, self.precision)
 
-    min_price_filter = (price >= min_price) if (min_price != 0) else True
-    max_price_filter = (price <= max_price) if (max_price != 0) else True
-    tick_size_filter = math.isclose((price - min_price) % tick_size, 0, abs_tol=tick_size) if (tick_size != 0) else True
+        min_qty_filter = (quantity >= self.min_qty)
+        max_qty_filter = (quantity <= self.max_qty) if (self.max_qty != 0) else True
+        step_size_filter = math.isclose((quantity - self.min_qty) % step_size, 0, abs_tol=step_size) if (step_size != 0) else True
 
-    passed_price_filter = min_price_filter and max_price_filter and tick_size_filter
-    return passed_price_filter, price
+        return min_qty_filter and max_qty_filter and step_size_filter, quantity
+
+
+class NotionalFilter:
+    # MIN_NOTIONAL and NOTIONAL, `max_notional` is 0 when there is no upper bound.
+    # MIN_NOTIONAL has one `applyToMarket` flag, NOTIONAL one for each bound.
+    def __init__(self, fltr: dict):
+        self.min_notional = float(fltr.get("minNotional", 0))
+        self.max_notional = float(fltr.get("maxNotional", 0))
+        self.apply_min_to_market = fltr.get("applyToMarket", fltr.get("applyMinToMarket", True))
+        self.apply_max_to_market = fltr.get("applyToMarket", fltr.get("applyMaxToMarket", True))
+
+    @property
+    def apply_to_market(self) -> bool:
+        return self.apply_min_to_market or self.apply_max_to_market
+
+    def apply(self, price: float, quantity: float, market: bool = False) -> bool:
+        notional = price * quantity
+
+        min_notional_filter = notional >= self.min_notional if (not market or self.apply_min_to_market) else True
+        max_notional_filter = (notional <= self.max_notional) if (self.max_notional != 0) and (not market or self.apply_max_to_market) else True
+
+        return min_notional_filter and max_notional_filter
+
+
+class SymbolFilters:
+    def __init__(self, info: dict):
+        self.symbol = info["symbol"]
+        self.base_asset_precision = info.get("baseAssetPrecision")
+        self.price = None
+        self.lot_size = None
+        self.market_lot_size = None
+        self.notional = None
+
+        for fltr in info.get("filters", []):
+            filter_type = fltr["filterType"]
+
+            if filter_type == "PRICE_FILTER":
+                self.price = PriceFilter(fltr, self.base_asset_precision)
+            elif filter_type == "LOT_SIZE":
+                self.lot_size = LotSizeFilter(fltr, self.base_asset_precision)
+            elif filter_type == "MARKET_LOT_SIZE":
+                self.market_lot_size = LotSizeFilter(fltr, self.base_asset_precision)
+            elif filter_type in ("MIN_NOTIONAL", "NOTIONAL"):
+                self.notional = NotionalFilter(fltr)
+
+
+def compile_filters(exchange_info: dict) -> dict[str, SymbolFilters]:
+    return {info["symbol"]: SymbolFilters(info) for info in exchange_info.get("symbols", [])}
+
+
+def get_price_filter(pair: str, filters: dict[str, SymbolFilters], price: float, should_round_price: bool = True) -> tuple[bool, float]:
+    return filters[pair].price.apply(price, should_round_price)
 
 
 def get_quantity_filter(pair: str,
-                        exchange_info: dict,
+                        filters: dict[str, SymbolFilters],
                         quantity: float,
-                        should_round_quantity: bool = True) -> tuple[bool, float]:
-    fltr = get_filter(pair, exchange_info, 'LOT_SIZE')
-    base_asset_precision = get_base_assert_precision(pair, exchange_info)
+                        should_round_quantity: bool = True,
+                        market: bool = False) -> tuple[bool, float]:
+    # Market orders have to pass MARKET_LOT_SIZE as well, when the symbol has one.
+    symbol_filters = filters[pair]
+    passed, quantity = symbol_filters.lot_size.apply(quantity, should_round_quantity)
+
+    if market and passed and symbol_filters.market_lot_size is not None:
+        passed, quantity = symbol_filters.market_lot_size.apply(quantity, should_round_quantity)
+
+    return passed, quantity
 
-    min_qty = round(float(fltr["minQty"]), base_asset_precision)
-    max_qty = round(float(fltr["maxQty"]), base_asset_precision)
-    step_size = round(float(fltr["stepSize"]), base_asset_precision)
 
-    if should_round_quantity:
-        quantity = round(quantity - quantity % step_size, base_asset_precision)
+def get_notional_filter(pair: str, filters: dict[str, SymbolFilters], price: float, quantity: float, market: bool = False) -> bool:
+    notional = filters[pair].notional
+    return notional.apply(price, quantity, market) if notional is not None else True
 
-    min_qty_filter = (quantity >= min_qty)
-    max_qty_filter = (quantity <= max_qty)
-    step_size_filter = math.isclose((quantity - min_qty) % step_size, 0, abs_tol=step_size)
 
-    passed_quantity_filter = min_qty_filter and max_qty_filter and step_size_filter
-    return passed_quantity_filter, quantity
+def market_notional_applies(pair: str, filters: dict[str, SymbolFilters]) -> bool:
+    notional = filters[pair].notional
+    return notional is not None and notional.apply_to_market
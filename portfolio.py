@@ -0,0 +1,195 @@
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+import util
+from chart import Chart
+from customtypes import CurrencyPair, TradingMode
+from exchange_api import get_exchange_api
+from utils.ring_buffer import RingBuffer
+from utils.strategy_manager import StrategyManager
+from workers.combined_stream_ticker import CombinedStreamTicker
+from workers.websocket_live_ticker import apply_kline, kline_stream
+
+# Latency samples kept per slot.
+LATENCY_WINDOW = 1024
+
+
+class Slot:
+    # One (pair, period, strategy, args) combination. Slots share the exchange
+    # client, the kline cache and the websocket, slots on the same pair and period
+    # share the chart and so its indicator cache.
+
+    def __init__(self, config: dict, exchange, strategies_mgr: StrategyManager, mode: TradingMode, charts: dict):
+        self.pair = CurrencyPair(*config["pair"].split(","))
+        self.period = util.interval_mapper(config.get("period", "5m"))
+        self.name = config.get("name", f"{self.pair}:{config.get('period', '5m')}:{config.get('strategy', 'default')}")
+        self.stream = kline_stream(self.pair, self.period)
+
+        budget = float(config.get("budget", 0))
+        if not budget and mode in [TradingMode.LIVE]:
+            raise ValueError(f"Budget should be more that '0' for live trading ({self.name}).")
+
+        if self.stream not in charts:
+            charts[self.stream] = Chart(exchange, self.pair, None, self.period)
+        self.chart = charts[self.stream]
+
+        strategy = strategies_mgr.get_strategy(config.get("strategy", "default"))
+        if strategy is None:
+            raise ValueError(f"Unknown strategy '{config.get('strategy')}' ({self.name}).")
+
+        strategy_args = util.parse_strategy_args(config.get("args"))
+        self.strategy = strategy(strategy_args, self.chart, exchange, mode, budget)
+
+        self.candle = None
+
+        # Seconds from receiving a frame / from the exchange event time until the strategy is done with it.
+        self.tick_latency = RingBuffer(LATENCY_WINDOW)
+        self.event_latency = RingBuffer(LATENCY_WINDOW)
+        self.ticks = 0
+
+    def preload(self, exchange, preload: int):
+        interval = util.interval_mapper_to_seconds(self.period)
+        end = int(time.time())
+        start = end - (interval * preload)
+
+        candles, self.candle = exchange.returnChartData(self.pair, self.period, start, end)
+        self.strategy.on_preload(candles, preload)
+
+    def on_event(self, event: 'KlineEvent', received: float):
+        self.candle = apply_kline(self, self.candle, event.kline)
+
+        done = time.time()
+        self.tick_latency.append(done - received)
+        self.event_latency.append(done - event.event_time / 1000)
+        self.ticks += 1
+
+    def chart_tick(self, candle):
+        _ = self.strategy.on_tick(candle)
+
+    def latency_report(self) -> str:
+        if not self.ticks:
+            return f"{self.name:>30} {0:>7}"
+
+        tick = self.tick_latency.view() * 1000
+        event = self.event_latency.view() * 1000
+        p50, p99 = np.percentile(tick, [50, 99])
+
+        return f"{self.name:>30} {self.ticks:>7} {p50:>8.3f} {p99:>8.3f} {tick.max():>8.3f} {np.median(event):>10.1f}"
+
+
+class Portfolio:
+    def __init__(self, args):
+
+        # Configure Logger
+        self.configure_logger(args)
+
+        # Configure Trader
+        self.configure_trader(args)
+
+    def configure_logger(self, args):
+        logger.remove()
+
+        save_to_file = args.log_store
+
+        format = '<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level}</level> | <level>{message}</level>'
+
+        params = {'level': args.log_level, 'format': format, 'backtrace': True, 'diagnose': True, 'enqueue': False, 'catch': True}
+
+        logger.add(sys.stderr, **params)
+        if save_to_file:
+            current_time = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+            log_path = args.log_dir / f"PORTFOLIO_{current_time}::.txt"
+            logger.add(str(log_path), rotation="50 MB", **params)
+
+    def configure_trader(self, args):
+        config = json.loads(Path(args.config).read_text())
+
+        self.exchange = get_exchange_api(config.get("exchange", "binance"))
+        self.strategies_mgr = StrategyManager("strategies/")
+
+        self.tick = int(args.tick)
+        self.preload = int(config.get("preload", args.preload))
+        self.mode = util.mode_mapper(config.get("mode", args.mode))
+
+        if self.mode not in [TradingMode.LIVE, TradingMode.LIVE_TEST]:
+            raise ValueError("Portfolio runs only in 'live' and 'live-test' modes.")
+
+        charts = {}
+        self.slots = [Slot(slot, self.exchange, self.strategies_mgr, self.mode, charts) for slot in config["slots"]]
+
+        self.ticker_thread = None
+
+    def show_positions(self):
+        for slot in self.slots:
+            logger.opt(colors=True).info(f"<yellow>{slot.name}</yellow>")
+            slot.strategy.show_positions()
+
+    def latency_report(self) -> str:
+        lines = [f"{'slot':>30} {'ticks':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'event ms':>10}"]
+        lines.extend(slot.latency_report() for slot in self.slots)
+
+        return "\n".join(lines)
+
+    def main(self):
+        for slot in self.slots:
+            slot.preload(self.exchange, self.preload)
+            logger.info(f"Preloaded {slot.name}.")
+
+        self.ticker_thread = CombinedStreamTicker(self.slots)
+        self.ticker_thread.start()
+
+        loop = True
+        while loop:
+            for _ in range(self.tick):
+                try:
+                    time.sleep(1)
+
+                    i = input()
+
+                    if i in ["t", "T"]:
+                        self.show_positions()
+                    elif i in ["l", "L"]:
+                        print(self.latency_report())
+                    elif i in ["q", "Q"]:
+                        raise KeyboardInterrupt
+                    else:
+                        logger.warning(f"Unhandled input: {i}", i)
+
+                except KeyboardInterrupt:
+                    loop = False
+                    break
+
+        self.ticker_thread.stop()
+        self.ticker_thread.join()
+
+        print(self.latency_report())
+        logger.opt(colors=True).info("<red>>></red> Exit")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    # {"exchange": "binance", "mode": "live-test", "preload": 300,
+    #  "slots": [{"pair": "BTC,USDT", "period": "5m", "strategy": "macd", "args": "a=1;b=2", "budget": 100}, ...]}
+    p.add_argument('--config', '-C', required=True, help=f"Portfolio config file (JSON).")
+
+    p.add_argument('--preload', '-l', default=300, help=f"Num old candles to preload, unless set in the config.")
+    p.add_argument('--mode', '-m', default='live-test', help=f"Trading mode (live-test, live), unless set in the config.")
+    p.add_argument('--tick', '-t', default=30, help=f"Input poll timespan.")
+
+    p.add_argument('--log-store',
+                   dest='log_store',
+                   default=False,
+                   action=argparse.BooleanOptionalAction,
+                   help=f"Should logs be saved to files.")
+    p.add_argument('--log-dir', type=Path, default=Path(__file__).absolute().parent / "logs", help=f"Path to the logs directory.")
+    p.add_argument('--log-level', default='INFO', help=f"Logging level.")
+
+    w = Portfolio(p.parse_args())
+    w.main()
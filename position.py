@@ -2,7 +2,7 @@ from loguru import logger
 
 from basetypes.order import Order, OrderStatus
 from candle import Candle
-from customtypes import TradeStatus, TradingMode
+from customtypes import ExitReason, TradeStatus, TradingMode
 from exchange_api.customtypes import BinanceQueryError, TimeInForceStatus
 from exchange_api.exchange_api_adapter_base import ExchangeApiAdapterBase
 
@@ -18,6 +18,7 @@ class Position(object):
         self.exit_price = 0
         self.open_candle = None
         self.close_candle = None
+        self.exit_reason = ExitReason.OPEN
         self.stop_loss_percent = stop_loss_percent
         self.stop_loss = 0
 
@@ -66,7 +67,7 @@ class Position(object):
 
         return True
 
-    def close(self, candle):
+    def close(self, candle, reason=ExitReason.SIGNAL):
         if self.mode in [TradingMode.LIVE]:
             quantity = self.exchange_order.quantity
 
@@ -88,34 +89,41 @@ class Position(object):
         logger.opt(colors=True).info("Trade <red>closed</red>")
 
         self.close_candle = candle
+        self.exit_reason = reason
         self.status = TradeStatus.CLOSED
 
     def tick(self, candle):
         if self.prop_limit:
             if (self.prop_limit_price - self.prop_limit) >= float(candle.average):
                 logger.opt(colors=True).info("<green>>>></green> <bold>Prop limit</bold>")
-                self.close(candle)
+                self.close(candle, ExitReason.PROP_LIMIT)
+                return
 
         if self.stop_loss:
             if (self.entry_price - self.stop_loss) >= float(candle.average):
                 logger.opt(colors=True).info("<bold><red>STOP LOSS</red></bold>")
-                self.close(candle)
+                self.close(candle, ExitReason.STOP_LOSS)
 
     def rt_tick(self, candle):
         if self.prop_limit:
             if (self.prop_limit_price - self.prop_limit) >= float(candle.current):
                 logger.opt(colors=True).info("<green>>>></green> <bold>Prop limit</bold>")
-                self.close(candle)
+                self.close(candle, ExitReason.PROP_LIMIT)
+                return
 
         if self.stop_loss:
             if (self.entry_price - self.stop_loss) >= float(candle.current):
                 logger.opt(colors=True).info("<bold><red>STOP LOSS</red></bold>")
-                self.close(candle)
+                self.close(candle, ExitReason.STOP_LOSS)
 
     def profit(self, candle):
         diff = float(candle.average) - self.entry_price
         return (diff * 100) / float(candle.average)
 
+    def profit_percent(self):
+        diff = self.exit_price - self.entry_price
+        return (diff * 100) / self.exit_price
+
     def showTrade(self):
         tradeStatus = "Entry Price: {:0.8f}, Status: {} Exit Price: {:0.8f}".format(self.entry_price, self.status.name, self.exit_price)
 
@@ -124,8 +132,7 @@ class Position(object):
             tradeStatus = tradeStatus + " Profit: "
 
             color = ['red', 'green'][self.exit_price > self.entry_price]
-            diff = self.exit_price - self.entry_price
-            profitPercent = (diff * 100) / self.exit_price
+            profitPercent = self.profit_percent()
             fmt = "{:3.2f}%".format(profitPercent)
 
             logger.opt(colors=True).info(f"{tradeStatus} <{color}>{fmt}</{color}>")
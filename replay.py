@@ -0,0 +1,67 @@
+import argparse
+import sys
+
+from loguru import logger
+
+import util
+from backtest.replay import DEFAULT_CHART_LIMIT, first_event_time, run_replay
+from customtypes import CurrencyPair
+from exchange_api import get_exchange_api
+
+
+def main(args):
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level, format='<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level}</level> | <level>{message}</level>')
+
+    pair = CurrencyPair(*args.pair.split(","))
+    period = util.interval_mapper(args.period)
+    preload = int(args.preload)
+
+    candles = None
+    if preload:
+        # Closed candles before the first recorded event.
+        interval = util.interval_mapper_to_seconds(period)
+        t_first = first_event_time(args.files[0]) // 1000
+        end = t_first - t_first % interval - 1
+        start = end - interval * preload
+
+        exchange = get_exchange_api(args.exchange)
+        candles, _ = exchange.returnChartData(pair, period, start, end)
+
+    result = run_replay(args.strategy,
+                        util.parse_strategy_args(args.strategy_args),
+                        args.files,
+                        period,
+                        pair,
+                        candles,
+                        float(args.budget or 0),
+                        stream=args.stream,
+                        limit=args.limit,
+                        overlays_path=args.record_overlays)
+
+    summary = result.summary()
+    logger.info(f"Replayed {summary['events']} events, {summary['candles']} candles in {summary['elapsed']:.2f}s "
+                f"({summary['events_per_second']:.0f} events/s), {summary['trades']} trades, profit {summary['profit']:.2f}%.")
+
+    result.strategy.show_positions()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument('files', nargs='+', help=f"Recorded kline update or trade events, JSON lines (.gz, .bz2, .xz, .zst).")
+
+    p.add_argument('--preload', '-l', default=0, help=f"Num old candles to preload from the exchange.")
+    p.add_argument('--pair', '-c', default='BTC,USDT', help=f"Currency pair. ex. BTC,USDT.")
+    p.add_argument('--period', '-p', default='1m', help=f"Timespan width for candle.")
+    p.add_argument('--exchange', '-e', default='binance', help=f"Exchange used to preload candles.")
+    p.add_argument('--stream', default=None, help=f"Only replay this stream of combined stream recordings.")
+    p.add_argument('--budget', '-b', default=None, help=f"Budget used to by crypto in currency which second param in pair.")
+    p.add_argument('--limit', type=int, default=DEFAULT_CHART_LIMIT, help=f"Num candles kept by the chart.")
+    p.add_argument('--record-overlays', default=None, help=f"Write the strategy overlay deltas to this file, JSON lines (.gz, .bz2, .xz, .zst).")
+
+    p.add_argument('--strategy', '-s', default='default', help=f"Trading strategy.")
+    p.add_argument('--strategy-args', '-a', default=None, help=f"Trading strategy arguments. ex. 'a=1;b=2'")
+
+    p.add_argument('--log-level', default='INFO', help=f"Logging level.")
+
+    main(p.parse_args())
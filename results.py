@@ -0,0 +1,44 @@
+import argparse
+
+from backtest.results import ResultsStore
+
+
+def format_table(rows: list[dict], top: int = None) -> str:
+    lines = [f"{'run':>32} {'strategy':>10} {'profit %':>10} {'drawdown %':>11} {'trades':>7} {'win %':>6} {'signal':>7} {'prop':>6} {'stop':>6}  args"]
+
+    for r in rows[:top]:
+        args = ";".join(f"{k}={v}" for k, v in r.get("args", {}).items())
+        lines.append(f"{r['run']:>32} {r['strategy']:>10} {r['profit']:>10.2f} {r['max_drawdown']:>11.2f} {r['trades']:>7} {r['win_rate']:>6.1f} "
+                     f"{r['exits_signal']:>7} {r['exits_prop_limit']:>6} {r['exits_stop_loss']:>6}  {args}")
+
+    return "\n".join(lines)
+
+
+def main(args):
+    store = ResultsStore(args.root)
+
+    # The last sweep unless told otherwise, runs of older ones share the directory.
+    sweep = args.sweep
+    if sweep is None:
+        sweeps = store.sweeps()
+        sweep = sweeps[-1] if sweeps else None
+    elif sweep == "all":
+        sweep = None
+
+    rows = store.aggregate(sweep)
+
+    # Lower is better only for the drawdown.
+    rows.sort(key=lambda r: r[args.sort_by], reverse=args.sort_by != "max_drawdown")
+
+    print(format_table(rows, args.top))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument('root', help=f"Results directory written by sweep.py --results.")
+
+    p.add_argument('--sweep', default=None, help=f"Sweep id to rank, the last one by default, 'all' for every run.")
+    p.add_argument('--sort-by', default='profit', help=f"Ranking column (profit, max_drawdown, trades, win_rate, profit_factor).")
+    p.add_argument('--top', '-n', type=int, default=20, help=f"Number of rows to show.")
+
+    main(p.parse_args())
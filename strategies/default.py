@@ -1,10 +1,13 @@
+import operator
+
 import numpy as np
+from basetypes.indicators import precompute_outputs
 from basetypes.trend_direction import TrendDirection
 from chart import Chart
 from loguru import logger
 from utils.trand_indicators import *
 
-from strategies.strategybase import StrategyBase
+from strategies.strategybase import Signals, StrategyBase
 
 
 class Strategy(StrategyBase):
@@ -23,15 +26,30 @@ class Strategy(StrategyBase):
         self.num_candles_uptrend = self.min_up
         self.previous_trend = TrendDirection.FLAT
 
-    def tick(self) -> dict:
+        # Trend lines over the last `num_candles_uptrend` lows / `num_candles_downtrend` highs.
+        self.uptrend_line = RollingRegression()
+        self.downtrend_line = RollingRegression()
+
+    @staticmethod
+    def _update_line(line: RollingRegression, values: np.array, n: int) -> np.array:
+        # While a trend lasts its window only grows by the new candle.
+        if len(line) == n - 1:
+            line.append(float(values[-1]))
+        else:
+            line.reset(values[-n:])
+
+        return line.line()
+
+    def tick(self):
         candle = self.get_current_candle()
 
         if self.use_rsi:
             current_rsi = self.indicators.rsi_array[-1]
-            avg_rsi = np.average(list(filter(lambda x: not np.isnan(x), self.indicators.rsi_array)))
+            rsi_array = self.indicators.rsi_array
+            avg_rsi = np.average(rsi_array[~np.isnan(rsi_array)])
 
-        aprox_uptrend = get_trend_aproximation(self.indicators.low_array, self.num_candles_uptrend)
-        aprox_downtrend = get_trend_aproximation(self.indicators.high_array, self.num_candles_downtrend)
+        aprox_uptrend = self._update_line(self.uptrend_line, self.indicators.low_array, self.num_candles_uptrend)
+        aprox_downtrend = self._update_line(self.downtrend_line, self.indicators.high_array, self.num_candles_downtrend)
 
         is_uptrend = stupid_check_uptrend(self.indicators, aprox_uptrend, strict=self.strict_up)
         is_downtrend = stupid_check_downtrend(self.indicators, aprox_downtrend, strict=self.strict_down)
@@ -72,7 +90,47 @@ class Strategy(StrategyBase):
         self.num_candles_downtrend = [self.min_down, self.num_candles_downtrend + 1][is_downtrend]
         self.previous_trend = trend_direction
 
-        return {"uptrend": aprox_uptrend, "downtrend": aprox_downtrend}
+        t = self.indicators.datetime_array
+        self.overlays.series("uptrend", color=(0, 0, 255), width=3).replace(t=t[-len(aprox_uptrend):], value=aprox_uptrend)
+        self.overlays.series("downtrend", color=(255, 0, 0), width=3).replace(t=t[-len(aprox_downtrend):], value=aprox_downtrend)
+
+    def generate_signals(self, columns: dict, start: int = 0) -> Signals:
+        candle_up = np.asarray(columns["close"]) > np.asarray(columns["open"])
+        candle_down = ~candle_up
+        previous_up = np.r_[False, candle_up[:-1]]
+        previous_down = np.r_[False, candle_down[:-1]]
+
+        if self.strict_up:
+            candles_up = candle_up & previous_up
+        else:
+            candles_up = candle_up | previous_up
+
+        if self.strict_down:
+            candles_down = candle_down & previous_down
+        else:
+            candles_down = candle_down | previous_down
+
+        is_uptrend = growing_trend(columns["low"], candles_up, self.min_up, operator.le, start)
+        is_downtrend = growing_trend(columns["high"], candles_down, self.min_down, operator.ge, start)
+
+        # 1 uptrend, -1 downtrend, 0 flat, the trend before the first tick is flat.
+        trend = is_uptrend.astype(np.int8) - is_downtrend
+        previous = np.r_[0, trend[:-1]]
+        previous[:start + 1] = 0
+
+        entries = (trend >= 0) & (previous == -1)
+        exits = (trend <= 0) & (previous == 1)
+
+        if self.use_rsi:
+            rsi = precompute_outputs(columns, ("rsi", ))["rsi"]
+            valid = ~np.isnan(rsi)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                avg_rsi = np.cumsum(np.where(valid, rsi, 0.0)) / np.cumsum(valid)
+
+            entries &= rsi <= np.round(avg_rsi)
+
+        return Signals(entries, exits, stop_loss_percent=1.0, prop_limits=trend == 1, prop_limit_percent=1.0)
 
     def rt_tick(self, candle: 'Candle') -> dict:
 
@@ -1,10 +1,11 @@
 from enum import Enum, auto
 
+import numpy as np
 import talib as ta
 from chart import Chart
 from loguru import logger
 
-from strategies.strategybase import StrategyBase
+from strategies.strategybase import Signals, StrategyBase
 
 
 class State(Enum):
@@ -18,14 +19,14 @@ class Strategy(StrategyBase):
 
     def __init__(self, args, chart: 'Chart', exchange, mode, budget):
         super().__init__(args, chart, exchange, mode, budget)
-        self.mPatterns = []
+        self.states = self.overlays.markers("states")
         self.is_trade_open = False
         self.is_hold = False
         self.is_change = False
 
         self.state_list = []
 
-    def tick(self) -> dict:
+    def tick(self):
         candle = self.get_current_candle()
 
         ema200 = list(reversed(list(self.indicators.ema200)))
@@ -38,15 +39,15 @@ class Strategy(StrategyBase):
 
         if close[:5] > ema200[:5] and close[:5] > ema50[:5] and close[:5] > ema25[:5] and close[:5] > ema12[:5]:
             self.state_list.append(State.HIGH)
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 25, "symbol": "arrow_down", "color": "#0000FF"})
+            self.states.append(t=candle.t_open, price=candle.p_low, style=self.states.style("arrow_down", 25, "#0000FF"))
 
         elif close[:5] < ema200[:5] and close[:5] < ema50[:5] and close[:5] < ema25[:5] and close[:5] < ema12[:5]:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 25, "symbol": "arrow_up", "color": "#FF0000"})
+            self.states.append(t=candle.t_open, price=candle.p_high, style=self.states.style("arrow_up", 25, "#FF0000"))
             self.state_list.append(State.LOW)
 
         else:
             self.state_list.append(State.MID)
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 15, "symbol": "x", "color": "#FF0000"})
+            self.states.append(t=candle.t_open, price=candle.p_high, style=self.states.style("x", 15, "#FF0000"))
 
         if self.state_list and len(self.state_list) >= 3:
             if self.state_list[-2] == State.HIGH and self.state_list[-1] == State.MID:
@@ -55,7 +56,10 @@ class Strategy(StrategyBase):
             elif self.state_list[-3] == State.HIGH and self.state_list[-2] == State.HIGH and self.state_list[-1] == State.MID:
                 pass
 
-        return {"scatter": self.mPatterns}
+    def generate_signals(self, columns: dict, start: int = 0) -> Signals:
+        # `tick()` only marks the EMA states on the chart, it never trades.
+        size = len(columns["close"])
+        return Signals(np.zeros(size, dtype=bool), np.zeros(size, dtype=bool))
 
     def rt_tick(self, candle: 'Candle') -> dict:
         return {}
@@ -1,8 +1,10 @@
+import numpy as np
 import talib as ta
+from basetypes.indicators import precompute_outputs
 from chart import Chart
 from loguru import logger
 
-from strategies.strategybase import StrategyBase
+from strategies.strategybase import Signals, StrategyBase
 
 
 class Strategy(StrategyBase):
@@ -20,12 +22,11 @@ class Strategy(StrategyBase):
 
         logger.opt(colors=True).info(f"MACD: RSI Threshold: <red>{self.rsi_threshold}</red>")
 
-    def tick(self) -> dict:
+    def tick(self):
         candle = self.get_current_candle()
         rsi_array = list(reversed(self.indicators.rsi_array))
 
-        close = self.indicators.close_array
-        macd_o, signal_o, hist_o = ta.MACD(close, fastperiod=self.fast, slowperiod=self.slow, signalperiod=self.signal)
+        macd_o, signal_o, hist_o = self.indicators.get("MACD", fastperiod=self.fast, slowperiod=self.slow, signalperiod=self.signal)
 
         macd = list(reversed(macd_o))
         signal = list(reversed(signal_o))
@@ -41,7 +42,25 @@ class Strategy(StrategyBase):
         if macd[0] < signal[0] and macd[1] >= signal[1]:
             self.close_trade()
 
-        return {"macd": macd_o, "signal": signal_o, "hist": hist_o}
+        t = self.indicators.datetime_array
+        self.overlays.series("macd", pane="macd", color=(0, 0, 255)).follow(t, macd_o)
+        self.overlays.series("signal", pane="macd", color=(255, 0, 0)).follow(t, signal_o)
+        self.overlays.series("hist", pane="macd", color=(0, 255, 0)).follow(t, hist_o)
+
+    def generate_signals(self, columns: dict, start: int = 0) -> Signals:
+        indicators = precompute_outputs(columns, ("ema200", "ema50", "rsi"))
+        macd, signal, _ = ta.MACD(np.asarray(columns["close"], dtype=np.float64), fastperiod=self.fast, slowperiod=self.slow, signalperiod=self.signal)
+
+        above = macd > signal
+        below = macd < signal
+        # NaN compares false, like the reversed lists in `tick()`.
+        was_below_or_eq = np.r_[False, macd[:-1] <= signal[:-1]]
+        was_above_or_eq = np.r_[False, macd[:-1] >= signal[:-1]]
+
+        entries = (indicators["ema200"] >= indicators["ema50"]) & above & was_below_or_eq & (indicators["rsi"] <= self.rsi_threshold)
+        exits = below & was_above_or_eq
+
+        return Signals(entries, exits, stop_loss_percent=0.0)
 
     def rt_tick(self, candle: 'Candle') -> dict:
         return {}
@@ -3,8 +3,10 @@ from enum import unique
 from functools import reduce
 
 import talib as ta
+from candle import candles_to_columns
 from chart import Chart
 from numpy.lib.function_base import append
+from utils import levels
 
 from strategies.strategybase import StrategyBase
 
@@ -145,104 +147,12 @@ def find_maxs(candles, chunk_sz):
     return maxs
 
 
-def add_to_group(group, item, err):
-    match = False
-
-    for j in group:
-        if match:
-            break
-
-        if abs(j["y"] - item["y"]) < (item["y"] * err):
-            match = True
-
-    if match:
-        return group + [item]
-
-
-def add_to_groups(groups, item, err):
-    if not groups:
-        groups.append([item])
-    else:
-        added = False
-        for gi, group in enumerate(groups):
-            ret = add_to_group(group, item, err)
-
-            if ret:
-                added = True
-                groups[gi] = ret
-
-        if not added:
-            groups.append([item])
-
-
 def find_support(candles, err):
-    mins = find_mins(candles, 12)
-
-    min_candles = list(map(lambda m: m.get("c"), mins))
-
-    supports = []
-    for c in min_candles:
-        for c2 in min_candles:
-            if c2.t_open != c.t_open and abs(c.average - c2.average) < (c.average * err):
-                supports.append({"x": c.t_open, "y": c.average})
-
-    check_timestamp = []
-    filtered = []
-    for i in sorted(supports, key=lambda x: x["y"]):
-        if i["x"] not in check_timestamp:
-            check_timestamp.append(i["x"])
-            filtered.append(i)
-
-    groups = []
-
-    for i in filtered:
-        add_to_groups(groups, i, err)
-
-    supports = []
-    for group in groups:
-        m = sum(map(lambda x: x["y"], group)) / len(group)
-
-        t = sorted(group, key=lambda x: x["x"])
-
-        support = {"x-start": t[-1]["x"], "x-end": candles[-1].t_open, "y": m}
-        supports.append(support)
-
-    return supports
+    return levels.find_support(candles_to_columns(list(candles)), err)
 
 
 def find_resist(candles, err):
-    maxs = find_maxs(candles, 12)
-
-    min_candles = list(map(lambda m: m.get("c"), maxs))
-
-    supports = []
-    for c in min_candles:
-        for c2 in min_candles:
-            if c2.t_open != c.t_open and abs(c.average - c2.average) < (c.average * err):
-                supports.append({"x": c.t_open, "y": c.average})
-
-    check_timestamp = []
-    filtered = []
-    for i in sorted(supports, key=lambda x: x["y"]):
-        if i["x"] not in check_timestamp:
-            check_timestamp.append(i["x"])
-            filtered.append(i)
-
-    groups = []
-
-    for i in filtered:
-        add_to_groups(groups, i, err)
-
-    supports = []
-    for group in groups:
-        m = sum(map(lambda x: x["y"], group)) / len(group)
-
-        t = sorted(group, key=lambda x: x["x"])
-
-        support = {"x-start": t[-1]["x"], "x-end": candles[-1].t_open, "y": m}
-        supports.append(support)
-
-    return supports
+    return levels.find_resist(candles_to_columns(list(candles)), err)
 
 
 class Strategy(StrategyBase):
@@ -251,7 +161,7 @@ class Strategy(StrategyBase):
     def __init__(self, args, chart: 'Chart', exchange, mode, budget):
         super().__init__(args, chart, exchange, mode, budget)
 
-    def tick(self) -> dict:
+    def tick(self):
 
         v_shapes = find_v_shape_new(self.chart.get_candles(), 5)
 
@@ -307,8 +217,8 @@ class Strategy(StrategyBase):
         # supports = find_support(self.chart.get_candles(), err)
         # resists = find_resist(self.chart.get_candles(), err)
 
-        return {"lows": v_shapes}  #{"supports": [], "resists": [], "lows": [], "highs": []}
-        return {}  #{"supports": [], "resists": [], "lows": [], "highs": []}
+        lows = self.overlays.markers("lows")
+        lows.replace(t=[v["x"] for v in v_shapes], price=[v["y"] for v in v_shapes], style=lows.style("o"))
 
     def rt_tick(self, candle: 'Candle') -> dict:
         return {}
@@ -1,10 +1,36 @@
 import math
 
-import talib as ta
+import numpy as np
 from chart import Chart
+from utils.pattern_scanner import PatternScanner
 
 from strategies.strategybase import StrategyBase
 
+# CDL function: (candle column the marker is placed at, scatter marker)
+PATTERNS = {
+    "CDLDOJI": ("low", {"size": 10, "symbol": "+", "color": "#0000FF"}),
+    "CDLMORNINGSTAR": ("low", {"size": 10, "symbol": "star", "color": "#0000FF"}),
+    "CDLEVENINGSTAR": ("low", {"size": 10, "symbol": "star", "color": "#FF0000"}),
+    "CDLMORNINGDOJISTAR": ("high", {"size": 10, "symbol": "x", "color": "#0000FF"}),
+    "CDLEVENINGDOJISTAR": ("high", {"size": 10, "symbol": "x", "color": "#FF0000"}),
+    "CDLTASUKIGAP": ("high", {"size": 40, "symbol": "arrow_right", "color": "#FF0000"}),
+    "CDLMATCHINGLOW": ("high", {"size": 10, "symbol": "s", "color": "#FF0000"}),
+    "CDLABANDONEDBABY": ("high", {"size": 20, "symbol": "crosshair", "color": "#FF0000"}),
+    # "CDL2CROWS": ("low", {"size": 20, "symbol": "o"}),
+    # "CDL3BLACKCROWS": ("low", {"size": 20, "symbol": "arrow_down", 'color': "#FF0000"}),
+    # "CDL3INSIDE": ("low", {"size": 20, "symbol": "arrow_right"}),
+    # "CDL3LINESTRIKE": ("low", {"size": 10, "symbol": 'o'}),
+    # "CDL3OUTSIDE": ("low", {"size": 20, "symbol": 'arrow_left'}),
+    # "CDL3STARSINSOUTH": ("low", {"size": 10, "symbol": "star", "color": "#FF00FF"}),
+    # "CDLBREAKAWAY": ("high", {"size": 50, "symbol": "arrow_up", "color": "#FF0000"}),
+    # "CDLDARKCLOUDCOVER": ("high", {"size": 40, "symbol": "arrow_up", "color": "#0000FF"}),
+    # "CDLPIERCING": ("high", {"size": 40, "symbol": "arrow_down", "color": "#FF0000"}),
+    # "CDLINVERTEDHAMMER": ("high", {"size": 40, "symbol": "arrow_up", "color": "#0000FF"}),
+    # "CDLADVANCEBLOCK": ("low", {"size": 10, "symbol": "p", "color": "#00FF00"}),
+    # "CDLBELTHOLD": ("low", {"size": 10, "symbol": "p", "color": "#0000FF"}),
+    # "CDL3WHITESOLDIERS": ("low", {"size": 20, "symbol": "arrow_up", 'color': "#FFFFFF"}),
+}
+
 
 def chunks(lst, n):
     for i in range(0, len(lst), n):
@@ -62,103 +88,26 @@ class Strategy(StrategyBase):
 
     def __init__(self, args, chart: 'Chart', exchange, mode, budget):
         super().__init__(args, chart, exchange, mode, budget)
-        self.mPatterns = []
-
-    def tick(self) -> dict:
-        candle = self.get_current_candle()
-
-        lst_candles = self.chart.get_candles()[-5:]
-
-        o = self.indicators.open_array
-        c = self.indicators.close_array
-        l = self.indicators.low_array
-        h = self.indicators.high_array
-
-        # if ta.CDL2CROWS(o, h, l, c)[-1]:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 20, "symbol": "o"})
-
-        # if ta.CDL3BLACKCROWS(o, h, l, c)[-1]:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 20, "symbol": "arrow_down", 'color': "#FF0000"})
-
-        # if ta.CDL3INSIDE(o, h, l, c)[-1]:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 20, "symbol": "arrow_right"})
-
-        # if (integer := ta.CDL3LINESTRIKE(o, h, l, c))[-1]:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": 'o'})
-
-        # if (integer := ta.CDL3OUTSIDE(o, h, l, c))[-1]:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 20, "symbol": 'arrow_left'})
-
-        # if (integer := ta.CDLDOJI(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 10, "symbol": "+"})
-
-        if (integer := ta.CDLDOJI(o, h, l, c))[-1] != 0:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "+", "color": "#0000FF"})
-
-        if (integer := ta.CDLMORNINGSTAR(o, h, l, c))[-1] != 0:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "star", "color": "#0000FF"})
-
-        if (integer := ta.CDLEVENINGSTAR(o, h, l, c))[-1] != 0:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "star", "color": "#FF0000"})
-
-        if (integer := ta.CDLMORNINGDOJISTAR(o, h, l, c))[-1] != 0:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 10, "symbol": "x", "color": "#0000FF"})
-
-        if (integer := ta.CDLEVENINGDOJISTAR(o, h, l, c))[-1] != 0:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 10, "symbol": "x", "color": "#FF0000"})
-
-        if (integer := ta.CDLTASUKIGAP(o, h, l, c))[-1] != 0:
-            print("CDLTASUKIGAP", integer[-1])
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 40, "symbol": "arrow_right", "color": "#FF0000"})
-
-        if (integer := ta.CDLMATCHINGLOW(o, h, l, c))[-1] != 0:
-            print("CDLMATCHINGLOW", integer[-1])
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 10, "symbol": "s", "color": "#FF0000"})
-
-        if (integer := ta.CDLABANDONEDBABY(o, h, l, c))[-1] != 0:
-            self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 20, "symbol": "crosshair", "color": "#FF0000"})
-
-        # if (integer := ta.CDL3STARSINSOUTH(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "star", "color": "#FF00FF"})
-
-        # if (integer := ta.CDLABANDONEDBABY(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "p", "color": "#FF0000"})
-
-        # if (integer := ta.CDLBREAKAWAY(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 50, "symbol": "arrow_up", "color": "#FF0000"})
-
-        # if (integer := ta.CDLDARKCLOUDCOVER(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 40, "symbol": "arrow_up", "color": "#0000FF"})
-
-        # if (integer := ta.CDLPIERCING(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 40, "symbol": "arrow_down", "color": "#FF0000"})
-
-        # if (integer := ta.CDLINVERTEDHAMMER(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 40, "symbol": "arrow_up", "color": "#0000FF"})
-
-        # if (integer := ta.CDLPIERCING(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_high), "size": 10, "symbol": "o", "color": "#FF00FF"})
-
-        # if (integer := ta.CDLADVANCEBLOCK(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "p", "color": "#00FF00"})
-
-        # if (integer := ta.CDLBELTHOLD(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "p", "color": "#0000FF"})
-
-        # if (integer := ta.CDLMORNINGDOJISTAR(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": "h"})
-
-        # if (integer := ta.CDL3WHITESOLDIERS(o, h, l, c))[-1] != 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 20, "symbol": "arrow_up", 'color': "#FFFFFF"})
-
-        # if (integer := ta.CDLENGULFING(o, h, l, c))[-1] > 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": 't2'})
-
-        # if (integer := ta.CDLENGULFING(o, h, l, c))[-1] < 0:
-        #     self.mPatterns.append({"pos": (candle.t_open, candle.p_low), "size": 10, "symbol": 't3'})
 
-        return {"scatter": self.mPatterns}
-        # lows highs
+        names = args["patterns"].split(",") if args.get("patterns") else list(PATTERNS)
+        capacity = int(args.get("max-events", 4096))
+        self.scanner = PatternScanner({name: PATTERNS[name][0] for name in names}, capacity=capacity)
+        self.markers = self.overlays.markers("patterns", capacity=capacity)
+        # pattern index: marker style
+        self.styles = np.array([self.markers.style(**PATTERNS[name][1]) for name in names], dtype=np.int16)
+
+    def tick(self):
+        self.scanner.sync(self.chart)
+
+        # Only the events found since the last tick are sent, all again after a chart reset.
+        t_last = self.markers.view("t")[-1] if len(self.markers) else None
+        if t_last is not None and (not len(self.scanner.events) or self.scanner.events.t_open.view()[-1] < t_last):
+            self.markers.clear()
+            t_last = None
+        events = self.scanner.events.query(t_start=int(t_last) + 1 if t_last is not None else int(self.indicators.datetime_array[0]))
+
+        if events["t_open"].size:
+            self.markers.append(t=events["t_open"], price=events["price"], style=self.styles[events["pattern"]])
 
     def rt_tick(self, candle: 'Candle') -> dict:
         return {}
@@ -26,12 +26,12 @@ class Strategy(StrategyBase):
     def __init__(self, args, chart: 'Chart', exchange, mode, budget):
         super().__init__(args, chart, exchange, mode, budget)
 
-    def tick(self) -> dict:
+    def tick(self):
         candle = self.get_current_candle()
 
         if is_pinbar_red(candle):
-            return {"lows": [{"x": candle.t_open, "y": candle.p_low, "c": candle.p_low}]}
-        return {}
+            lows = self.overlays.markers("lows")
+            lows.append(t=candle.t_open, price=candle.p_low, style=lows.style("o"))
 
     def rt_tick(self, candle: 'Candle') -> dict:
         return {}
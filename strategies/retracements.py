@@ -10,7 +10,7 @@ class Strategy(StrategyBase):
     def __init__(self, args, chart: 'Chart', exchange, mode, budget):
         super().__init__(args, chart, exchange, mode, budget)
 
-    def tick(self) -> dict:
+    def tick(self):
         candle = self.get_current_candle()
 
         logger.info(candle)
@@ -40,8 +40,6 @@ class Strategy(StrategyBase):
         if self.position:
             self.position.set_prop_limit(candle, 1.0)
 
-        return {}
-
     def rt_tick(self, candle: 'Candle') -> dict:
 
         return {}
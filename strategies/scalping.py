@@ -1,9 +1,11 @@
 import math
 
+import numpy as np
 import talib as ta
+from basetypes.indicators import precompute_outputs
 from chart import Chart
 
-from strategies.strategybase import StrategyBase
+from strategies.strategybase import Signals, StrategyBase
 
 MAIN_PERIOD = 30
 SIGNAL_PERIOD = 5
@@ -15,14 +17,13 @@ class Strategy(StrategyBase):
     def __init__(self, args, chart: 'Chart', exchange, mode, budget):
         super().__init__(args, chart, exchange, mode, budget)
 
-    def tick(self) -> dict:
+    def tick(self):
         candle = self.get_current_candle()
 
-        close = self.indicators.close_array
         psar = self.indicators.psar_array
 
-        sma = ta.SMA(ta.SMA(close, math.ceil(MAIN_PERIOD / 2)), math.floor(MAIN_PERIOD / 2) + 1)
-        signal_line = ta.SMA(close, SIGNAL_PERIOD)
+        sma = ta.SMA(self.indicators.get("SMA", timeperiod=math.ceil(MAIN_PERIOD / 2)), math.floor(MAIN_PERIOD / 2) + 1)
+        signal_line = self.indicators.get("SMA", timeperiod=SIGNAL_PERIOD)
 
         scalping_line = signal_line - sma
 
@@ -35,7 +36,20 @@ class Strategy(StrategyBase):
         if psar[-1] > candle.p_high:
             self.close_trade()
 
-        return {"scalping": scalping_line}
+        self.overlays.series("scalping", pane="scalping").follow(self.indicators.datetime_array, scalping_line)
+
+    def generate_signals(self, columns: dict, start: int = 0) -> Signals:
+        close = np.asarray(columns["close"], dtype=np.float64)
+        psar = precompute_outputs(columns, ("psar", ))["psar"]
+
+        sma = ta.SMA(ta.SMA(close, math.ceil(MAIN_PERIOD / 2)), math.floor(MAIN_PERIOD / 2) + 1)
+        signal_line = ta.SMA(close, SIGNAL_PERIOD)
+
+        rising = (signal_line - sma) > 0
+        entries = rising & ~np.r_[False, rising[:-1]]
+        exits = psar > columns["high"]
+
+        return Signals(entries, exits, stop_loss_percent=5.0)
 
     def rt_tick(self, candle: 'Candle') -> dict:
 
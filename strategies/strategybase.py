@@ -1,10 +1,26 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 from basetypes.indicators import Indicators
+from basetypes.overlays import Overlays
 from loguru import logger
 from position import Position
 
 
+class Signals:
+    # Entry and exit flags for every candle of a backtest history. They are applied
+    # in the order of `tick()`: an entry is taken before the exit of the same candle
+    # is checked, positions are opened with `stop_loss_percent`. `prop_limits` flags
+    # the candles calling `set_prop_limit(candle, prop_limit_percent)` on the open position.
+
+    def __init__(self, entries: np.array, exits: np.array, stop_loss_percent: float = 0.0, prop_limits: np.array = None, prop_limit_percent: float = 0.0):
+        self.entries = np.asarray(entries, dtype=bool)
+        self.exits = np.asarray(exits, dtype=bool)
+        self.stop_loss_percent = stop_loss_percent
+        self.prop_limits = np.asarray(prop_limits, dtype=bool) if prop_limits is not None else None
+        self.prop_limit_percent = prop_limit_percent
+
+
 class StrategyBase(ABC):
     __strategy__ = None
 
@@ -14,7 +30,9 @@ class StrategyBase(ABC):
         self.pair = self.chart.pair
         self.mode = mode
         self.budget = budget
-        self.indicators = Indicators()
+        self.indicators = Indicators(self.chart)
+        # What `tick()` draws over the chart, see `basetypes.overlays`.
+        self.overlays = Overlays()
 
         self.trades = []
         self.position = None
@@ -25,35 +43,33 @@ class StrategyBase(ABC):
     def on_preload(self, candles: list['Candle'], num_candles_to_preload: int):
         self.chart.reset(candles[:num_candles_to_preload])
 
-        candles = self.chart.get_candles()
+    def precompute(self, columns: dict):
+        # Called by the headless backtest with the whole history to replay. Strategies
+        # whose per tick logic can't be reproduced from precomputed columns may override it.
+        self.indicators.precompute(columns)
 
-        self.indicators.datetime_array = candles
-        self.indicators.open_array = candles
-        self.indicators.close_array = candles
-        self.indicators.high_array = candles
-        self.indicators.low_array = candles
-        self.indicators.volume_array = candles
+    def generate_signals(self, columns: dict, start: int = 0) -> Signals:
+        # Optional whole history version of `tick()` for the headless backtest, the
+        # signal at index `i` must only depend on the candles up to `i`. `start` is
+        # the first candle ticked, stateful strategies start their state there.
+        # Strategies returning None are replayed candle by candle.
+        return None
 
-    def on_tick(self, candle: 'Candle') -> dict:
-        self.chart.add(candle)
+    def on_tick(self, candle: 'Candle') -> list['Delta']:
+        # Strategies sharing a chart are each handed the same closed candle.
+        # Returns the overlay changes of the tick.
+        last = self.chart.get_last_candle()
+        if last is None or last.t_open != candle.t_open:
+            self.chart.add(candle)
 
-        candles = self.chart.get_candles()
-
-        self.indicators.datetime_array = candles
-        self.indicators.open_array = candles
-        self.indicators.close_array = candles
-        self.indicators.high_array = candles
-        self.indicators.low_array = candles
-        self.indicators.volume_array = candles
-
-        ret: dict = self.tick()
+        self.tick()
 
         self.update_open_position(candle)
 
-        return ret
+        return self.overlays.flush()
 
     @abstractmethod
-    def tick(self) -> dict:
+    def tick(self):
         raise NotImplementedError
 
     def on_rt_tick(self, candle: 'Candle') -> dict:
@@ -0,0 +1,72 @@
+import argparse
+import sys
+
+from loguru import logger
+
+import util
+from backtest.results import FORMATS, ResultsStore
+from backtest.sweep import expand_grid, format_table, parse_grid, run_sweep, sample_grid
+from candle import candles_to_columns
+from customtypes import CurrencyPair
+from exchange_api import get_exchange_api
+
+
+def main(args):
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level, format='<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level}</level> | <level>{message}</level>')
+
+    pair = CurrencyPair(*args.pair.split(","))
+    period = util.interval_mapper(args.period)
+    preload = int(args.preload)
+    exchange = get_exchange_api(args.exchange)
+
+    interval = util.interval_mapper_to_seconds(period)
+    start = int(args.t_start) - (interval * preload)
+    end = util.end_time(args.t_end or 'now')
+
+    candles, _ = exchange.returnChartData(pair, period, start, end)
+    columns = candles_to_columns(candles)
+
+    grid = parse_grid(args.grid)
+    if args.random:
+        combinations = sample_grid(grid, int(args.random), args.seed)
+    else:
+        combinations = expand_grid(grid)
+
+    logger.info(f"Sweeping {len(combinations)} combinations of '{args.strategy}' over {len(candles)} candles.")
+
+    store = ResultsStore(args.results, args.results_format) if args.results else None
+
+    results = run_sweep(args.strategy, combinations, columns, period, preload, args.workers, args.sort_by, args.vectorized, store)
+
+    print(format_table(results, args.top))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument('--preload', '-l', default=300, help=f"Num old candles to preload.")
+    p.add_argument('--t-start', '-S', required=True, help=f"Timespan start.")
+    p.add_argument('--t-end', '-E', default=None, help=f"Timespan end.")
+
+    p.add_argument('--pair', '-c', default='BTC,USDT', help=f"Currency pair. ex. BTC,USDT.")
+    p.add_argument('--period', '-p', default='5m', help=f"Timespan width for candle.")
+    p.add_argument('--exchange', '-e', default='binance', help=f"Exchange used to load candles.")
+    p.add_argument('--strategy', '-s', default='default', help=f"Trading strategy.")
+
+    p.add_argument('--grid', '-g', required=True, help=f"Strategy arguments grid. ex. 'fast=8,12,16;slow=20:32:2;sig=9'")
+    p.add_argument('--random', '-r', default=None, help=f"Number of random combinations to sample from the grid.")
+    p.add_argument('--seed', type=int, default=None, help=f"Random search seed.")
+    p.add_argument('--workers', '-w', type=int, default=None, help=f"Number of worker processes, all cores by default.")
+    p.add_argument('--sort-by', default='profit', help=f"Ranking column (profit, max_drawdown, trades).")
+    p.add_argument('--vectorized',
+                   dest='vectorized',
+                   default=True,
+                   action=argparse.BooleanOptionalAction,
+                   help=f"Backtest from whole history signals when the strategy supports it.")
+    p.add_argument('--top', '-n', type=int, default=20, help=f"Number of rows to show.")
+    p.add_argument('--results', default=None, help=f"Directory to write the trade log and equity curve of every run to.")
+    p.add_argument('--results-format', default='npz', choices=FORMATS, help=f"Results file format, parquet and arrow need pyarrow.")
+
+    p.add_argument('--log-level', default='INFO', help=f"Logging level.")
+
+    main(p.parse_args())
@@ -51,23 +51,27 @@ def interval_mapper(interval: str) -> CandleTimeInterval:
     }.get(interval, None)
 
 
+ONE_MINUTE = 60
+ONE_HOUR = ONE_MINUTE * 60
+
+MAP_INTERVAL_TO_SECONDS = {
+    CandleTimeInterval.I_1M: ONE_MINUTE,
+    CandleTimeInterval.I_3M: ONE_MINUTE * 3,
+    CandleTimeInterval.I_5M: ONE_MINUTE * 5,
+    CandleTimeInterval.I_15M: ONE_MINUTE * 15,
+    CandleTimeInterval.I_30M: ONE_MINUTE * 30,
+    CandleTimeInterval.I_1H: ONE_HOUR,
+    CandleTimeInterval.I_2H: ONE_HOUR * 2,
+    CandleTimeInterval.I_4H: ONE_HOUR * 4,
+    CandleTimeInterval.I_6H: ONE_HOUR * 6,
+    CandleTimeInterval.I_8H: ONE_HOUR * 8,
+    CandleTimeInterval.I_12H: ONE_HOUR * 12,
+    CandleTimeInterval.I_1D: ONE_HOUR * 24,
+}
+
+
 def interval_mapper_to_seconds(interval: str) -> int:
-    one_minute = 60
-    one_hour = one_minute * 60
-    return {
-        CandleTimeInterval.I_1M: one_minute,
-        CandleTimeInterval.I_3M: one_minute * 3,
-        CandleTimeInterval.I_5M: one_minute * 5,
-        CandleTimeInterval.I_15M: one_minute * 15,
-        CandleTimeInterval.I_30M: one_minute * 30,
-        CandleTimeInterval.I_1H: one_hour,
-        CandleTimeInterval.I_2H: one_hour * 2,
-        CandleTimeInterval.I_4H: one_hour * 4,
-        CandleTimeInterval.I_6H: one_hour * 6,
-        CandleTimeInterval.I_8H: one_hour * 8,
-        CandleTimeInterval.I_12H: one_hour * 12,
-        CandleTimeInterval.I_1D: one_hour * 24,
-    }.get(interval, None)
+    return MAP_INTERVAL_TO_SECONDS.get(interval, None)
 
 
 def mode_mapper(mode: str) -> TradingMode:
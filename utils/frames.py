@@ -0,0 +1,67 @@
+import threading
+
+import numpy as np
+
+# Indicators attributes (`<name>_array`) drawn by the GUI.
+SERIES = ("datetime", "open", "close", "low", "high", "volume", "ema6", "ema12", "ema25", "ema50", "ema200", "psar", "rsi", "adx", "di_plus", "di_minus")
+
+
+def _frozen(values) -> np.array:
+    values = np.array(values)
+    values.flags.writeable = False
+    return values
+
+
+class Frame:
+    # What the GUI draws after a chart tick, copied on the strategy thread: the
+    # chart series and the overlay deltas since the previous frame, nothing
+    # shared with the strategy any more. Arrays are read only.
+
+    def __init__(self, series: dict, deltas: list['Delta']):
+        self.series = series
+        self.deltas = deltas
+
+    def __getitem__(self, name) -> np.array:
+        return self.series[name]
+
+
+def compact(deltas: list['Delta']) -> list['Delta']:
+    # Deltas before the last replace of the same overlay are of no use.
+    last = {delta.name: i for i, delta in enumerate(deltas) if delta.replace}
+    return [delta for i, delta in enumerate(deltas) if i >= last.get(delta.name, 0)]
+
+
+def make_frame(indicators: 'Indicators', deltas: list['Delta']) -> Frame:
+    series = {name: _frozen(getattr(indicators, f"{name}_array")) for name in SERIES}
+    return Frame(series, compact(deltas))
+
+
+def merge_frames(previous: Frame, frame: Frame) -> Frame:
+    # `frame` replacing one never drawn, the deltas of both are still to apply.
+    return Frame(frame.series, compact(previous.deltas + frame.deltas))
+
+
+class LatestValue:
+    # Single slot between a producer and a consumer thread: `put` replaces the
+    # value not taken yet (counted in `dropped`), or combines both with
+    # `merge(previous, value)`. `take` returns the newest value once, None when
+    # nothing new was put since.
+
+    def __init__(self, merge: callable = None):
+        self.lock = threading.Lock()
+        self.merge = merge
+        self.value = None
+        self.dropped = 0
+
+    def put(self, value):
+        with self.lock:
+            if self.value is not None:
+                self.dropped += 1
+                if self.merge is not None:
+                    value = self.merge(self.value, value)
+            self.value = value
+
+    def take(self):
+        with self.lock:
+            value, self.value = self.value, None
+        return value
@@ -0,0 +1,176 @@
+import json
+
+import numpy as np
+
+# Decoding backends, fastest first. msgspec decodes straight into typed records,
+# orjson only speeds up the parsing, the stdlib is always there.
+BACKENDS = {}
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Columns of decoded klines, also the layout of `exchange_api.kline_cache`. Times
+# are kept in milliseconds, as returned by the exchange.
+KLINE_COLUMNS = {
+    "t_open": np.int64,
+    "t_close": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+}
+
+
+def empty_columns() -> dict:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in KLINE_COLUMNS.items()}
+
+
+class Kline:
+    # Kline of a websocket event with the values converted, prices are floats and times milliseconds.
+    __slots__ = ("t_open", "t_close", "open", "close", "high", "low", "volume", "closed")
+
+    def __init__(self, t_open, t_close, open, close, high, low, volume, closed):
+        self.t_open = t_open
+        self.t_close = t_close
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.closed = closed
+
+
+class KlineEvent:
+    __slots__ = ("stream", "event_time", "kline")
+
+    def __init__(self, stream: str, event_time: int, kline: Kline):
+        self.stream = stream
+        self.event_time = event_time
+        self.kline = kline
+
+
+def kline_from_dict(k: dict) -> Kline:
+    return Kline(int(k["t"]), int(k["T"]), float(k["o"]), float(k["c"]), float(k["h"]), float(k["l"]), float(k["v"]), bool(k["x"]))
+
+
+def _rows_to_columns(rows: list) -> dict:
+    if not rows:
+        return empty_columns()
+
+    # Prices come as strings, numpy converts whole columns of them in one call.
+    (o_t, o_p, h_p, l_p, c_p, v, c_t, *_) = zip(*rows)
+    values = {"t_open": o_t, "t_close": c_t, "open": o_p, "high": h_p, "low": l_p, "close": c_p, "volume": v}
+    return {name: np.array(values[name], dtype=dtype) for name, dtype in KLINE_COLUMNS.items()}
+
+
+class JsonDecoder:
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def decode_klines(self, payload) -> dict:
+        # REST `/api/v3/klines` page to columns, times stay in milliseconds.
+        return _rows_to_columns(self.loads(payload))
+
+    def decode_kline_frame(self, frame) -> KlineEvent:
+        # Combined stream frame: {"stream": name, "data": {"E": event time, "k": kline, ...}}.
+        data = self.loads(frame)
+        event = data["data"]
+        return KlineEvent(data["stream"], event["E"], kline_from_dict(event["k"]))
+
+
+BACKENDS["json"] = JsonDecoder
+
+if orjson is not None:
+
+    class OrjsonDecoder(JsonDecoder):
+        name = "orjson"
+
+        def loads(self, data):
+            return orjson.loads(data)
+
+    BACKENDS["orjson"] = OrjsonDecoder
+
+if msgspec is not None:
+
+    class _KlineRow(msgspec.Struct, array_like=True):
+        t_open: int
+        open: float
+        high: float
+        low: float
+        close: float
+        volume: float
+        t_close: int
+
+    class _Kline(msgspec.Struct, rename={"t_open": "t", "t_close": "T", "open": "o", "close": "c", "high": "h", "low": "l", "volume": "v", "closed": "x"}):
+        t_open: int
+        t_close: int
+        open: float
+        close: float
+        high: float
+        low: float
+        volume: float
+        closed: bool
+
+    class _KlineData(msgspec.Struct, rename={"event_time": "E", "kline": "k"}):
+        event_time: int
+        kline: _Kline
+
+    class _KlineFrame(msgspec.Struct):
+        stream: str
+        data: _KlineData
+
+    class MsgspecDecoder(JsonDecoder):
+        # `strict=False` lets msgspec parse the quoted prices as floats while decoding,
+        # unknown fields are skipped without being materialized.
+        name = "msgspec"
+
+        def __init__(self):
+            self.decoder = msgspec.json.Decoder()
+            self.rows_decoder = msgspec.json.Decoder(list[_KlineRow], strict=False)
+            self.frame_decoder = msgspec.json.Decoder(_KlineFrame, strict=False)
+
+        def loads(self, data):
+            return self.decoder.decode(data)
+
+        def decode_klines(self, payload) -> dict:
+            rows = self.rows_decoder.decode(payload)
+            if not rows:
+                return _rows_to_columns(rows)
+
+            return {
+                "t_open": np.array([r.t_open for r in rows], dtype=np.int64),
+                "t_close": np.array([r.t_close for r in rows], dtype=np.int64),
+                "open": np.array([r.open for r in rows], dtype=np.float64),
+                "high": np.array([r.high for r in rows], dtype=np.float64),
+                "low": np.array([r.low for r in rows], dtype=np.float64),
+                "close": np.array([r.close for r in rows], dtype=np.float64),
+                "volume": np.array([r.volume for r in rows], dtype=np.float64),
+            }
+
+        def decode_kline_frame(self, frame) -> KlineEvent:
+            # The decoded kline has the same attributes as `Kline`.
+            frame = self.frame_decoder.decode(frame)
+            return KlineEvent(frame.stream, frame.data.event_time, frame.data.kline)
+
+    BACKENDS["msgspec"] = MsgspecDecoder
+
+
+def get_decoder(backend: str = None) -> JsonDecoder:
+    if backend is None:
+        backend = next(name for name in ("msgspec", "orjson", "json") if name in BACKENDS)
+
+    return BACKENDS[backend]()
+
+
+decoder = get_decoder()
@@ -0,0 +1,152 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.ring_buffer import RingBuffer
+
+# Candles per chunk, every chunk contributes its lowest low / highest high.
+CHUNK_SIZE = 12
+
+
+def candle_average(high, low, close) -> np.array:
+    # Same operation order as `Candle.average`.
+    return (high + low + close) / 3
+
+
+def chunk_extrema(values: np.array, chunk: int = CHUNK_SIZE, largest: bool = False) -> np.array:
+    # Index of the first minimum (maximum) of every `chunk` values, the last chunk may be shorter.
+    size = values.size
+    full = size // chunk
+    pick = np.argmax if largest else np.argmin
+
+    index = np.empty(full + (size % chunk > 0), dtype=np.int64)
+
+    if full:
+        windows = sliding_window_view(values[:full * chunk], chunk)[::chunk]
+        index[:full] = pick(windows, axis=1) + np.arange(full) * chunk
+
+    if size % chunk:
+        index[full] = full * chunk + pick(values[full * chunk:])
+
+    return index
+
+
+def find_levels(t_open: np.array, prices: np.array, err: float, x_end: int) -> list[dict]:
+    # Clusters the extrema prices whose relative distance is below `err`:
+    # extrema without a neighbour that close are dropped, the rest is split
+    # wherever two neighbours in price order are too far apart. A level is the
+    # mean price of its cluster starting at its latest extremum.
+    order = np.argsort(prices, kind="stable")
+    prices = prices[order]
+    t_open = t_open[order]
+
+    # Sorted by price the closest other extremum is a neighbour.
+    gaps = np.diff(prices)
+    tolerance = prices * err
+    close = (np.r_[np.inf, gaps] < tolerance) | (np.r_[gaps, np.inf] < tolerance)
+
+    prices = prices[close]
+    t_open = t_open[close]
+
+    if not prices.size:
+        return []
+
+    starts = np.r_[0, np.flatnonzero(np.diff(prices) >= prices[1:] * err) + 1]
+    ends = np.r_[starts[1:], prices.size]
+    x_starts = np.maximum.reduceat(t_open, starts).tolist()
+
+    values = prices.tolist()
+    return [{"x-start": x, "x-end": x_end, "y": sum(values[a:b]) / (b - a)} for x, a, b in zip(x_starts, starts.tolist(), ends.tolist())]
+
+
+def find_support(columns: dict, err: float, chunk: int = CHUNK_SIZE) -> list[dict]:
+    if not len(columns["t_open"]):
+        return []
+
+    average = candle_average(columns["high"], columns["low"], columns["close"])
+    index = chunk_extrema(np.asarray(columns["low"]), chunk)
+    return find_levels(np.asarray(columns["t_open"])[index], average[index], err, int(columns["t_open"][-1]))
+
+
+def find_resist(columns: dict, err: float, chunk: int = CHUNK_SIZE) -> list[dict]:
+    if not len(columns["t_open"]):
+        return []
+
+    average = candle_average(columns["high"], columns["low"], columns["close"])
+    index = chunk_extrema(np.asarray(columns["high"]), chunk, largest=True)
+    return find_levels(np.asarray(columns["t_open"])[index], average[index], err, int(columns["t_open"][-1]))
+
+
+class Levels:
+    # Support and resistance levels of a growing candle history. Extrema of
+    # completed chunks are kept, so new candles only cost the chunks they
+    # complete. Chunks are counted from the first candle added since the last
+    # reset, `supports()` and `resists()` equal `find_support` and `find_resist`
+    # over all those candles.
+
+    def __init__(self, err: float = 0.05, chunk: int = CHUNK_SIZE):
+        self.err = err
+        self.chunk = chunk
+        self.synced = 0
+
+        self.t_open = RingBuffer(None, np.int64)
+        self.low = RingBuffer(None)
+        self.high = RingBuffer(None)
+        self.average = RingBuffer(None)
+
+        self.lows = RingBuffer(None, np.int64)
+        self.highs = RingBuffer(None, np.int64)
+
+    def __len__(self):
+        return len(self.t_open)
+
+    def clear(self):
+        for buffer in (self.t_open, self.low, self.high, self.average, self.lows, self.highs):
+            buffer.clear()
+
+    def extend(self, columns: dict):
+        start = len(self.lows) * self.chunk
+
+        self.t_open.extend(columns["t_open"])
+        self.low.extend(columns["low"])
+        self.high.extend(columns["high"])
+        self.average.extend(candle_average(np.asarray(columns["high"]), np.asarray(columns["low"]), np.asarray(columns["close"])))
+
+        complete = (len(self) - start) // self.chunk * self.chunk
+        if complete:
+            self.lows.extend(start + chunk_extrema(self.low.view()[start:start + complete], self.chunk))
+            self.highs.extend(start + chunk_extrema(self.high.view()[start:start + complete], self.chunk, largest=True))
+
+    def sync(self, chart: 'Chart'):
+        # Adds the candles appended to `chart` since the last call.
+        missing = chart.version - self.synced
+
+        if self.synced < chart.reset_version or missing > len(chart):
+            self.clear()
+            missing = len(chart)
+
+        self.synced = chart.version
+
+        if missing:
+            self.extend({name: chart.column(name)[-missing:] for name in ("t_open", "high", "low", "close")})
+
+    def _extrema(self, index: RingBuffer, values: RingBuffer, largest: bool) -> np.array:
+        start = len(index) * self.chunk
+        tail = values.view()[start:]
+
+        if not tail.size:
+            return index.view()
+
+        return np.r_[index.view(), start + chunk_extrema(tail, tail.size, largest)]
+
+    def _levels(self, index: np.array) -> list[dict]:
+        if not len(self):
+            return []
+
+        t_open = self.t_open.view()
+        return find_levels(t_open[index], self.average.view()[index], self.err, int(t_open[-1]))
+
+    def supports(self) -> list[dict]:
+        return self._levels(self._extrema(self.lows, self.low, largest=False))
+
+    def resists(self) -> list[dict]:
+        return self._levels(self._extrema(self.highs, self.high, largest=True))
@@ -0,0 +1,125 @@
+import numpy as np
+
+# Screen pixels per bucket, room for a candle body and the gap to the next one.
+PIXELS_PER_BUCKET = 3
+
+
+def bucket_span(x0: float, x1: float, pixels: float, interval: int, pixels_per_bucket: int = PIXELS_PER_BUCKET) -> int:
+    # Seconds per bucket for the x0..x1 range drawn `pixels` wide: `interval` while
+    # the candles fit, else a power of two candles, zooming a little or panning
+    # keeps the same buckets.
+    if pixels <= 0:
+        return interval
+
+    candles = (x1 - x0) / interval * pixels_per_bucket / pixels
+    if candles <= 1:
+        return interval
+
+    return interval << int(np.ceil(np.log2(candles)))
+
+
+def bucket_starts(t: np.array, span: int) -> np.array:
+    # Index of the first candle of every bucket, aligned to the epoch like resampled candles.
+    buckets = t - t % span
+    return np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+
+
+def aggregate_ohlc(t: np.array, p_open: np.array, p_close: np.array, p_low: np.array, p_high: np.array, span: int, starts: np.array = None) -> tuple:
+    # (t, open, close, low, high) of the buckets, in the `CandlestickItem.setData` order.
+    if not t.size:
+        return t, p_open, p_close, p_low, p_high
+
+    if starts is None:
+        starts = bucket_starts(t, span)
+
+    ends = np.r_[starts[1:], t.size] - 1
+    return t[starts] - t[starts] % span, p_open[starts], p_close[ends], np.minimum.reduceat(p_low, starts), np.maximum.reduceat(p_high, starts)
+
+
+def minmax_decimate(t: np.array, y: np.array, span: int, starts: np.array = None) -> tuple:
+    # Lowest then highest value of every bucket at the bucket time, two points per
+    # bucket keep the peaks of the curve. NaN are skipped, all NaN buckets stay NaN.
+    if not t.size:
+        return t, y
+
+    if starts is None:
+        starts = bucket_starts(t, span)
+
+    x = np.repeat(t[starts] - t[starts] % span, 2)
+    values = np.empty(x.size)
+    values[0::2] = np.fmin.reduceat(y, starts)
+    values[1::2] = np.fmax.reduceat(y, starts)
+    return x, values
+
+
+class LevelOfDetail:
+    # Reduces the chart series to what a plot of the visible x range and pixel
+    # width can show: candles to OHLC buckets, curves to the min/max of their
+    # buckets within the visible range. The span only changes with the zoom,
+    # `set_view` tells when the series have to be reduced again.
+
+    def __init__(self, interval: int, pixels_per_bucket: int = PIXELS_PER_BUCKET):
+        self.interval = int(interval)
+        self.pixels_per_bucket = pixels_per_bucket
+        self.span = self.interval
+        self.x_range = None
+
+        # (key of the visible times, bucket starts) shared by the curves of one draw
+        self._starts = None
+
+    def set_view(self, x0: float, x1: float, pixels: float) -> bool:
+        x_range = (float(x0), float(x1))
+        span = bucket_span(x_range[0], x_range[1], pixels, self.interval, self.pixels_per_bucket)
+
+        if x_range == self.x_range and span == self.span:
+            return False
+
+        self.x_range = x_range
+        self.span = span
+        return True
+
+    def in_view(self, t_first: float, t_last: float) -> bool:
+        # Whether candles from `t_first` to `t_last` can be drawn, in view or in the margin of `visible`.
+        if self.x_range is None:
+            return True
+
+        x0, x1 = self.x_range
+        return t_first <= x1 + 2 * self.span and t_last >= x0 - 2 * self.span
+
+    def visible(self, t: np.array) -> slice:
+        # Candles of the whole buckets in view and one more on both sides, so curves reach the edges.
+        if self.x_range is None:
+            return slice(0, t.size)
+
+        x0, x1 = self.x_range
+        span = self.span
+        start, end = np.searchsorted(t, ((x0 // span - 1) * span, (x1 // span + 2) * span))
+        return slice(int(start), int(end))
+
+    def starts(self, t: np.array) -> np.array:
+        key = (t.size, t[0], t[-1], self.span) if t.size else None
+        if self._starts is None or self._starts[0] != key:
+            self._starts = (key, bucket_starts(t, self.span))
+
+        return self._starts[1]
+
+    def ohlc(self, t: np.array, p_open: np.array, p_close: np.array, p_low: np.array, p_high: np.array) -> tuple:
+        # All the candles, the item drawing them skips the ones out of view.
+        if self.span == self.interval or not t.size:
+            return t, p_open, p_close, p_low, p_high
+
+        return aggregate_ohlc(t, p_open, p_close, p_low, p_high, self.span)
+
+    def curve(self, t: np.array, y: np.array) -> tuple:
+        # `y` can be shorter than `t`, values of the last candles like a strategy MACD.
+        y = np.asarray(y, dtype=np.float64)
+        if y.size < t.size:
+            t = t[t.size - y.size:]
+
+        visible = self.visible(t)
+        t, y = t[visible], y[visible]
+
+        if self.span == self.interval or not t.size:
+            return t, y
+
+        return minmax_decimate(t, y, self.span, self.starts(t))
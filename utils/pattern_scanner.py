@@ -0,0 +1,127 @@
+import numpy as np
+import talib as ta
+from talib import abstract
+
+from utils.ring_buffer import RingBuffer
+
+DEFAULT_CAPACITY = 4096
+
+
+class PatternEvents:
+    # Capped store of detected patterns in time order, the oldest events are
+    # evicted first. Columns are kept in ring buffers, queries by time range
+    # are binary searches over `t_open`.
+
+    def __init__(self, patterns: list[str], capacity: int = DEFAULT_CAPACITY):
+        self.patterns = list(patterns)
+        self.t_open = RingBuffer(capacity, np.int64)
+        self.pattern = RingBuffer(capacity, np.int16)
+        self.value = RingBuffer(capacity, np.int16)
+        self.price = RingBuffer(capacity)
+
+    def __len__(self):
+        return len(self.t_open)
+
+    def clear(self):
+        for column in (self.t_open, self.pattern, self.value, self.price):
+            column.clear()
+
+    def extend(self, t_open, pattern, value, price):
+        self.t_open.extend(t_open)
+        self.pattern.extend(pattern)
+        self.value.extend(value)
+        self.price.extend(price)
+
+    def query(self, t_start: int = None, t_end: int = None, patterns: list[str] = None) -> dict:
+        # Columns of the events with `t_start <= t_open <= t_end`, both optional.
+        # The views are only valid until the next update.
+        t_open = self.t_open.view()
+        start = np.searchsorted(t_open, t_start, side="left") if t_start is not None else 0
+        end = np.searchsorted(t_open, t_end, side="right") if t_end is not None else t_open.size
+
+        events = {
+            "t_open": t_open[start:end],
+            "pattern": self.pattern.view()[start:end],
+            "value": self.value.view()[start:end],
+            "price": self.price.view()[start:end],
+        }
+
+        if patterns is not None:
+            mask = np.isin(events["pattern"], [self.patterns.index(name) for name in patterns])
+            events = {name: column[mask] for name, column in events.items()}
+
+        return events
+
+    def items(self, t_start: int = None, t_end: int = None, patterns: list[str] = None) -> list[dict]:
+        events = self.query(t_start, t_end, patterns)
+        return [{
+            "t_open": t,
+            "pattern": self.patterns[p],
+            "value": v,
+            "price": price,
+        } for t, p, v, price in zip(events["t_open"].tolist(), events["pattern"].tolist(), events["value"].tolist(), events["price"].tolist())]
+
+
+class PatternScanner:
+    # Evaluates TA-Lib CDL patterns once over a candle history, then only over
+    # the tail each new candle needs: its pattern lookback plus the new candles.
+    # `patterns` maps the CDL function names to the candle column the events are
+    # priced at, e.g. {"CDLDOJI": "low"}.
+
+    def __init__(self, patterns: dict, capacity: int = DEFAULT_CAPACITY):
+        self.patterns = dict(patterns)
+        self.functions = [getattr(ta, name) for name in self.patterns]
+        self.lookbacks = [abstract.Function(name).lookback for name in self.patterns]
+        self.lookback = max(self.lookbacks, default=0)
+        self.events = PatternEvents(self.patterns, capacity)
+        self.synced = 0
+
+    def _scan(self, columns: dict, new: int):
+        # Patterns completed by the last `new` candles of `columns`.
+        o, h, l, c = (np.asarray(columns[name], dtype=np.float64) for name in ("open", "high", "low", "close"))
+        t_open = np.asarray(columns["t_open"])
+
+        found = []
+        for pattern, (function, price) in enumerate(zip(self.functions, self.patterns.values())):
+            values = function(o, h, l, c)[-new:]
+            index = np.flatnonzero(values) + (t_open.size - new)
+
+            if index.size:
+                found.append((index, np.full(index.size, pattern), values[index - (t_open.size - new)], np.asarray(columns[price])[index]))
+
+        if not found:
+            return
+
+        index, pattern, value, price = (np.concatenate(column) for column in zip(*found))
+        order = np.lexsort((pattern, index))
+        self.events.extend(t_open[index[order]], pattern[order], value[order], price[order])
+
+    def scan(self, columns: dict):
+        # Whole history, replaces the stored events.
+        self.events.clear()
+
+        if len(columns["close"]):
+            self._scan(columns, len(columns["close"]))
+
+    def update(self, columns: dict, new: int = 1):
+        # `columns` end with `new` candles not scanned yet, only their tail is read.
+        if new <= 0:
+            return
+
+        size = len(columns["close"])
+        start = max(size - new - self.lookback, 0)
+        self._scan({name: column[start:] for name, column in columns.items()}, min(new, size))
+
+    def sync(self, chart: 'Chart'):
+        # Scans the candles appended to `chart` since the last call.
+        missing = chart.version - self.synced
+        columns = {name: chart.column(name) for name in ("t_open", "open", "high", "low", "close")}
+
+        if self.synced < chart.reset_version:
+            self.synced = chart.version
+            self.scan(columns)
+            return
+
+        # Candles evicted from the chart before being scanned are skipped.
+        self.synced = chart.version
+        self.update(columns, min(missing, len(chart)))
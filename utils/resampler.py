@@ -0,0 +1,153 @@
+import numpy as np
+import util
+from candle import Candle, candles_from_columns
+from customtypes import CandleTimeInterval
+
+COLUMN_NAMES = ("t_open", "t_close", "open", "high", "low", "close", "volume")
+
+
+def _seconds(period: CandleTimeInterval) -> int:
+    seconds = util.MAP_INTERVAL_TO_SECONDS.get(period)
+    if seconds is None:
+        raise ValueError(f"Unknown candle interval '{period}'.")
+
+    return seconds
+
+
+def _check_periods(period: CandleTimeInterval, base_period: CandleTimeInterval) -> tuple[int, int]:
+    seconds, base_seconds = _seconds(period), _seconds(base_period)
+
+    if seconds < base_seconds or seconds % base_seconds:
+        raise ValueError(f"{period} candles can't be built from {base_period} candles.")
+
+    return seconds, base_seconds
+
+
+def resample_columns(columns: dict,
+                     period: CandleTimeInterval,
+                     base_period: CandleTimeInterval = CandleTimeInterval.I_1M,
+                     time_scale: int = 1,
+                     partial: bool = False) -> dict:
+    # `period` candles from sorted `base_period` candles in the `Chart` column
+    # layout. Candles are aligned to the epoch like the exchange ones, times are
+    # seconds times `time_scale` (1000 for the `KlineCache` columns). The last
+    # candle is left out while its period isn't complete, unless `partial` is set.
+    # A period missing some base candles is still closed by the next one.
+    seconds, base_seconds = _check_periods(period, base_period)
+    seconds *= time_scale
+    base_seconds *= time_scale
+
+    t_open = np.asarray(columns["t_open"], dtype=np.int64)
+    if not t_open.size:
+        return {name: np.empty(0, dtype=np.asarray(columns[name]).dtype) for name in COLUMN_NAMES}
+
+    buckets = t_open - t_open % seconds
+    starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+    ends = np.r_[starts[1:], t_open.size]
+
+    if not partial and t_open[-1] + base_seconds < buckets[-1] + seconds:
+        starts, ends = starts[:-1], ends[:-1]
+
+    if not starts.size:
+        return {name: np.empty(0, dtype=np.asarray(columns[name]).dtype) for name in COLUMN_NAMES}
+
+    # `reduceat` needs the start of every group, also of the left out last one.
+    reduce_starts = np.r_[starts, ends[-1]] if ends[-1] < t_open.size else starts
+    count = starts.size
+
+    return {
+        "t_open": buckets[starts],
+        "t_close": buckets[starts] + seconds - 1,
+        "open": np.asarray(columns["open"])[starts],
+        "high": np.maximum.reduceat(np.asarray(columns["high"]), reduce_starts)[:count],
+        "low": np.minimum.reduceat(np.asarray(columns["low"]), reduce_starts)[:count],
+        "close": np.asarray(columns["close"])[ends - 1],
+        "volume": _group_sums(np.asarray(columns["volume"], dtype=np.float64), starts, ends),
+    }
+
+
+def _group_sums(values: np.array, starts: np.array, ends: np.array) -> np.array:
+    # Sums of values[starts:ends] added one by one in order, the way `Resampler`
+    # adds them, `reduceat` sums in a different order.
+    sums = np.zeros(starts.size)
+
+    for offset in range(int(np.max(ends - starts))):
+        index = starts + offset
+        valid = index < ends
+        sums[valid] += values[index[valid]]
+
+    return sums
+
+
+class Resampler:
+    # Builds `period` candles from closed `base_period` candles one at a time,
+    # O(1) per candle, with the same rules as `resample_columns`. A candle is
+    # closed by the base candle completing its period, or by the first base
+    # candle of a later period when some are missing.
+
+    def __init__(self, period: CandleTimeInterval, base_period: CandleTimeInterval = CandleTimeInterval.I_1M):
+        self.period = period
+        self.base_period = base_period
+        self.seconds, self.base_seconds = _check_periods(period, base_period)
+
+        # open, high, low, close, volume of the candle being built
+        self.t_open = None
+        self.values = None
+
+    def _close(self) -> Candle:
+        p_open, p_high, p_low, p_close, volume = self.values
+        candle = Candle(self.period, self.t_open, self.t_open + self.seconds - 1, p_open, p_close, p_high, p_low, volume)
+
+        self.t_open = None
+        self.values = None
+        return candle
+
+    def update(self, candle: Candle) -> list[Candle]:
+        # Candles closed by the base `candle`, usually none or one.
+        closed = []
+        t_open = candle.t_open - candle.t_open % self.seconds
+
+        if self.t_open is not None and self.t_open != t_open:
+            closed.append(self._close())
+
+        if self.t_open is None:
+            self.t_open = t_open
+            self.values = [candle.p_open, candle.p_high, candle.p_low, candle.p_close, candle.volume or 0]
+        else:
+            values = self.values
+            values[1] = max(values[1], candle.p_high)
+            values[2] = min(values[2], candle.p_low)
+            values[3] = candle.p_close
+            values[4] += candle.volume or 0
+
+        if candle.t_open + self.base_seconds >= t_open + self.seconds:
+            closed.append(self._close())
+
+        return closed
+
+    def partial(self) -> Candle:
+        # The candle being built, not closed yet, None between periods.
+        if self.t_open is None:
+            return None
+
+        p_open, p_high, p_low, p_close, volume = self.values
+        candle = Candle(self.period, self.t_open, self.t_open + self.seconds - 1, p_open, None, p_high, p_low, volume)
+        candle.current = p_close
+        return candle
+
+    def reset(self, columns: dict) -> list[Candle]:
+        # Closed candles of a base candle history, the rest is kept as the candle being built.
+        resampled = resample_columns(columns, self.period, self.base_period, partial=True)
+        self.t_open = None
+        self.values = None
+
+        if not resampled["t_open"].size:
+            return []
+
+        t_open = int(columns["t_open"][-1])
+        if t_open + self.base_seconds >= int(resampled["t_open"][-1]) + self.seconds:
+            return candles_from_columns(self.period, resampled)
+
+        self.t_open = int(resampled["t_open"][-1])
+        self.values = [resampled[name][-1].item() for name in ("open", "high", "low", "close", "volume")]
+        return candles_from_columns(self.period, resampled, 0, -1)
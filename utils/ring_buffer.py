@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class RingBuffer:
+    # Fixed capacity buffer with O(1) append/evict. Every value is written twice,
+    # at `i` and `i + capacity`, so the kept values are always one contiguous
+    # slice and `view()` never copies. Without a capacity the buffer only grows.
+    #
+    # Views are live: once the buffer is full the next append overwrites the
+    # slot of the oldest value, so a view is only valid until the next append.
+
+    def __init__(self, capacity=None, dtype=np.float64, initial=1024):
+        self.capacity = capacity
+        self.dtype = dtype
+        self.size = 0
+        self.pos = 0
+
+        if capacity:
+            self.buffer = np.empty(2 * capacity, dtype=dtype)
+        else:
+            self.buffer = np.empty(initial, dtype=dtype)
+
+    def __len__(self):
+        return self.size
+
+    def append(self, value):
+        if self.capacity:
+            self.buffer[self.pos] = value
+            self.buffer[self.pos + self.capacity] = value
+            self.pos = (self.pos + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+        else:
+            if self.size == self.buffer.size:
+                self._grow(self.size * 2)
+
+            self.buffer[self.size] = value
+            self.size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+
+        if not self.capacity:
+            if self.size + values.size > self.buffer.size:
+                self._grow(max(self.buffer.size * 2, self.size + values.size))
+
+            self.buffer[self.size:self.size + values.size] = values
+            self.size += values.size
+            return
+
+        # Only the last `capacity` values can survive.
+        values = values[-self.capacity:]
+        index = (self.pos + np.arange(values.size)) % self.capacity
+
+        self.buffer[index] = values
+        self.buffer[index + self.capacity] = values
+        self.pos = (self.pos + values.size) % self.capacity
+        self.size = min(self.size + values.size, self.capacity)
+
+    def clear(self):
+        self.size = 0
+        self.pos = 0
+
+    def view(self) -> np.array:
+        if self.capacity:
+            end = self.pos + self.capacity
+            return self.buffer[end - self.size:end]
+
+        return self.buffer[:self.size]
+
+    def last(self):
+        return self.view()[-1]
+
+    def _grow(self, size):
+        buffer = np.empty(size, dtype=self.dtype)
+        buffer[:self.size] = self.buffer[:self.size]
+        self.buffer = buffer
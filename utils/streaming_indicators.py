@@ -0,0 +1,234 @@
+import math
+
+# Streaming versions of the TA-Lib indicators used by `Indicators`. Every class
+# keeps only the recursive state of the indicator and advances it by one candle
+# in O(1), reproducing TA-Lib output (default compatibility, no unstable period)
+# up to TALIB_TOLERANCE absolute difference.
+
+TALIB_TOLERANCE = 1e-8
+
+# TA-Lib treats values inside (-TA_EPSILON, TA_EPSILON) as zero.
+TA_EPSILON = 1e-14
+
+
+def _is_zero(value):
+    return -TA_EPSILON < value < TA_EPSILON
+
+
+class EMA:
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.seed = 0.0
+        self.value = math.nan
+
+    def update(self, price: float) -> float:
+        self.count += 1
+
+        if self.count < self.period:
+            self.seed += price
+        elif self.count == self.period:
+            self.value = (self.seed + price) / self.period
+        else:
+            self.value = ((price - self.value) * self.k) + self.value
+
+        return self.value
+
+
+class RSI:
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_price = None
+        self.gain = 0.0
+        self.loss = 0.0
+        self.value = math.nan
+
+    def update(self, price: float) -> float:
+        self.count += 1
+
+        if self.prev_price is None:
+            self.prev_price = price
+            return self.value
+
+        diff = price - self.prev_price
+        self.prev_price = price
+
+        if self.count <= self.period + 1:
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+
+            if self.count < self.period + 1:
+                return self.value
+
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= (self.period - 1)
+            self.gain *= (self.period - 1)
+
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+
+            self.loss /= self.period
+            self.gain /= self.period
+
+        total = self.gain + self.loss
+        self.value = 100.0 * (self.gain / total) if not _is_zero(total) else 0.0
+
+        return self.value
+
+
+class DMI:
+    # Computes ADX, +DI and -DI together since they share the Wilder smoothed
+    # directional movement and true range.
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_high = None
+        self.prev_low = None
+        self.prev_close = None
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.tr = 0.0
+        self.sum_dx = 0.0
+        self.adx = math.nan
+        self.di_plus = math.nan
+        self.di_minus = math.nan
+
+    def update(self, high: float, low: float, close: float) -> tuple[float, float, float]:
+        self.count += 1
+
+        if self.prev_high is None:
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            return self.adx, self.di_plus, self.di_minus
+
+        period = self.period
+        diff_p = high - self.prev_high
+        diff_m = self.prev_low - low
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        # Index of the current candle, the first one is 0.
+        today = self.count - 1
+
+        if today < period:
+            if diff_m > 0 and diff_p < diff_m:
+                self.minus_dm += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                self.plus_dm += diff_p
+
+            self.tr += tr
+            return self.adx, self.di_plus, self.di_minus
+
+        self.minus_dm -= self.minus_dm / period
+        self.plus_dm -= self.plus_dm / period
+
+        if diff_m > 0 and diff_p < diff_m:
+            self.minus_dm += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            self.plus_dm += diff_p
+
+        self.tr = self.tr - (self.tr / period) + tr
+
+        dx = None
+        if not _is_zero(self.tr):
+            self.di_minus = 100.0 * (self.minus_dm / self.tr)
+            self.di_plus = 100.0 * (self.plus_dm / self.tr)
+
+            di_sum = self.di_minus + self.di_plus
+            if not _is_zero(di_sum):
+                dx = 100.0 * (abs(self.di_minus - self.di_plus) / di_sum)
+        else:
+            self.di_minus = 0.0
+            self.di_plus = 0.0
+
+        if today < 2 * period - 1:
+            self.sum_dx += dx or 0.0
+        elif today == 2 * period - 1:
+            self.sum_dx += dx or 0.0
+            self.adx = self.sum_dx / period
+        elif dx is not None:
+            self.adx = ((self.adx * (period - 1)) + dx) / period
+
+        return self.adx, self.di_plus, self.di_minus
+
+
+class SAR:
+    def __init__(self, acceleration: float = 0.02, maximum: float = 0.2):
+        self.acceleration = acceleration
+        self.maximum = maximum
+        self.af = min(acceleration, maximum)
+        self.count = 0
+        self.is_long = True
+        self.sar = math.nan
+        self.ep = math.nan
+        self.last_high = None
+        self.last_low = None
+
+    def update(self, high: float, low: float) -> float:
+        self.count += 1
+
+        if self.count == 1:
+            self.last_high, self.last_low = high, low
+            return math.nan
+
+        if self.count == 2:
+            # Initial direction is taken from the -DM of the first two candles.
+            diff_p = high - self.last_high
+            diff_m = self.last_low - low
+            self.is_long = not (diff_m > 0 and diff_p < diff_m)
+
+            if self.is_long:
+                self.ep, self.sar = high, self.last_low
+            else:
+                self.ep, self.sar = low, self.last_high
+
+            self.last_high, self.last_low = high, low
+
+        prev_high, prev_low = self.last_high, self.last_low
+        self.last_high, self.last_low = high, low
+
+        if self.is_long:
+            if low <= self.sar:
+                # Switch to short.
+                self.is_long = False
+                output = max(self.ep, prev_high, high)
+
+                self.af = self.acceleration
+                self.ep = low
+                self.sar = max(output + self.af * (self.ep - output), prev_high, high)
+            else:
+                output = self.sar
+
+                if high > self.ep:
+                    self.ep = high
+                    self.af = min(self.af + self.acceleration, self.maximum)
+
+                self.sar = min(self.sar + self.af * (self.ep - self.sar), prev_low, low)
+        else:
+            if high >= self.sar:
+                # Switch to long.
+                self.is_long = True
+                output = min(self.ep, prev_low, low)
+
+                self.af = self.acceleration
+                self.ep = high
+                self.sar = min(output + self.af * (self.ep - output), prev_low, low)
+            else:
+                output = self.sar
+
+                if low < self.ep:
+                    self.ep = low
+                    self.af = min(self.af + self.acceleration, self.maximum)
+
+                self.sar = max(self.sar + self.af * (self.ep - self.sar), prev_high, high)
+
+        return output
@@ -1,16 +1,146 @@
 import operator
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+# Candles first checked for the end of a growing trend window, doubled until it ends.
+RUN_WINDOW = 16
 
-def get_trend_aproximation(indicator_list, n):
-    # n - passed candles
 
-    x = list(range(1, n + 1))
-    y = list(indicator_list[-n:])
-    z = np.polyfit(x, y, 1)
+def fit_line(n, sy, sxy):
+    # Least squares line through n values at x = 1..n, from the sums of y and x * y.
+    # Same line as `np.polyfit(x, y, 1)`, works on scalars and arrays alike.
+    slope = (12 * sxy - 6 * (n + 1) * sy) / (n * (n * n - 1))
+    intercept = sy / n - slope * (n + 1) / 2
+    return slope, intercept
+
+
+class RollingRegression:
+    # Least squares line through a window of values at x = 1..size kept as running
+    # sums, appending a value or sliding the window by one costs O(1). The sums are
+    # added in the same order as `rolling_fit` and `expanding_fit`, so the lines are
+    # bit for bit the ones of the vectorized versions.
+
+    def __init__(self, values=()):
+        self.reset(values)
+
+    def __len__(self):
+        return self.size
+
+    def reset(self, values):
+        self.size = 0
+        self.sy = 0.0
+        self.sxy = 0.0
+
+        for value in np.asarray(values, dtype=np.float64).tolist():
+            self.append(value)
+
+    def append(self, value: float):
+        # Grows the window, `value` is at x = size + 1.
+        self.size += 1
+        self.sy += value
+        self.sxy += self.size * value
+
+    def slide(self, value: float, evicted: float):
+        # Drops the oldest value `evicted` and appends `value`, every x shifts down by one.
+        self.sxy += self.size * value - self.sy
+        self.sy += value - evicted
+
+    def fit(self) -> tuple:
+        # (slope, intercept), a flat line through the value for a single one.
+        if self.size < 2:
+            return 0.0, self.sy
+
+        return fit_line(self.size, self.sy, self.sxy)
+
+    def line(self) -> np.array:
+        # Fitted values at x = 1..size.
+        slope, intercept = self.fit()
+        return slope * np.arange(1, self.size + 1) + intercept
+
+
+def rolling_fit(values: np.array, n: int) -> tuple:
+    # (slope, intercept) of the line through the n values ending at every index,
+    # NaN where fewer than n values are available.
+    values = np.asarray(values, dtype=np.float64)
+    slope = np.full(values.size, np.nan)
+    intercept = np.full(values.size, np.nan)
+
+    if n < 2 or values.size < n:
+        return slope, intercept
+
+    windows = sliding_window_view(values, n)
+    sy = np.zeros(len(windows))
+    sxy = np.zeros(len(windows))
+
+    for j in range(n):
+        sy += windows[:, j]
+        sxy += (j + 1) * windows[:, j]
 
-    return np.poly1d(z)(x)
+    slope[n - 1:], intercept[n - 1:] = fit_line(n, sy, sxy)
+    return slope, intercept
+
+
+def expanding_fit(values: np.array) -> tuple:
+    # (slope, intercept) of the line through values[:i + 1] for every index, NaN at 0.
+    values = np.asarray(values, dtype=np.float64)
+    n = np.arange(1, values.size + 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope, intercept = fit_line(n, np.cumsum(values), np.cumsum(n * values))
+
+    slope[:1] = np.nan
+    intercept[:1] = np.nan
+    return slope, intercept
+
+
+def growing_trend(values: np.array, candles: np.array, min_size: int, compare, start: int = 0) -> np.array:
+    # Trend flag for every index from `start`, the way `strategies.default` tracks it
+    # candle by candle: the line through the last `min_size` values is checked with
+    # `compare(first, last)` on its ends together with the `candles` flag. While the
+    # trend holds the window keeps its first value and grows by every new one, once
+    # it fails the window restarts at `min_size`. Only the trend runs are walked.
+    values = np.asarray(values, dtype=np.float64)
+    total = values.size
+    trend = np.zeros(total, dtype=bool)
+
+    slope, intercept = rolling_fit(values, min_size)
+    with np.errstate(invalid="ignore"):
+        fresh = candles & compare(slope + intercept, slope * min_size + intercept)
+
+    starts = np.flatnonzero(fresh[start:]) + start
+    t = start
+
+    while (k := np.searchsorted(starts, t)) < starts.size:
+        first = int(starts[k])
+        anchor = first - min_size + 1
+        trend[first] = True
+
+        t = first + 1
+        window = RUN_WINDOW
+
+        while t < total:
+            end = min(t + window, total)
+            slope, intercept = expanding_fit(values[anchor:end])
+            n = np.arange(t - anchor + 1, end - anchor + 1)
+            slope, intercept = slope[t - anchor:], intercept[t - anchor:]
+
+            failed = np.flatnonzero(~(candles[t:end] & compare(slope + intercept, slope * n + intercept)))
+            if failed.size:
+                trend[t:t + failed[0]] = True
+                t += int(failed[0]) + 1
+                break
+
+            trend[t:end] = True
+            t = end
+            window *= 2
+
+    return trend
+
+
+def get_trend_aproximation(indicator_list, n):
+    # n - passed candles
+    return RollingRegression(indicator_list[-n:]).line()
 
 
 def stupid_check_uptrend(indicators, aprox, strict=True):
@@ -20,8 +150,8 @@ def stupid_check_uptrend(indicators, aprox, strict=True):
     if not operator.le(aprox[0], aprox[-1]):
         return False
 
-    second_open, first_open = list(open_price_list[-2:])
-    second_candle_close, first_candle_close = list(close_price_list[-2:])
+    second_open, first_open = open_price_list[-2], open_price_list[-1]
+    second_candle_close, first_candle_close = close_price_list[-2], close_price_list[-1]
 
     first_candle_up = first_candle_close > first_open
     second_candle_up = second_candle_close > second_open
@@ -39,8 +169,8 @@ def stupid_check_downtrend(indicators, aprox, strict=True):
     if not operator.ge(aprox[0], aprox[-1]):
         return False
 
-    prev_open, curr_open = list(open_price_list[-2:])
-    prev_candle_close, curr_candle_close = list(close_price_list[-2:])
+    prev_open, curr_open = open_price_list[-2], open_price_list[-1]
+    prev_candle_close, curr_candle_close = close_price_list[-2], close_price_list[-1]
 
     curr_candle_down = not curr_candle_close > curr_open
     prev_candle_down = not prev_candle_close > prev_open
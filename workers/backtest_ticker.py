@@ -4,10 +4,12 @@ from .baseworker import Worker, WorkerStatus
 
 
 class BacktestTicker(Worker):
-    def __init__(self, window, candles):
+    def __init__(self, window, candles, flush=None):
         Worker.__init__(self, name="backtest-ticker")
         self.window = window
         self.candles = candles
+        # Called before waiting for resume and after the last candle.
+        self.flush = flush
         self.status = WorkerStatus.WORKING
         self.tick = window.backtest_tick
 
@@ -28,6 +30,9 @@ class BacktestTicker(Worker):
 
         for candle in self.candles:
 
+            if self.status in [WorkerStatus.PAUSED] and self.flush:
+                self.flush()
+
             while self.status in [WorkerStatus.PAUSED]:
                 time.sleep(self.tick)
 
@@ -37,3 +42,6 @@ class BacktestTicker(Worker):
                 break
 
             time.sleep(self.tick)
+
+        if self.flush:
+            self.flush()
@@ -0,0 +1,18 @@
+from .market_data import MarketDataClient
+
+
+class CombinedStreamTicker(MarketDataClient):
+    # One websocket for all slots: Binance combined streams wrap every event in
+    # {"stream": name, "data": event}, events are routed to the slots by name.
+
+    def __init__(self, slots: list['Slot'], **kwargs):
+        self.slots = {}
+
+        for slot in slots:
+            self.slots.setdefault(slot.stream, []).append(slot)
+
+        MarketDataClient.__init__(self, list(self.slots), name="combined-stream-ticker", **kwargs)
+
+    def on_event(self, stream, event, received):
+        for slot in self.slots.get(stream, []):
+            slot.on_event(event, received)
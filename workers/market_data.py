@@ -0,0 +1,173 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+import websockets
+from loguru import logger
+from utils.json_decoding import decoder
+
+from .baseworker import Worker
+
+BINANCE_COMBINED_STREAM = 'wss://stream.binance.com:9443/stream?streams='
+
+
+def is_conflatable(event: 'KlineEvent') -> bool:
+    # Intra-candle kline updates only matter until the next one arrives, closed klines must all be delivered.
+    return not event.kline.closed
+
+
+class ConflatingQueue:
+    # Bounded FIFO between the socket reader and the consumer. A conflatable
+    # event replaces the one of the same stream still waiting in the queue
+    # instead of taking a new place; a closed kline replaces it as well, as its
+    # values are final. When the queue is full the reader waits (backpressure).
+
+    def __init__(self, maxsize: int = 1024, conflate: bool = True):
+        self.maxsize = maxsize
+        self.conflate = conflate
+        self.items = deque()
+        self.pending = {}
+        self.condition = asyncio.Condition()
+        self.conflated = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    async def put(self, stream: str, event: 'KlineEvent', received: float):
+        conflatable = self.conflate and is_conflatable(event)
+
+        async with self.condition:
+            entry = self.pending.get(stream)
+
+            if entry is not None:
+                entry[1] = event
+                entry[2] = received
+                self.conflated += 1
+
+                if not conflatable:
+                    del self.pending[stream]
+                return
+
+            while len(self.items) >= self.maxsize:
+                await self.condition.wait()
+
+            entry = [stream, event, received]
+            self.items.append(entry)
+
+            if conflatable:
+                self.pending[stream] = entry
+
+            self.condition.notify_all()
+
+    async def get(self) -> tuple[str, 'KlineEvent', float]:
+        async with self.condition:
+            while not self.items:
+                await self.condition.wait()
+
+            entry = self.items.popleft()
+            if self.pending.get(entry[0]) is entry:
+                del self.pending[entry[0]]
+
+            self.condition.notify_all()
+            return tuple(entry)
+
+
+class MarketDataClient(Worker):
+    # Binance combined kline streams on an asyncio loop running in the worker thread.
+    # The reader only decodes frames into the queue, `on_event` runs in a
+    # separate thread, so a slow strategy can't stall reading, pings or
+    # reconnection. Reconnects back off exponentially with jitter.
+
+    def __init__(self,
+                 streams: list[str],
+                 name: str = "market-data",
+                 url: str = BINANCE_COMBINED_STREAM,
+                 queue_size: int = 1024,
+                 conflate: bool = True,
+                 backoff: tuple[float, float] = (0.5, 30.0)):
+        Worker.__init__(self, name=name)
+        self.url = f"{url}{'/'.join(streams)}"
+        self.queue_size = queue_size
+        self.conflate = conflate
+        self.backoff = backoff
+
+        self.loop: asyncio.AbstractEventLoop = None
+        self.queue: ConflatingQueue = None
+        self.ws = None
+        self.reconnect = True
+        self.reconnects = 0
+        self.frames = 0
+
+    def on_event(self, stream: str, event: 'KlineEvent', received: float):
+        raise NotImplementedError
+
+    def stop(self):
+        self.reconnect = False
+
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._cancel)
+
+    def _cancel(self):
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+
+    def run(self):
+        logger.info(f"Started: {self.name} ({self.url})")
+
+        try:
+            asyncio.run(self._main())
+        except asyncio.CancelledError:
+            pass
+
+        logger.info(f"Completly Stopped: {self.name}")
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = ConflatingQueue(self.queue_size, self.conflate)
+
+        await asyncio.gather(self._read(), self._consume())
+
+    async def _read(self):
+        delay = self.backoff[0]
+
+        while self.reconnect:
+            try:
+                async with websockets.connect(self.url, ping_interval=20) as ws:
+                    self.ws = ws
+                    logger.success(f"WebSocket {self.reconnects and 're-' or ''}connected.")
+
+                    async for frame in ws:
+                        received = time.time()
+                        self.frames += 1
+                        delay = self.backoff[0]
+
+                        try:
+                            event = decoder.decode_kline_frame(frame)
+                        except Exception as e:
+                            logger.warning(f"Skipped undecodable frame: {e!r}")
+                            continue
+
+                        await self.queue.put(event.stream, event, received)
+
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                logger.error(f"WebSocket error: {e!r}")
+
+            if not self.reconnect:
+                break
+
+            self.reconnects += 1
+            wait = delay * (1 + random.random())
+            logger.warning(f"WebSocket stopped, reconnecting in {wait:.1f}s.")
+
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.backoff[1])
+
+    async def _consume(self):
+        while True:
+            stream, event, received = await self.queue.get()
+
+            try:
+                await asyncio.to_thread(self.on_event, stream, event, received)
+            except Exception:
+                logger.exception(f"Failed to handle event of {stream}.")